@@ -0,0 +1,111 @@
+"""Benchmark de colisiones y caída fantasma: tablero de lista de colores vs bitboard.
+
+Uso: python -m benchmarks.bench_board [--seconds 1.0]
+"""
+import argparse
+import random
+import time
+
+from src.tetris import PieceType, TetrisPiece
+from src.bitboard import BOARD_ENGINES
+
+
+def build_crowded_board(engine, seed=1234, filled_rows=12, hole_chance=0.25):
+    """Crea un tablero con las filas inferiores llenas de bloques y huecos"""
+    rng = random.Random(seed)
+    board = BOARD_ENGINES[engine]()
+    for y in range(board.height - filled_rows, board.height):
+        for x in range(board.width):
+            if rng.random() >= hole_chance:
+                board.set_cell(x, y, (120, 120, 120))
+    return board
+
+
+def build_queries(board):
+    """Todas las combinaciones (pieza, rotación, x, y) que caben dentro del tablero"""
+    queries = []
+    for piece_type in PieceType:
+        piece = TetrisPiece(piece_type)
+        for rotation in range(4):
+            min_dx, min_dy, max_dx, max_dy = TetrisPiece.BOUNDS[(piece_type, rotation)]
+            for x in range(-min_dx, board.width - max_dx):
+                for y in range(-min_dy, board.height - max_dy):
+                    queries.append((piece, rotation, x, y))
+    return queries
+
+
+def run_collision_checks(board, queries, seconds):
+    """Ejecuta comprobaciones durante `seconds` y devuelve checks por segundo"""
+    is_valid = board.is_valid_position_for_piece
+    checks = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for piece, rotation, x, y in queries:
+            is_valid(piece, x - piece.x, y - piece.y, rotation)
+        checks += len(queries)
+    return checks / (time.perf_counter() - start)
+
+
+def build_drop_pieces(board):
+    """Piezas en todas las columnas válidas, en la parte alta del tablero"""
+    pieces = []
+    for piece, rotation, x, y in build_queries(board):
+        if y == -TetrisPiece.BOUNDS[(piece.type, rotation)][1]:
+            drop_piece = TetrisPiece(piece.type, x, y)
+            drop_piece.rotation = rotation
+            pieces.append(drop_piece)
+    return pieces
+
+
+def run_drop_distance(board, pieces, seconds, scan=False):
+    """Calcula distancias de caída durante `seconds` y devuelve cálculos por segundo"""
+    drop_distance = board._scan_drop_distance if scan else board.drop_distance
+    computed = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for piece in pieces:
+            drop_distance(piece)
+        computed += len(pieces)
+    return computed / (time.perf_counter() - start)
+
+
+def verify_engines_agree():
+    boards = {engine: build_crowded_board(engine) for engine in BOARD_ENGINES}
+    reference = None
+    for engine, board in boards.items():
+        results = [board.is_valid_position_for_piece(p, x - p.x, y - p.y, r) for p, r, x, y in build_queries(board)]
+        if reference is None:
+            reference = results
+        elif results != reference:
+            raise AssertionError(f"El motor '{engine}' no coincide con el de referencia")
+        for piece in build_drop_pieces(board):
+            if board.drop_distance(piece) != board._scan_drop_distance(piece):
+                raise AssertionError(f"drop_distance de '{engine}' no coincide con el recorrido por filas")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    verify_engines_agree()
+    results = {}
+    for engine in BOARD_ENGINES:
+        board = build_crowded_board(engine)
+        results[engine] = run_collision_checks(board, build_queries(board), args.seconds)
+        print(f"{engine:>10}: {results[engine]:>12,.0f} checks/s")
+    if "grid" in results and "bitboard" in results:
+        print(f"   speedup: {results['bitboard'] / results['grid']:.2f}x")
+
+    for engine in BOARD_ENGINES:
+        board = build_crowded_board(engine)
+        pieces = build_drop_pieces(board)
+        scan = run_drop_distance(board, pieces, args.seconds, scan=True)
+        surface = run_drop_distance(board, pieces, args.seconds)
+        print(f"{engine:>10}: ghost por filas {scan:>12,.0f}/s, por superficie {surface:>12,.0f}/s ({surface / scan:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
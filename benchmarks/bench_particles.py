@@ -0,0 +1,166 @@
+"""Benchmark de partículas: listas de dicts (implementación anterior) vs arrays de NumPy.
+
+Cada ronda lanza las ráfagas de una limpieza de 8 líneas (create_line_clear_particles
+y create_confetti) y simula hasta que mueren todas las partículas. Después compara
+el dibujo partícula a partícula con el de sellos cacheados en un único blits.
+
+Uso: python -m benchmarks.bench_particles [--rounds 50]
+"""
+import argparse
+import math
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from src.settings import Settings
+from src.game import TetrisGame
+from src.particles import PARTICLES_AVAILABLE, KIND_LINE_CLEAR, KIND_CONFETTI
+
+LINES = 8
+ROWS = list(range(12, 20))
+COLOR = (255, 255, 255)
+
+
+def legacy_bursts(game, rng):
+    """Las mismas ráfagas que antes, como listas de dicts"""
+    idx = LINES - 2
+    line_clear = []
+    for i in range(LINES * 30 + idx * 20):
+        center_y = game.board_y + ROWS[i % len(ROWS)] * game.cell_size + game.cell_size // 2
+        angle = rng.uniform(-3.14, 3.14)
+        speed = rng.uniform(4 + idx * 2, 12 + idx * 4)
+        line_clear.append({
+            'x': game.board_x + game.board.width * game.cell_size // 2, 'y': center_y,
+            'vx': speed * math.cos(angle), 'vy': speed * math.sin(angle),
+            'color': game.get_rainbow_color(rng.uniform(0, 1)),
+            'life': 50 + LINES * 8 + idx * 10, 'max_life': 50 + LINES * 8 + idx * 10,
+        })
+    confetti = []
+    for _ in range(40 + LINES * 30):
+        angle = rng.uniform(-math.pi, math.pi)
+        speed = rng.uniform(3, 10 + LINES * 2)
+        confetti.append({
+            'x': game.board_x + game.board.width * game.cell_size // 2, 'y': game.board_y + 60,
+            'vx': speed * math.cos(angle), 'vy': speed * math.sin(angle) - 2,
+            'color': game.get_rainbow_color(rng.uniform(0, 1)),
+            'life': rng.randint(30, 60 + LINES * 5), 'max_life': 60 + LINES * 5,
+            'size': rng.uniform(2, 6) * 1.5,
+        })
+    return [line_clear, confetti]
+
+
+def legacy_update(particle_lists):
+    """El update_particles anterior: copia de la lista, dict.get y list.remove"""
+    for particles_list in particle_lists:
+        for particle in particles_list[:]:
+            particle['x'] += particle.get('vx', 0)
+            particle['y'] += particle.get('vy', 0)
+            particle['vy'] += particle.get('gravity', 0.2)
+            particle['life'] -= 1
+            if particle['life'] <= 0:
+                particles_list.remove(particle)
+
+
+def run_legacy(game, rounds):
+    rng = random.Random(1)
+    spawn = update = 0.0
+    steps = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        lists = legacy_bursts(game, rng)
+        spawn += time.perf_counter() - start
+        start = time.perf_counter()
+        while any(lists):
+            legacy_update(lists)
+            steps += 1
+        update += time.perf_counter() - start
+    return spawn, update, steps
+
+
+def run_arrays(game, rounds):
+    particles = game.particles
+    spawn = update = 0.0
+    steps = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        game.create_line_clear_particles(LINES, COLOR, LINES - 2, True, ROWS)
+        game.create_confetti(LINES, True)
+        spawn += time.perf_counter() - start
+        start = time.perf_counter()
+        while len(particles):
+            particles.update()
+            steps += 1
+        update += time.perf_counter() - start
+    return spawn, update, steps
+
+
+def legacy_draw(game):
+    """Dibujo anterior: una llamada a pygame.draw por partícula (el alpha se ignoraba)"""
+    for kind in (KIND_LINE_CLEAR, KIND_CONFETTI):
+        xs, ys, lives, colors, sizes = game.particles.view(kind)
+        for x, y, life, color, base_size in zip(xs.tolist(), ys.tolist(), lives.tolist(), colors.tolist(), sizes.tolist()):
+            alpha = int(255 * life)
+            if kind == KIND_CONFETTI:
+                size = max(2, int(base_size * life))
+                pygame.draw.rect(game.screen, tuple(color) + (alpha,), (int(x), int(y), size, size))
+            else:
+                pygame.draw.circle(game.screen, tuple(color) + (alpha,), (int(x), int(y)), max(1, int(4 * life)))
+
+
+def stamp_draw(game):
+    game.draw_particles()
+    game.draw_confetti()
+
+
+def run_draw(game, draw, rounds):
+    """Dibuja cada paso de vida de las ráfagas; devuelve ms por frame"""
+    frames = 0
+    elapsed = 0.0
+    for _ in range(rounds):
+        game.create_line_clear_particles(LINES, COLOR, LINES - 2, True, ROWS)
+        game.create_confetti(LINES, True)
+        while len(game.particles):
+            start = time.perf_counter()
+            draw(game)
+            elapsed += time.perf_counter() - start
+            frames += 1
+            game.particles.update()
+    return elapsed / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    if not PARTICLES_AVAILABLE:
+        raise SystemExit("El sistema de partículas necesita NumPy")
+
+    game = TetrisGame(None, Settings(headless=True), {'name': 'bench'}, seed=1)
+    burst_size = LINES * 30 + (LINES - 2) * 20 + 40 + LINES * 30
+    print(f"ráfaga de {LINES} líneas: {burst_size} partículas, {args.rounds} rondas")
+    results = {'dicts': run_legacy(game, args.rounds), 'numpy': run_arrays(game, args.rounds)}
+    for name, (spawn, update, steps) in results.items():
+        print(f"{name:>6}: creación {spawn / args.rounds * 1000:7.3f} ms/ráfaga, "
+              f"update {update / steps * 1000:7.4f} ms/paso ({steps} pasos)")
+    legacy, arrays = results['dicts'], results['numpy']
+    print(f"speedup: creación {legacy[0] / arrays[0]:.1f}x, "
+          f"update {(legacy[1] / legacy[2]) / (arrays[1] / arrays[2]):.1f}x")
+
+    pygame.init()
+    settings = Settings()
+    screen = pygame.display.set_mode(settings.resolution)
+    game = TetrisGame(screen, settings, {'name': 'bench'}, seed=1)
+    per_particle = run_draw(game, legacy_draw, max(1, args.rounds // 5))
+    stamps = run_draw(game, stamp_draw, max(1, args.rounds // 5))
+    print(f"dibujo por partícula: {per_particle:.3f} ms/frame, con sellos: {stamps:.3f} ms/frame "
+          f"({per_particle / stamps:.1f}x)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
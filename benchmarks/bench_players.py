@@ -0,0 +1,103 @@
+"""Benchmark de jugadores: guardado (players.json completo vs una fila en SQLite) y tabla de líderes.
+
+Para cada tamaño se crea una población de jugadores y se mide lo que tarda
+save_player_data de uno de ellos con cada método: escribiendo en el momento
+(SQLite) y encolando para el hilo escritor (lo que espera el bucle de juego).
+
+Uso: python -m benchmarks.bench_players [--sizes 100 1000 10000] [--saves 20]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from src.player_manager import PlayerManager
+from src.leaderboard import LeaderboardIndex
+
+
+def build_players(count):
+    return {f"player{i}": {
+        'name': f"player{i}", 'total_score': i * 37, 'best_score': i * 11 % 50000, 'games_played': i % 300,
+        'unlocked_cards': list(range(i % 18)), 'created_date': "2025-01-01T00:00:00",
+        'last_played': "2025-01-01T00:00:00", 'achievements': [], 'settings': {'music_volume': 0.7, 'sfx_volume': 0.8},
+    } for i in range(count)}
+
+
+def legacy_save(path, players):
+    """El save_all_players anterior: todo el diccionario con indent=2"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(players, f, indent=2, ensure_ascii=False)
+
+
+def median_ms(times):
+    times = sorted(times)
+    return times[len(times) // 2] * 1000
+
+
+def time_saves(manager, size, saves):
+    """Tiempos de save_player_data; cierra el manager al acabar"""
+    times = []
+    for i in range(saves):
+        player = manager.get_or_create_player(f"player{i * 7 % size}")
+        player['games_played'] += 1
+        start = time.perf_counter()
+        manager.save_player_data(player)
+        times.append(time.perf_counter() - start)
+    manager.close()
+    return times
+
+
+def print_leaderboard(players, queries):
+    """get_leaderboard antiguo (copiar y ordenar todo) frente al índice tras una actualización"""
+    index = LeaderboardIndex()
+    index.build([(name, index.values_for(player)) for name, player in players.items()])
+    names = list(players)
+    full_sort = []
+    indexed = []
+    for i in range(queries):
+        player = players[names[i * 7 % len(names)]]
+        player['best_score'] += 1
+        start = time.perf_counter()
+        sorted(players.values(), key=lambda p: p.get('best_score', 0), reverse=True)[:10]
+        full_sort.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        index.update(player['name'], player)
+        index.top(10)
+        index.rank(player['name'])
+        indexed.append(time.perf_counter() - start)
+    print(f"{len(players):>7} jugadores: top 10 ordenando todo {median_ms(full_sort):8.3f} ms, "
+          f"índice (actualizar + top + puesto) {median_ms(indexed):6.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--saves", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        players = build_players(size)
+        with tempfile.TemporaryDirectory() as folder:
+            legacy_file = os.path.join(folder, "players.json")
+            legacy_save(legacy_file, players)
+            legacy = []
+            for i in range(args.saves):
+                start = time.perf_counter()
+                legacy_save(legacy_file, players)
+                legacy.append(time.perf_counter() - start)
+
+            # La primera apertura migra el players.json a la base
+            db_file = os.path.join(folder, "players.db")
+            store = time_saves(PlayerManager(db_file, legacy_file, background_saves=False), size, args.saves)
+            manager = PlayerManager(db_file, legacy_file)
+            queued = time_saves(manager, size, args.saves)
+            stats = manager.persistence_stats()
+        print_leaderboard(players, args.saves)
+        print(f"{size:>7} jugadores: players.json {median_ms(legacy):8.2f} ms/guardado, "
+              f"SQLite {median_ms(store):6.2f} ms/guardado ({median_ms(legacy) / median_ms(store):.0f}x), "
+              f"en cola {median_ms(queued):6.3f} ms (latencia hasta disco p95 {stats['latency_p95_ms']:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark de render: gradiente cacheado, atlas de bloques y frame completo vs rectángulos sucios.
+
+Uso: python -m benchmarks.bench_render [--seconds 1.0]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from src.settings import Settings
+from src.game import TetrisGame
+from src.render_cache import draw_gradient_lines, gradient_cache
+from src.renderer import GameRenderer
+from benchmarks.bench_board import build_crowded_board
+
+TOP_COLOR = (15, 20, 35)
+BOTTOM_COLOR = (25, 15, 35)
+
+
+def run_frames(draw, seconds):
+    """Llama a `draw` durante `seconds` y devuelve frames por segundo"""
+    frames = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        draw()
+        frames += 1
+    return frames / (time.perf_counter() - start)
+
+
+def run_game_frames(screen, settings, seconds, dirty_rects):
+    """Partida en curso: update, dibujo y presentación; devuelve frames por segundo"""
+    game = TetrisGame(screen, settings, {'name': 'bench'}, seed=1)
+    if dirty_rects:
+        renderer = GameRenderer(game)
+
+        def frame():
+            game.update()
+            pygame.display.update(renderer.draw())
+    else:
+        def frame():
+            game.update()
+            game.draw()
+            pygame.display.flip()
+    return run_frames(frame, seconds)
+
+
+def verify_gradient(screen):
+    """El gradiente cacheado debe coincidir con el dibujado línea a línea"""
+    reference = pygame.Surface(screen.get_size())
+    draw_gradient_lines(reference, TOP_COLOR, BOTTOM_COLOR)
+    cached = gradient_cache.get(screen.get_size(), TOP_COLOR, BOTTOM_COLOR)
+    for y in range(0, screen.get_height(), 7):
+        expected = reference.get_at((0, y))
+        actual = cached.get_at((screen.get_width() - 1, y))
+        if max(abs(a - b) for a, b in zip(expected[:3], actual[:3])) > 1:
+            raise AssertionError(f"Gradiente distinto en la fila {y}: {expected} != {actual}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    pygame.init()
+    settings = Settings()
+    screen = pygame.display.set_mode(settings.resolution)
+    verify_gradient(screen)
+
+    lines = run_frames(lambda: draw_gradient_lines(screen, TOP_COLOR, BOTTOM_COLOR), args.seconds)
+    cached = run_frames(lambda: gradient_cache.blit(screen, TOP_COLOR, BOTTOM_COLOR), args.seconds)
+    print(f"gradiente por líneas: {lines:>10,.0f} fps")
+    print(f"gradiente cacheado:   {cached:>10,.0f} fps ({cached / lines:.1f}x)")
+
+    game = TetrisGame(screen, settings, {'name': 'bench'}, seed=1)
+    game.board = build_crowded_board(settings.board_engine, filled_rows=18, hole_chance=0.1)
+    board = run_frames(game.draw_board, args.seconds)
+    print(f"tablero lleno:        {board:>10,.0f} fps")
+    frame = run_frames(game.draw, args.seconds)
+    print(f"frame de juego completo: {frame:>7,.0f} fps")
+
+    full = run_game_frames(screen, settings, args.seconds, dirty_rects=False)
+    dirty = run_game_frames(screen, settings, args.seconds, dirty_rects=True)
+    print(f"partida, pantalla completa:  {1000 / full:6.3f} ms/frame")
+    print(f"partida, rectángulos sucios: {1000 / dirty:6.3f} ms/frame ({dirty / full:.1f}x)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
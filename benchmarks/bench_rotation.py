@@ -0,0 +1,55 @@
+"""Micro-benchmark de rotaciones con wall kicks sobre un tablero lleno.
+
+Uso: python -m benchmarks.bench_rotation [--seconds 1.0]
+"""
+import argparse
+import time
+
+from src.tetris import PieceType, TetrisPiece, KICK_TABLES
+from src.bitboard import BOARD_ENGINES
+from benchmarks.bench_board import build_crowded_board
+
+
+def build_rotation_pieces(board):
+    """Una pieza de cada tipo apoyada sobre la pila, donde más kicks se prueban"""
+    pieces = []
+    for piece_type in PieceType:
+        for x in range(0, board.width - 2, 3):
+            piece = TetrisPiece(piece_type, x, 0)
+            piece.y = piece.get_ghost_position(board)
+            pieces.append(piece)
+    return pieces
+
+
+def run_rotations(board, pieces, seconds):
+    """Rota cada pieza en ambos sentidos durante `seconds`; devuelve rotaciones por segundo"""
+    rotations = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for piece in pieces:
+            # Si solo una de las dos rotaciones tiene éxito la pieza no vuelve sola a su estado
+            x, y, rotation, shape = piece.x, piece.y, piece.rotation, piece.shape
+            board.current_piece = piece
+            board.rotate_piece_clockwise()
+            board.rotate_piece_counterclockwise()
+            piece.x, piece.y, piece.rotation, piece.shape = x, y, rotation, shape
+        rotations += 2 * len(pieces)
+    return rotations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    for engine in BOARD_ENGINES:
+        for kick_mode in KICK_TABLES:
+            board = build_crowded_board(engine)
+            board.kick_table = KICK_TABLES[kick_mode]
+            rate = run_rotations(board, build_rotation_pieces(board), args.seconds)
+            print(f"{engine:>10} / {kick_mode:<8}: {rate:>12,.0f} rotaciones/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark de logros: recorrer todas las condiciones vs RuleEngine por campos cambiados.
+
+Genera `--rules` logros con umbrales sobre varios campos del perfil y mide
+el final de partida (actualizar contadores y buscar desbloqueos) con cada
+método.
+
+Uso: python -m benchmarks.bench_rules [--rules 100 500 2000] [--games 200]
+"""
+import argparse
+import copy
+import random
+import time
+
+from src.rules import RuleEngine
+
+FIELDS = ("total_score", "best_score", "games_played", "lines_cleared", "max_lines")
+
+
+def build_rules(count, seed=1):
+    rng = random.Random(seed)
+    achievements = []
+    for i in range(count):
+        field = rng.choice(FIELDS)
+        limit = {"max_lines": 12, "games_played": 2000}.get(field, 500000)
+        achievements.append({"name": f"logro{i}", "desc": "", "rarity": "común", "field": field,
+                             "min": rng.randrange(1, limit)})
+    return {"rarities": {"común": {"xp": 50, "coins": 10}}, "achievements": achievements}
+
+
+def play(player, rng):
+    score = rng.randrange(5000)
+    player['total_score'] += score
+    player['games_played'] += 1
+    player['best_score'] = max(player['best_score'], score)
+    return ['total_score', 'games_played', 'best_score']
+
+
+def naive_check(conditions, player):
+    """El check_achievements anterior: cada condición en cada partida"""
+    for name, condition in conditions:
+        if name not in player['achievements'] and condition(player):
+            player['achievements'].append(name)
+            player['xp'] += 50
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--games", type=int, default=200)
+    args = parser.parse_args()
+
+    for count in args.rules:
+        rules = build_rules(count)
+        engine = RuleEngine(rules)
+        conditions = [(rule['name'], lambda p, f=rule['field'], m=rule['min']: p.get(f, 0) >= m)
+                      for rule in rules['achievements']]
+        start_player = {'total_score': 0, 'best_score': 0, 'games_played': 0, 'lines_cleared': 0, 'max_lines': 0,
+                        'achievements': [], 'xp': 0, 'coins': 0, 'level': 1, 'unlocked_cards': []}
+        results = {}
+        for method in ("naive", "engine"):
+            player = copy.deepcopy(start_player)
+            rng = random.Random(7)
+            start = time.perf_counter()
+            for _ in range(args.games):
+                changed = play(player, rng)
+                if method == "naive":
+                    naive_check(conditions, player)
+                else:
+                    engine.evaluate(player, changed)
+            results[method] = (time.perf_counter() - start) * 1000 / args.games
+            assert len(player['achievements']) > 0
+        print(f"{count:>6} reglas: todas las condiciones {results['naive']:8.3f} ms/partida, "
+              f"RuleEngine {results['engine']:6.3f} ms/partida ({results['naive'] / results['engine']:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
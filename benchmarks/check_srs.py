@@ -0,0 +1,123 @@
+"""Comprueba que el modo "srs" rota como SRS real.
+
+- casos conocidos: wall kick de la I en la pared derecha y un T-spin triple
+  que solo entra con el quinto kick
+- comparación con una simulación directa de SRS (estados y tablas de la
+  guía) en tableros aleatorios, para todas las piezas, rotaciones y sentidos
+
+Uso: python -m benchmarks.check_srs [--boards 50]
+"""
+import argparse
+import random
+import sys
+
+from src.tetris import (PieceType, TetrisPiece, SRS_SHAPES, SRS_STATES, SRS_JLSTZ_KICKS, SRS_I_KICKS,
+                        _compile_shapes, _srs_offsets)
+from src.bitboard import BOARD_ENGINES, create_board
+
+BLOCK = (120, 120, 120)
+SRS_CELLS = _compile_shapes(SRS_SHAPES)[0]
+
+
+def board_from_cells(engine, cells):
+    board = create_board(engine, kick_mode="srs")
+    for x, y in cells:
+        board.set_cell(x, y, BLOCK)
+    return board
+
+
+def rotate(board, piece_type, rotation, x, y, direction):
+    """Rota una pieza colocada en (x, y); devuelve sus celdas finales o None si no rota"""
+    piece = TetrisPiece(piece_type, x, y)
+    piece.rotation = rotation
+    piece.shape = piece.SHAPES[piece_type][rotation]
+    board.current_piece = piece
+    if not board.rotate_piece(direction):
+        return None
+    return sorted(piece.get_cells())
+
+
+def reference_rotate(board, piece_type, rotation, x, y, direction):
+    """Lo mismo con los estados y kicks de SRS, sin pasar por las tablas del juego"""
+    state = SRS_STATES[piece_type][rotation]
+    target = (state + direction) % 4
+    offset_x, offset_y = _srs_offsets(piece_type)[rotation]
+    kicks = (SRS_I_KICKS if piece_type == PieceType.I else SRS_JLSTZ_KICKS)[(state, target)]
+    for kick_x, kick_y in kicks:
+        box_x, box_y = x + offset_x + kick_x, y + offset_y - kick_y
+        cells = sorted((box_x + dx, box_y + dy) for dx, dy in SRS_CELLS[(piece_type, target)])
+        if all(0 <= cx < board.width and 0 <= cy < board.height and board.grid[cy][cx] is None
+               for cx, cy in cells):
+            return cells
+    return None
+
+
+def check_known_cases(engine):
+    errors = []
+    # I vertical (estado R) pegada a la pared derecha: al tumbarla el kick la mueve a la izquierda
+    board = board_from_cells(engine, ())
+    expected = {1: [(x, 12) for x in range(6, 10)], -1: [(x, 11) for x in range(6, 10)]}
+    for direction, cells in expected.items():
+        result = rotate(board, PieceType.I, 1, 7, 10, direction)
+        if result != cells:
+            errors.append(f"I en la pared derecha ({direction:+d}): {result} en vez de {cells}")
+    # T-spin triple: la T (estado 0) entra por debajo del saliente y gira a L con el kick (+1, -2)
+    slot = {(3, 17), (3, 18), (3, 19), (2, 18)}
+    stack = {(x, y) for y in (17, 18, 19) for x in range(10)} - slot
+    stack |= {(3, 15)} | {(x, y) for y in (15, 16) for x in range(4, 10)}
+    board = board_from_cells(engine, stack)
+    result = rotate(board, PieceType.T, 2, 1, 15, -1)
+    if result != sorted(slot):
+        errors.append(f"T-spin triple: {result} en vez de {sorted(slot)}")
+    else:
+        board.place_piece()
+        lines = board.clear_lines()
+        if lines != 3:
+            errors.append(f"T-spin triple: {lines} líneas en vez de 3")
+    return errors
+
+
+def check_against_reference(engine, boards, seed):
+    rng = random.Random(seed)
+    checked = 0
+    errors = []
+    for _ in range(boards):
+        fill = rng.uniform(0.2, 0.6)
+        cells = [(x, y) for y in range(8, 20) for x in range(10) if rng.random() < fill]
+        board = board_from_cells(engine, cells)
+        for piece_type in SRS_SHAPES:
+            for rotation in range(4):
+                for x in range(-3, board.width):
+                    for y in range(-3, board.height):
+                        if not board.fits(piece_type, rotation, x, y):
+                            continue
+                        for direction in (1, -1):
+                            result = rotate(board, piece_type, rotation, x, y, direction)
+                            expected = reference_rotate(board, piece_type, rotation, x, y, direction)
+                            checked += 1
+                            if result != expected and len(errors) < 10:
+                                errors.append(f"{piece_type.name} rot {rotation} en ({x}, {y}) "
+                                              f"{direction:+d}: {result} en vez de {expected}")
+    return checked, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--boards", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    failed = False
+    for engine in BOARD_ENGINES:
+        errors = check_known_cases(engine)
+        checked, reference_errors = check_against_reference(engine, args.boards, args.seed)
+        errors += reference_errors
+        print(f"{engine:>10}: casos conocidos y {checked:,} rotaciones contra SRS, {len(errors)} errores")
+        for error in errors:
+            print(f"    {error}")
+        failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""Suite de benchmarks sin pantalla con resultados en JSON y umbrales de regresión.
+
+Cada benchmark prepara un estado fijo (tableros generados con semilla, una
+partida con el tablero lleno, el menú, la colección de cartas, una limpieza
+de 8 líneas) y mide la duración de cada llamada en varias rondas. La métrica
+es la menor de las medianas de las rondas (en milisegundos), que aguanta
+mejor el ruido de la máquina; también se guarda el p95 de todas las llamadas.
+
+Antes de cada benchmark se cronometra un bucle fijo de Python (calibración).
+La comparación usa `relative` (ms / calibración), así una máquina más lenta o
+con la CPU limitada en ese momento no se confunde con una regresión; con
+--absolute se comparan los milisegundos.
+
+Uso:
+  python -m benchmarks.suite [--seconds 0.5] [--only board.] [--output resultados.json]
+  python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+  python -m benchmarks.suite --compare benchmarks/baseline.json [--threshold 0.25] [--absolute]
+
+Con --compare termina con código 1 si alguna métrica es más lenta que la
+línea base por encima de su umbral (THRESHOLDS o --threshold).
+
+benchmarks/baseline.json es la línea base del repositorio (métricas
+relativas, válidas entre máquinas); se regenera con --save-baseline cuando un
+cambio de rendimiento es intencionado.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from src.settings import Settings
+from src.game import TetrisGame
+from src.menu import MainMenu
+from src.renderer import GameRenderer
+from src.bitboard import BOARD_ENGINES
+from src.particles import PARTICLES_AVAILABLE
+from benchmarks.bench_board import build_crowded_board, build_queries, build_drop_pieces
+
+# Umbral de regresión por prefijo de métrica (fracción sobre el valor de la línea base)
+THRESHOLDS = {
+    "board.": 0.25,
+    "particles.": 0.30,
+    "render.": 0.35,  # El dibujo con el driver dummy tiene más ruido
+}
+DEFAULT_THRESHOLD = 0.25
+
+PLAYER = {'name': 'bench', 'total_score': 123456, 'best_score': 45678, 'games_played': 321,
+          'level': 7, 'unlocked_cards': list(range(12)), 'achievements': []}
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Registra una preparación: recibe el entorno y devuelve run o (run, prepare)"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def measure(run, seconds, prepare=None, rounds=5, min_calls=5):
+    """Llama a `run` durante `seconds` repartidos en `rounds` rondas (prepare va fuera del tiempo medido)"""
+    medians = []
+    times = []
+    for _ in range(rounds):
+        round_times = []
+        deadline = time.perf_counter() + seconds / rounds
+        while len(round_times) < min_calls or time.perf_counter() < deadline:
+            if prepare:
+                prepare()
+            start = time.perf_counter()
+            run()
+            round_times.append((time.perf_counter() - start) * 1000)
+        round_times.sort()
+        medians.append(round_times[len(round_times) // 2])
+        times.extend(round_times)
+    times.sort()
+    return {
+        'ms': min(medians),
+        'p95_ms': times[min(len(times) - 1, len(times) * 95 // 100)],
+        'calls': len(times),
+    }
+
+
+def calibrate(rounds=5, iterations=100000):
+    """ms del bucle de referencia (el mejor de `rounds`)"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        total = 0
+        for i in range(iterations):
+            total += i * i & 7
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def crowded_game(env, filled_rows=18):
+    """Partida con semilla fija sobre un tablero casi lleno"""
+    game = TetrisGame(env['screen'], env['settings'], PLAYER, seed=1)
+    game.board = build_crowded_board(env['settings'].board_engine, filled_rows=filled_rows, hole_chance=0.1)
+    game.board.generate_new_piece()
+    return game
+
+
+def register_board_benchmarks():
+    for engine in BOARD_ENGINES:
+        def collision(env, engine=engine):
+            board = build_crowded_board(engine)
+            queries = build_queries(board)
+            is_valid = board.is_valid_position_for_piece
+
+            def run():
+                for piece, rotation, x, y in queries:
+                    is_valid(piece, x - piece.x, y - piece.y, rotation)
+            return run
+
+        def ghost(env, engine=engine):
+            board = build_crowded_board(engine)
+            pieces = build_drop_pieces(board)
+            drop_distance = board.drop_distance
+
+            def run():
+                for piece in pieces:
+                    drop_distance(piece)
+            return run
+
+        def clear_lines(env, engine=engine, batch=20):
+            boards = []
+
+            def prepare():
+                # Lotes de tableros con 4 filas completas sobre filas con huecos
+                boards[:] = [build_crowded_board(engine, seed=i, filled_rows=14) for i in range(batch)]
+                for board in boards:
+                    for y in range(board.height - 4, board.height):
+                        for x in range(board.width):
+                            board.set_cell(x, y, (200, 200, 200))
+
+            def run():
+                for board in boards:
+                    board.clear_lines()
+            return run, prepare
+
+        benchmark(f"board.{engine}.collision")(collision)
+        benchmark(f"board.{engine}.ghost")(ghost)
+        benchmark(f"board.{engine}.clear_lines")(clear_lines)
+
+
+register_board_benchmarks()
+
+
+@benchmark("render.game_draw")
+def game_draw(env):
+    """Repintado completo de la pantalla de juego (TetrisGame.draw)"""
+    return crowded_game(env).draw
+
+
+@benchmark("render.game_frame_dirty")
+def game_frame_dirty(env):
+    """Un frame de partida con GameRenderer: update y dibujo de lo que cambió"""
+    game = crowded_game(env, filled_rows=12)
+    renderer = GameRenderer(game)
+    renderer.draw()
+
+    def prepare():
+        # Cada 4 s de juego se vuelve al tablero inicial para no llegar al game over
+        if game.tick % 240 == 0:
+            game.board = build_crowded_board(env['settings'].board_engine, filled_rows=12, hole_chance=0.1)
+            game.board.generate_new_piece()
+
+    def run():
+        game.update()
+        renderer.draw()
+    return run, prepare
+
+
+@benchmark("render.menu_draw")
+def menu_draw(env):
+    menu = MainMenu(env['screen'], env['settings'])
+    return lambda: menu.draw(PLAYER)
+
+
+class StubMusicManager:
+    """Lo que draw_cards consulta de MusicManager, sin carpetas de música ni mixer"""
+
+    def get_current_menu_song_name(self):
+        return "Canción de prueba"
+
+
+@benchmark("render.cards_draw")
+def cards_draw(env):
+    """GameApp.draw_cards sin crear GameApp (que arranca música y jugadores)"""
+    from src.game_app import GameApp
+    app = GameApp.__new__(GameApp)
+    app.screen = env['screen']
+    app.settings = env['settings']
+    app.music_manager = StubMusicManager()
+    app.current_player = PLAYER
+    app.debug_menu = False
+    app.debug_card_hover = None
+    return app.draw_cards
+
+
+def line_clear_burst(game):
+    game.create_line_clear_particles(8, (255, 255, 255), 6, True, list(range(12, 20)))
+    game.create_confetti(8, True)
+
+
+@benchmark("particles.burst_8_lines")
+def particles_burst(env):
+    """Crear las partículas de una limpieza de 8 líneas y simularlas hasta que mueren"""
+    game = TetrisGame(None, Settings(headless=True), PLAYER, seed=1)
+
+    def run():
+        line_clear_burst(game)
+        while len(game.particles):
+            game.particles.update()
+    return run
+
+
+@benchmark("particles.draw_8_lines")
+def particles_draw(env):
+    """Dibujar la ráfaga de 8 líneas a media vida"""
+    game = TetrisGame(env['screen'], env['settings'], PLAYER, seed=1)
+
+    def prepare():
+        game.particles.clear()
+        line_clear_burst(game)
+        for _ in range(20):
+            game.particles.update()
+
+    def run():
+        game.draw_particles()
+        game.draw_confetti()
+    return run, prepare
+
+
+def run_suite(seconds, only=None):
+    pygame.init()
+    settings = Settings()
+    env = {'settings': settings, 'screen': pygame.display.set_mode(settings.resolution)}
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        if name.startswith("particles.") and not PARTICLES_AVAILABLE:
+            continue
+        prepared = setup(env)
+        run, prepare = prepared if isinstance(prepared, tuple) else (prepared, None)
+        measure(run, min(0.1, seconds), prepare)  # Calentamiento: cachés y superficies
+        calibration = calibrate()
+        results[name] = measure(run, seconds, prepare)
+        calibration = min(calibration, calibrate())
+        results[name]['calibration_ms'] = calibration
+        results[name]['relative'] = results[name]['ms'] / calibration
+        print(f"{name:<32}{results[name]['ms']:>10.4f} ms  (p95 {results[name]['p95_ms']:.4f}, "
+              f"{results[name]['calls']} llamadas)")
+    pygame.quit()
+    return results
+
+
+def threshold_for(name, override=None):
+    if override is not None:
+        return override
+    for prefix, threshold in THRESHOLDS.items():
+        if name.startswith(prefix):
+            return threshold
+    return DEFAULT_THRESHOLD
+
+
+def compare(results, baseline, threshold=None, absolute=False):
+    """Lista de (métrica, base, actual, cambio) que empeoran por encima de su umbral"""
+    metric = 'ms' if absolute else 'relative'
+    regressions = []
+    for name, base in baseline['results'].items():
+        if name not in results:
+            continue
+        current = results[name][metric]
+        change = current / base[metric] - 1 if base[metric] else 0.0
+        marker = ""
+        if change > threshold_for(name, threshold):
+            regressions.append((name, base[metric], current, change))
+            marker = "  <-- REGRESIÓN"
+        print(f"{name:<32}{base[metric]:>10.4f} -> {current:>10.4f} {metric} ({change:+.0%}){marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=0.5, help="tiempo de medida por benchmark")
+    parser.add_argument("--only", action="append", help="prefijo de las métricas a ejecutar (repetible)")
+    parser.add_argument("--output", help="escribe los resultados en este JSON")
+    parser.add_argument("--save-baseline", metavar="PATH", help="guarda los resultados como línea base")
+    parser.add_argument("--compare", metavar="PATH", help="compara con una línea base guardada")
+    parser.add_argument("--threshold", type=float, help="umbral único para todas las métricas (0.25 = 25%%)")
+    parser.add_argument("--absolute", action="store_true", help="compara ms sin normalizar por la calibración")
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'seconds': args.seconds,
+        },
+        'results': run_suite(args.seconds, args.only),
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+    if args.compare:
+        try:
+            with open(args.compare, encoding="utf-8") as file:
+                baseline = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo leer la línea base {args.compare}: {e}")
+            print("Créala con: python -m benchmarks.suite --save-baseline " + args.compare)
+            sys.exit(2)
+        print(f"\ncomparación con {args.compare}:")
+        regressions = compare(report['results'], baseline, args.threshold, args.absolute)
+        if regressions:
+            print(f"{len(regressions)} métrica(s) por encima del umbral")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,4 +3,7 @@ from src.game_app import GameApp
 
 if __name__ == "__main__":
     app = GameApp()
+    # python main.py --replay replays/partida.txr
+    if len(sys.argv) > 2 and sys.argv[1] == "--replay":
+        app.start_replay(sys.argv[2])
     app.run()
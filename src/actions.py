@@ -0,0 +1,19 @@
+from enum import IntEnum
+
+
+class GameAction(IntEnum):
+    """Acciones de juego; sus valores caben en un byte para las repeticiones"""
+    QUIT = 1
+    LEFT_PRESS = 2
+    LEFT_RELEASE = 3
+    RIGHT_PRESS = 4
+    RIGHT_RELEASE = 5
+    SOFT_DROP = 6
+    ROTATE_CW = 7
+    ROTATE_CCW = 8
+    HARD_DROP = 9
+    CARD_1 = 10
+    CARD_2 = 11
+    CARD_3 = 12
+    HOLD = 13
+    SOFT_DROP_RELEASE = 14
@@ -0,0 +1,98 @@
+from src.tetris import TetrisBoard, TetrisPiece
+
+
+def _build_piece_masks(width):
+    """Por (PieceType, rotación): límites y máscara de las celdas con filas de `width` bits.
+
+    La máscara va relativa a la esquina (min_dx, min_dy) de la pieza, así el
+    desplazamiento hasta su posición nunca es negativo si la pieza cabe.
+    """
+    masks = {}
+    for key, cells in TetrisPiece.CELLS.items():
+        min_dx, min_dy, max_dx, max_dy = TetrisPiece.BOUNDS[key]
+        mask = sum(1 << ((dy - min_dy) * width + dx - min_dx) for dx, dy in cells)
+        masks[key] = (min_dx, min_dy, max_dx, max_dy, mask)
+    return masks
+
+
+class BitboardTetrisBoard(TetrisBoard):
+    """Tablero con toda la pila en un único entero (bit y * width + x = celda ocupada).
+
+    `grid` se mantiene como plano de colores para el render y para las
+    alturas de columna; las colisiones (movimientos, rotaciones con kicks,
+    fantasma por filas) y las líneas completas trabajan sobre `cells`: cada
+    comprobación es un desplazamiento y un AND, sin recorrer las celdas de
+    la pieza. Colocar o borrar filas actualiza la máscara con una operación
+    por pieza o por fila, no por celda.
+    """
+
+    def __init__(self, width=10, height=20, extended_height=24, kick_mode="classic", rng=None,
+                 randomizer="uniform", preview=1):
+        self.cells = 0
+        self.row_starts = sum(1 << (y * width) for y in range(height))  # Bit 0 de cada fila
+        self.piece_masks = _build_piece_masks(width)
+        super().__init__(width, height, extended_height, kick_mode, rng, randomizer, preview)
+
+    def fits(self, piece_type, rotation, x, y):
+        """Comprueba si la pieza cabe en (x, y) con un solo AND sobre la pila"""
+        min_dx, min_dy, max_dx, max_dy, mask = self.piece_masks[(piece_type, rotation)]
+        if x + min_dx < 0 or x + max_dx >= self.width or y + min_dy < 0 or y + max_dy >= self.height:
+            return False
+        return not self.cells & (mask << ((y + min_dy) * self.width + x + min_dx))
+
+    def place_piece(self, piece=None):
+        if piece is None:
+            piece = self.current_piece
+        if not super().place_piece(piece):
+            return False
+        if piece:
+            # Dentro del tablero (place_piece ya descartó lo que sale del techo extendido)
+            min_dx, min_dy, _, _, mask = self.piece_masks[(piece.type, piece.rotation)]
+            self.cells |= mask << ((piece.y + min_dy) * self.width + piece.x + min_dx)
+        return True
+
+    def full_rows(self):
+        """Filas completas: AND de la pila con sus copias desplazadas 1..width-1 bits;
+        queda a 1 el primer bit de cada fila llena"""
+        cells = self.cells
+        if not cells:
+            return []
+        full = cells
+        for shift in range(1, self.width):
+            full &= cells >> shift
+        full &= self.row_starts
+        rows = []
+        width = self.width
+        while full:
+            low = full & -full
+            rows.append((low.bit_length() - 1) // width)
+            full ^= low
+        return rows
+
+    def _compact_rows(self, cleared):
+        super()._compact_rows(cleared)
+        # De arriba abajo: quitar la fila y baja todo lo que tenía encima (los bits más bajos)
+        cells = self.cells
+        width = self.width
+        for y in cleared:
+            above = cells & ((1 << (y * width)) - 1)
+            cells = (cells >> ((y + 1) * width) << ((y + 1) * width)) | (above << width)
+        self.cells = cells
+
+    def set_cell(self, x, y, color):
+        bit = 1 << (y * self.width + x)
+        if color is None:
+            self.cells &= ~bit
+        else:
+            self.cells |= bit
+        super().set_cell(x, y, color)
+
+BOARD_ENGINES = {
+    "grid": TetrisBoard,
+    "bitboard": BitboardTetrisBoard,
+}
+
+
+def create_board(engine="bitboard", **kwargs):
+    """Crea el tablero con el motor indicado ('grid' o 'bitboard')"""
+    return BOARD_ENGINES[engine](**kwargs)
@@ -1,6 +1,7 @@
 import pygame
 import random
 from src.tetris import TetrisBoard, TetrisPiece
+from src.render_cache import text_cache
 
 class Card:
     def __init__(self, name, description, effect_type, rarity="common", power=1, duration=0):
@@ -11,6 +12,7 @@ class Card:
         self.power = power
         self.duration = duration
         self.used = False
+        self.index = None  # Posición en CardManager.all_cards (la asigna draw_card)
         # Agregar descripciones detalladas para demostraciones
         self.demo_description = {
             "clear_line": "Limpia una línea casi completa",
@@ -63,7 +65,7 @@ class Card:
     def clear_line_effect(self, game_state):
         for y in range(game_state.board.height - 1, -1, -1):
             if sum(1 for cell in game_state.board.grid[y] if cell is not None) >= 7:
-                game_state.board.grid[y] = [None for _ in range(game_state.board.width)]
+                game_state.board.clear_rows([y])
                 return True
         return False
     
@@ -87,20 +89,19 @@ class Card:
             if any(cell is not None for cell in game_state.board.grid[y]):
                 for x in range(game_state.board.width):
                     if game_state.board.grid[y][x] is None:
-                        game_state.board.grid[y][x] = (150, 150, 150)
+                        game_state.board.set_cell(x, y, (150, 150, 150))
                 return True
         return False
     
     def line_bomb_effect(self, game_state):
-        # Elimina múltiples líneas
-        lines_cleared = 0
-        for _ in range(self.power):
-            for y in range(game_state.board.height - 1, -1, -1):
-                if any(cell is not None for cell in game_state.board.grid[y]):
-                    game_state.board.grid[y] = [None for _ in range(game_state.board.width)]
-                    lines_cleared += 1
-                    break
-        return lines_cleared > 0
+        # Elimina las `power` líneas ocupadas más bajas y compacta el tablero
+        rows = []
+        for y in range(game_state.board.height - 1, -1, -1):
+            if len(rows) >= self.power:
+                break
+            if any(cell is not None for cell in game_state.board.grid[y]):
+                rows.append(y)
+        return len(game_state.board.clear_rows(rows)) > 0
     
     def piece_transform_effect(self, game_state):
         # Transforma la pieza actual en una línea I
@@ -125,13 +126,12 @@ class Card:
     
     def mega_clear_effect(self, game_state):
         # Limpia todas las líneas con menos de 3 bloques
-        lines_cleared = 0
+        rows = []
         for y in range(game_state.board.height - 1, -1, -1):
             block_count = sum(1 for cell in game_state.board.grid[y] if cell is not None)
             if 0 < block_count <= 3:
-                game_state.board.grid[y] = [None for _ in range(game_state.board.width)]
-                lines_cleared += 1
-        return lines_cleared > 0
+                rows.append(y)
+        return len(game_state.board.clear_rows(rows)) > 0
     
     def golden_touch_effect(self, game_state):
         game_state.golden_mode = True
@@ -146,16 +146,17 @@ class Card:
             for x in range(game_state.board.width):
                 if game_state.board.grid[y][x] is not None:
                     all_blocks.append(game_state.board.grid[y][x])
-                game_state.board.grid[y][x] = None
+                game_state.board.set_cell(x, y, None)
         
         # Redistribuir bloques aleatoriamente en la parte inferior
-        random.shuffle(all_blocks)
+        rng = game_state.rng
+        rng.shuffle(all_blocks)
         block_index = 0
         
         for y in range(game_state.board.height - 1, -1, -1):
             for x in range(game_state.board.width):
-                if block_index < len(all_blocks) and random.random() < 0.7:
-                    game_state.board.grid[y][x] = all_blocks[block_index]
+                if block_index < len(all_blocks) and rng.random() < 0.7:
+                    game_state.board.set_cell(x, y, all_blocks[block_index])
                     block_index += 1
                 if block_index >= len(all_blocks):
                     break
@@ -165,7 +166,8 @@ class Card:
         return True
 
 class CardManager:
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random.Random()
         self.all_cards = [
             # Cartas Comunes (0-5)
             Card("Línea Perfecta", "Completa la línea más baja", "perfect_line", "common"),
@@ -194,12 +196,14 @@ class CardManager:
         
         self.hand = []
         self.max_hand_size = 3
+        self.used_counts = [0] * len(self.all_cards)  # Usos de cada carta en la partida
     
     def draw_card(self, unlocked_cards):
         if len(self.hand) < self.max_hand_size and unlocked_cards:
-            available_indices = [i for i in unlocked_cards if i < len(self.all_cards)]
+            # Orden estable para que la misma semilla robe siempre la misma carta
+            available_indices = sorted(i for i in set(unlocked_cards) if i < len(self.all_cards))
             if available_indices:
-                card_index = random.choice(available_indices)
+                card_index = self.rng.choice(available_indices)
                 original_card = self.all_cards[card_index]
                 new_card = Card(
                     original_card.name,
@@ -209,6 +213,7 @@ class CardManager:
                     original_card.power,
                     original_card.duration
                 )
+                new_card.index = card_index
                 self.hand.append(new_card)
                 return True
         return False
@@ -218,6 +223,8 @@ class CardManager:
             card = self.hand[index]
             if card.use(game_state):
                 self.hand.pop(index)
+                if card.index is not None:
+                    self.used_counts[card.index] += 1
                 return True
         return False
     
@@ -230,12 +237,9 @@ class CardManager:
         return colors.get(rarity, (255, 255, 255))
     
     def draw_hand(self, screen, x, y):
-        font = pygame.font.Font(None, 20)
-        title_font = pygame.font.Font(None, 28)
-        
         # Título
-        title = title_font.render("CARTAS ACTIVAS", True, (255, 255, 255))
-        screen.blit(title, (x, y - 30))
+        title = text_cache.render("CARTAS ACTIVAS", 28, (255, 255, 255))
+        area = screen.blit(title, (x, y - 30))
         
         card_width = 140
         card_height = 90
@@ -256,6 +260,7 @@ class CardManager:
             shadow_rect.x += 2
             shadow_rect.y += 2
             pygame.draw.rect(screen, (10, 10, 10), shadow_rect, border_radius=8)
+            area.union_ip(card_rect.union(shadow_rect))
             
             # Fondo
             pygame.draw.rect(screen, bg_color, card_rect, border_radius=8)
@@ -264,20 +269,21 @@ class CardManager:
             # Nombre de la carta
             name_lines = card.name.split(' ')
             for j, line in enumerate(name_lines[:2]):  # Máximo 2 líneas
-                name_text = font.render(line, True, (255, 255, 255))
+                name_text = text_cache.render(line, 20, (255, 255, 255))
                 name_rect = name_text.get_rect(center=(card_x + card_width//2, card_y + 15 + j * 15))
-                screen.blit(name_text, name_rect)
+                area.union_ip(screen.blit(name_text, name_rect))
             
             # Rareza
-            rarity_text = font.render(card.rarity.upper(), True, rarity_color)
+            rarity_text = text_cache.render(card.rarity.upper(), 20, rarity_color)
             rarity_rect = rarity_text.get_rect(center=(card_x + card_width//2, card_y + 50))
             screen.blit(rarity_text, rarity_rect)
             
             # Número de la carta
-            num_text = title_font.render(f"{i+1}", True, (255, 255, 0))
+            num_text = text_cache.render(f"{i+1}", 28, (255, 255, 0))
             screen.blit(num_text, (card_x + 5, card_y + 5))
             
             # Indicador de poder si aplica
             if card.power > 1:
-                power_text = font.render(f"x{card.power}", True, (255, 200, 0))
-                screen.blit(power_text, (card_x + card_width - 25, card_y + 5))
\ No newline at end of file
+                power_text = text_cache.render(f"x{card.power}", 20, (255, 200, 0))
+                area.union_ip(screen.blit(power_text, (card_x + card_width - 25, card_y + 5)))
+        return area
\ No newline at end of file
@@ -0,0 +1,11 @@
+class SimulationClock:
+    """Reloj manual compatible con pygame.time.get_ticks()"""
+
+    def __init__(self, start_ms=0):
+        self.ticks = start_ms
+
+    def get_ticks(self):
+        return self.ticks
+
+    def advance(self, ms):
+        self.ticks += ms
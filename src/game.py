@@ -3,19 +3,43 @@ import time
 import math
 import random
 from src.tetris import TetrisBoard, TetrisPiece
+from src.bitboard import create_board
 from src.cards import CardManager
+from src.actions import GameAction
+from src.clock import SimulationClock
+from src.profiler import NULL_PROFILER
+from src.input import KeyMap
+from src.history import MAX_CLEAR
+from src.render_cache import gradient_cache, block_atlas, text_cache, particle_stamps, fill_cache
+from src.particles import create_particle_system, KIND_GOLDEN, KIND_LINE_CLEAR, KIND_CONFETTI, KIND_HARD_DROP
 
 class TetrisGame:
-    def __init__(self, screen, settings, player):
+    tick_ms = 1000 / 60  # Paso fijo de simulación: tiempo de juego que avanza cada update()
+
+    def __init__(self, screen, settings, player, clock=None, seed=None):
         self.screen = screen
         self.settings = settings
         self.player = player
-        self.board = TetrisBoard()
-        self.card_manager = CardManager()
+        # Sin pantalla la partida corre en modo headless (simulación, sin fuentes ni sonido)
+        self.headless = screen is None
+        # Reloj de juego inyectable (get_ticks/advance); avanza con cada update() para
+        # que la partida dependa solo del número de ticks y sea reproducible
+        self.clock = clock if clock is not None else SimulationClock()
+        self.tick = 0
+        # Toda la aleatoriedad que afecta a la partida sale de este generador
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.recorder = None  # ReplayRecorder opcional
+        self.profiler = NULL_PROFILER  # FrameProfiler opcional (lo asigna GameApp)
+        self.board = create_board(settings.board_engine, kick_mode=settings.rotation_system, rng=self.rng,
+                                  randomizer=settings.randomizer, preview=settings.next_preview)
+        self.board.lock_delay = settings.lock_delay
+        self.card_manager = CardManager(rng=self.rng)
         
         # Estado del juego
         self.score = 0
         self.lines_cleared = 0
+        self.clear_counts = [0] * MAX_CLEAR  # Limpiezas por número de líneas (la última, MAX_CLEAR o más)
         self.level = 1
         self.fall_timer = 0
         self.fall_timer_max = settings.fall_speed
@@ -37,85 +61,144 @@ class TetrisGame:
         self.cell_size = 35
         self.board_x = 80
         self.board_y = 80
+        # Superficie persistente con el tablero y la pila; se repinta solo por filas cambiadas
+        self.stack_surface = None
+        self.stack_key = None
+        self.stack_version = 0
         
-        # Fuentes modernas
-        self.font_large = pygame.font.Font(None, 42)
-        self.font_medium = pygame.font.Font(None, 32)
-        self.font_small = pygame.font.Font(None, 24)
-        
-        # Efectos visuales
-        self.particles = []
+        # Efectos visuales: todas las partículas en un único sistema de arrays
+        self.particles = create_particle_system(settings.particle_capacity)
+        self.apply_quality()
         self.line_clear_animation = []
         
         # Suavizado de animaciones
         self.smooth_anim = None
         self.line_clear_text = None  # (texto, timer, color, scale, rainbow)
         self.combo_bonus_text = None # (texto, timer, color, scale, rainbow)
-        self.line_clear_particles = []
-        self.hard_drop_particles = []
-        self.confetti_particles = []
-        self.last_speedup_time = pygame.time.get_ticks()
+        self.last_speedup_time = self.clock.get_ticks()
         self.speedup_interval = 30000  # 30 segundos
         self.speedup_amount = 60  # ms menos por nivel
         self.base_fall_speed = settings.fall_speed
         # --- Hold piece ---
         self.hold_piece = None
         self.hold_used = False
-        # --- Movimiento rápido al holdear ---
+        self.hold_pieces_placed = 0  # board.pieces_placed cuando se usó el hold
+        # --- Entrada: teclas a acciones y repetición en ms de juego ---
+        self.keymap = KeyMap(settings.controls)
+        self.das_ms = settings.das_ms
+        self.arr_ms = settings.arr_ms
+        self.soft_drop_ms = settings.fast_fall_speed
         self.move_left_held = False
         self.move_right_held = False
-        self.move_timer = 0
-        self.move_delay = 10  # frames antes de repetir
-        self.move_repeat = 2  # frames entre repeticiones
+        self.shift_direction = 0  # -1/1: dirección que se repite (la última pulsada)
+        self.shift_timer = 0  # ms que lleva mantenida
+        self.shift_repeats = 0  # Movimientos automáticos ya hechos tras el DAS
+        self.soft_drop_held = False
+        self.soft_drop_timer = 0
         
         # Generar cartas iniciales
         if settings.unlocked_cards:
             for _ in range(2):  # Empezar con 2 cartas
                 self.card_manager.draw_card(settings.unlocked_cards)
     
+    def action_for_event(self, event):
+        """Traduce un evento de teclado a una GameAction (o None)"""
+        return self.keymap.action_for_event(event)
+
     def handle_event(self, event):
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                return "menu"
-            elif event.key == self.settings.controls['left']:
-                self.board.move_piece(-1, 0)
-                self.move_left_held = True
-                self.move_timer = 0
-            elif event.key == self.settings.controls['right']:
-                self.board.move_piece(1, 0)
-                self.move_right_held = True
-                self.move_timer = 0
-            elif event.key == self.settings.controls['down']:
-                self.board.move_piece(0, 1)
-            elif event.key == self.settings.controls['rotate'] or event.key == pygame.K_r:
-                self.board.rotate_piece_clockwise()
-            elif event.key == pygame.K_q:
-                self.board.rotate_piece_counterclockwise()
-            elif event.key == self.settings.controls['drop']:
-                # Hard drop instantáneo y efecto de partículas
-                if self.board.current_piece:
-                    from_y = self.board.current_piece.y
-                    to_y = self.board.ghost_y
-                    self.board.current_piece.y = to_y
+        action = self.action_for_event(event)
+        if action is None:
+            return None
+        return self.perform_action(action)
+
+    def perform_action(self, action):
+        """Aplica una acción al estado de la partida y la registra si se está grabando"""
+        if self.recorder is not None:
+            self.recorder.record(self.tick, action)
+        if action == GameAction.QUIT:
+            return "menu"
+        elif action == GameAction.LEFT_PRESS:
+            self.move_left_held = True
+            self.start_shift(-1)
+        elif action == GameAction.RIGHT_PRESS:
+            self.move_right_held = True
+            self.start_shift(1)
+        elif action == GameAction.SOFT_DROP:
+            self.board.move_piece(0, 1)
+            self.soft_drop_held = True
+            self.soft_drop_timer = 0
+        elif action == GameAction.SOFT_DROP_RELEASE:
+            self.soft_drop_held = False
+        elif action == GameAction.ROTATE_CW:
+            self.board.rotate_piece_clockwise()
+        elif action == GameAction.ROTATE_CCW:
+            self.board.rotate_piece_counterclockwise()
+        elif action == GameAction.HARD_DROP:
+            # Hard drop instantáneo y efecto de partículas
+            if self.board.current_piece:
+                to_y = self.board.ghost_y
+                self.board.current_piece.y = to_y
+                if self.settings.particle_effects:
                     self.create_hard_drop_particles(self.board.current_piece)
-                    self.board.drop_piece()
-                    self.board.current_piece.lock_timer = 9999
-                    self.board.update()
-                return None
-            elif event.key == pygame.K_1:
-                self.card_manager.use_card(0, self)
-            elif event.key == pygame.K_2:
-                self.card_manager.use_card(1, self)
-            elif event.key == pygame.K_3:
-                self.card_manager.use_card(2, self)
-            elif event.key == self.settings.controls.get('hold', pygame.K_c):
-                self.handle_hold_piece()
-        elif event.type == pygame.KEYUP:
-            if event.key in [self.settings.controls['left'], pygame.K_a]:
-                self.move_left_held = False
-            elif event.key in [self.settings.controls['right'], pygame.K_d]:
-                self.move_right_held = False
+                self.board.drop_piece()
+                self.board.current_piece.lock_timer = 9999
+                return self.handle_board_result(self.board.update())
+        elif action == GameAction.CARD_1:
+            self.card_manager.use_card(0, self)
+        elif action == GameAction.CARD_2:
+            self.card_manager.use_card(1, self)
+        elif action == GameAction.CARD_3:
+            self.card_manager.use_card(2, self)
+        elif action == GameAction.HOLD:
+            return self.handle_hold_piece()
+        elif action == GameAction.LEFT_RELEASE:
+            self.move_left_held = False
+            self.release_shift(-1)
+        elif action == GameAction.RIGHT_RELEASE:
+            self.move_right_held = False
+            self.release_shift(1)
         return None
+
+    def start_shift(self, direction):
+        """Mueve una columna y empieza a cargar el DAS en esa dirección"""
+        self.board.move_piece(direction, 0)
+        self.shift_direction = direction
+        self.shift_timer = 0
+        self.shift_repeats = 0
+
+    def release_shift(self, direction):
+        """Al soltar, si la otra dirección sigue pulsada pasa a repetirse esa (con su DAS)"""
+        if self.shift_direction != direction:
+            return
+        other_held = self.move_right_held if direction < 0 else self.move_left_held
+        self.shift_direction = -direction if other_held else 0
+        self.shift_timer = 0
+        self.shift_repeats = 0
+
+    def update_auto_repeat(self, elapsed_ms):
+        """DAS/ARR y caída suave mantenida, en milisegundos de juego"""
+        if self.shift_direction:
+            self.shift_timer += elapsed_ms
+            charged = self.shift_timer - self.das_ms
+            if charged >= -1e-6:
+                if self.arr_ms <= 0:
+                    # ARR 0: hasta la pared en el mismo tick
+                    while self.board.move_piece(self.shift_direction, 0):
+                        pass
+                else:
+                    due = int((charged + 1e-6) // self.arr_ms) + 1
+                    # Con ARR menor que un tick puede tocar más de un movimiento
+                    for _ in range(min(due - self.shift_repeats, self.board.width)):
+                        if not self.board.move_piece(self.shift_direction, 0):
+                            break
+                    self.shift_repeats = due
+        if self.soft_drop_held:
+            self.soft_drop_timer += elapsed_ms
+            while self.soft_drop_timer >= self.soft_drop_ms:
+                self.soft_drop_timer -= self.soft_drop_ms
+                if not self.board.move_piece(0, 1):
+                    self.soft_drop_timer = 0
+                    break
     
     def handle_hold_piece(self):
         if self.hold_used:
@@ -124,56 +207,51 @@ class TetrisGame:
         if current is None:
             return
         if self.hold_piece is None:
-            # Guarda la pieza actual y saca la siguiente
+            # Guarda la pieza actual y saca la siguiente de la cola
             self.hold_piece = current
-            self.board.current_piece = self.board.next_piece
-            self.board.next_piece = TetrisPiece(random.choice(list(TetrisPiece.SHAPES.keys())), self.board.width // 2 - 1, 0)
+            self.board.generate_new_piece()
         else:
             # Intercambia la pieza actual con la del hold
-            temp = self.hold_piece
+            held_type = self.hold_piece.type
             self.hold_piece = current
-            temp.x = self.board.width // 2 - 1
-            temp.y = 0
-            temp.rotation = 0
-            temp.shape = temp.SHAPES[temp.type][0]
-            self.board.current_piece = temp
+            self.board.spawn_piece(held_type)
         self.hold_used = True
+        self.hold_pieces_placed = self.board.pieces_placed
+        # Igual que al sacar una pieza normal: si no cabe en la salida, fin de la partida
+        if self.board.check_game_over():
+            return self.handle_board_result("game_over")
+        return None
 
     def update(self):
-        # --- Movimiento rápido al holdear ---
-        if self.move_left_held or self.move_right_held:
-            self.move_timer += 1
-            if self.move_timer > self.move_delay:
-                if self.move_timer % self.move_repeat == 0:
-                    if self.move_left_held:
-                        self.board.move_piece(-1, 0)
-                    if self.move_right_held:
-                        self.board.move_piece(1, 0)
-        else:
-            self.move_timer = 0
+        self.tick += 1
+        self.clock.advance(self.tick_ms)
+        # Movimiento mantenido (DAS/ARR) y caída suave
+        self.update_auto_repeat(self.tick_ms)
         
         # Actualizar efectos de cartas
-        self.update_card_effects()
+        self.profiler.call("update.cards", self.update_card_effects)
         
         # Actualizar partículas
-        self.update_particles()
+        self.profiler.call("update.particles", self.update_particles)
         
         # Caída automática de piezas (si no está congelado)
         if not self.time_frozen:
-            self.fall_timer += 16  # Aproximadamente 60 FPS
-            if self.fall_timer >= self.fall_timer_max:
+            piece = self.board.current_piece
+            result = 0
+            if piece and not self.board.is_valid_position_for_piece(piece, 0, 1):
+                # Apoyada: el lock delay corre en milisegundos de juego en cada tick
                 self.fall_timer = 0
-                result = self.board.update()
-                if result == "game_over":
-                    return "menu"
-                elif isinstance(result, int) and result > 0:
-                    self.handle_line_clear(result)
+                result = self.board.update(self.tick_ms)
+            else:
+                self.fall_timer += self.tick_ms
+                if self.fall_timer >= self.fall_timer_max:
+                    self.fall_timer -= self.fall_timer_max
+                    result = self.board.update(self.tick_ms)
+            if self.handle_board_result(result) == "menu":
+                return "menu"
         
-        # Reset hold_used cuando se coloca una pieza
-        if self.board.current_piece is None and self.hold_used:
-            self.hold_used = False
         # Aumenta la velocidad cada 30s
-        now = pygame.time.get_ticks()
+        now = self.clock.get_ticks()
         if now - self.last_speedup_time > self.speedup_interval:
             self.last_speedup_time = now
             self.fall_timer_max = max(80, self.fall_timer_max - self.speedup_amount)
@@ -191,8 +269,8 @@ class TetrisGame:
                 self.board.current_piece.y = to_y
                 self.board.drop_piece()
                 self.board.current_piece.lock_timer = 9999
-                self.board.update()
                 self.smooth_anim = None
+                return self.handle_board_result(self.board.update())
     
     def update_card_effects(self):
         """Actualiza todos los efectos activos de las cartas"""
@@ -234,8 +312,24 @@ class TetrisGame:
                 if self.score_multiplier > 3:  # Solo resetear si es del modo dorado
                     self.score_multiplier = 1
     
-    def handle_line_clear(self, lines_cleared):
+    def handle_board_result(self, result):
+        """Procesa lo que devuelve board.update(): fin de juego o líneas completadas"""
+        # Colocada la pieza, la siguiente vuelve a poder usar el hold
+        if self.hold_used and self.board.pieces_placed != self.hold_pieces_placed:
+            self.hold_used = False
+        if result == "game_over":
+            return "menu"
+        elif isinstance(result, int) and result > 0:
+            self.handle_line_clear(result)
+        return None
+
+    def handle_line_clear(self, lines_cleared, rows=None):
         """Maneja la limpieza de líneas y efectos"""
+        if rows is None:
+            rows = self.board.last_cleared_rows
+        # Destello sobre exactamente las filas eliminadas
+        self.line_clear_animation = [[y, 20] for y in rows]
+
         # Calcular puntos
         base_points = [0, 100, 300, 500, 800, 1200, 1600, 2000, 3000]
         idx = min(lines_cleared, len(base_points) - 1)
@@ -244,7 +338,8 @@ class TetrisGame:
         # Bonus por modo dorado
         if self.golden_mode:
             points *= 2
-            self.create_golden_particles()
+            if self.settings.particle_effects:
+                self.create_golden_particles()
             
         # Nuevo: Bonus adicional por múltiples líneas (2+)
         if lines_cleared >= 2:
@@ -255,6 +350,7 @@ class TetrisGame:
         # ARREGLO: sumar puntos aunque sea una sola línea
         self.score += int(points)
         self.lines_cleared += lines_cleared
+        self.clear_counts[min(lines_cleared, MAX_CLEAR) - 1] += 1
         self.level = self.lines_cleared // 10 + 1
 
         # Efecto de texto y partículas según líneas
@@ -270,8 +366,9 @@ class TetrisGame:
             scale = 1.2 + (lines_cleared - 2) * 0.25
             rainbow = (lines_cleared >= 8)
             self.line_clear_text = (name, 90 + (lines_cleared - 2)*10, color, scale, rainbow)
-            self.create_line_clear_particles(lines_cleared, color, lines_cleared - 2, rainbow)
-            self.create_confetti(lines_cleared, rainbow)
+            if self.settings.particle_effects:
+                self.create_line_clear_particles(lines_cleared, color, lines_cleared - 2, rainbow, rows)
+                self.create_confetti(lines_cleared, rainbow)
             self.play_firework_sound()
             if lines_cleared >= 8:
                 self.score += 5000
@@ -280,56 +377,67 @@ class TetrisGame:
         if len(self.card_manager.hand) == 0 and hasattr(self.settings, "unlocked_cards") and self.settings.unlocked_cards:
             self.card_manager.draw_card(self.settings.unlocked_cards)
 
-    def create_line_clear_particles(self, lines_count, color=None, idx=0, rainbow=False):
-        n_particles = lines_count * 30 + idx * 20
-        for _ in range(n_particles):
-            angle = random.uniform(-3.14, 3.14)
-            speed = random.uniform(4 + idx*2, 12 + idx*4)
-            if rainbow:
-                color = self.get_rainbow_color(random.uniform(0, 1))
-            self.line_clear_particles.append({
-                'x': self.board_x + self.board.width * self.cell_size // 2,
-                'y': self.board_y + self.board.height * self.cell_size // 2,
-                'vx': speed * math.cos(angle),
-                'vy': speed * math.sin(angle),
-                'color': color,
-                'life': 50 + lines_count * 8 + idx*10,
-                'max_life': 50 + lines_count * 8 + idx*10
-            })
+    def create_line_clear_particles(self, lines_count, color=None, idx=0, rainbow=False, rows=None):
+        n_particles = self.particles.scaled(lines_count * 30 + idx * 20)
+        center_y = self.board_y + self.board.height * self.cell_size // 2
+        if rows:
+            # Las partículas se reparten por turnos entre las filas eliminadas
+            row_centers = [self.board_y + y * self.cell_size + self.cell_size // 2 for y in rows]
+            center_y = [row_centers[i % len(rows)] for i in range(n_particles)]
+        if rainbow:
+            color = self.particles.rainbow_colors(n_particles)
+        self.particles.burst(
+            KIND_LINE_CLEAR, n_particles,
+            x=self.board_x + self.board.width * self.cell_size // 2,
+            y=center_y,
+            speed=(4 + idx*2, 12 + idx*4),
+            life=50 + lines_count * 8 + idx*10,
+            color=color,
+            angle=3.14,
+        )
 
     def create_confetti(self, lines, rainbow):
         # Más confeti para más líneas
-        particle_count = 40 + lines * 30
-        
-        for _ in range(particle_count):
-            angle = random.uniform(-math.pi, math.pi)
-            speed = random.uniform(3, 10 + lines * 2)
-            
-            if rainbow:
-                color = self.get_rainbow_color(random.uniform(0, 1))
-            elif lines >= 4:
-                color_options = [
-                    (255, 215, 0), (255, 100, 100), (100, 255, 100),
-                    (100, 100, 255), (255, 255, 100)
-                ]
-                color = random.choice(color_options)
-            else:
-                color = (random.randint(80, 255), random.randint(80, 255), random.randint(120, 255))
-            
-            size_factor = 1.0 + (lines >= 4) * 0.5
-            
-            self.confetti_particles.append({
-                'x': self.board_x + self.board.width * self.cell_size // 2,
-                'y': self.board_y + 60,
-                'vx': speed * math.cos(angle),
-                'vy': speed * math.sin(angle) - 2,
-                'color': color,
-                'life': random.randint(30, 60 + lines * 5),
-                'max_life': 60 + lines * 5,
-                'size': random.uniform(2, 6) * size_factor
-            })
+        particle_count = self.particles.scaled(40 + lines * 30)
+
+        if rainbow:
+            colors = self.particles.rainbow_colors(particle_count)
+        elif lines >= 4:
+            color_options = [
+                (255, 215, 0), (255, 100, 100), (100, 255, 100),
+                (100, 100, 255), (255, 255, 100)
+            ]
+            colors = self.particles.choose_colors(particle_count, color_options)
+        else:
+            colors = self.particles.random_colors(particle_count, (80, 80, 120), (255, 255, 255))
+
+        size_factor = 1.0 + (lines >= 4) * 0.5
+
+        self.particles.burst(
+            KIND_CONFETTI, particle_count,
+            x=self.board_x + self.board.width * self.cell_size // 2,
+            y=self.board_y + 60,
+            speed=(3, 10 + lines * 2),
+            life=(30, 60 + lines * 5),
+            max_life=60 + lines * 5,
+            color=colors,
+            size=(2 * size_factor, 6 * size_factor),
+            vy_offset=-2,
+        )
+
+    def create_golden_particles(self):
+        self.particles.burst(
+            KIND_GOLDEN, self.particles.scaled(40),
+            x=self.board_x + self.board.width * self.cell_size // 2,
+            y=self.board_y + self.board.height * self.cell_size // 2,
+            speed=(2, 7),
+            life=40,
+            color=(255, 215, 0),
+        )
 
     def play_firework_sound(self):
+        if self.headless:
+            return
         try:
             pygame.mixer.Sound("firework.wav").play()
         except Exception:
@@ -350,15 +458,14 @@ class TetrisGame:
     
     def update_particles(self):
         """Actualiza todas las partículas"""
-        for particles_list in [self.particles, self.line_clear_particles, self.confetti_particles, self.hard_drop_particles]:
-            for particle in particles_list[:]:
-                particle['x'] += particle.get('vx', 0)
-                particle['y'] += particle.get('vy', 0)
-                particle['vy'] += particle.get('gravity', 0.2)
-                particle['life'] -= 1
-                if particle['life'] <= 0:
-                    particles_list.remove(particle)
+        self.particles.update()
         
+        # Destello de filas eliminadas
+        if self.line_clear_animation:
+            for flash in self.line_clear_animation:
+                flash[1] -= 1
+            self.line_clear_animation = [flash for flash in self.line_clear_animation if flash[1] > 0]
+
         # Actualizar texto de bonus
         if hasattr(self, 'combo_bonus_text') and self.combo_bonus_text:
             text, timer, color, scale, rainbow = self.combo_bonus_text
@@ -367,24 +474,50 @@ class TetrisGame:
             else:
                 self.combo_bonus_text = None
     
+    def apply_quality(self):
+        """Aplica el nivel de calidad visual de settings.quality a las partículas"""
+        quality = self.settings.quality
+        self.particles.set_quality(quality['particles'], quality['particle_limit'])
+
+    def grid_visible(self):
+        return self.settings.show_grid and self.settings.quality['grid']
+
     def draw(self):
-        self.draw_gradient_background()
-        self.draw_board()
+        """Repinta la pantalla completa"""
+        self.draw_static_layers()
+        self.draw_overlays()
+
+    def static_layers(self):
+        """Capas que solo cambian con el estado, de abajo arriba: {nombre: función que la dibuja y devuelve su rect}"""
+        call = self.profiler.call
+        return {
+            'background': lambda: call("draw.background", self.draw_gradient_background),
+            'board': lambda: call("draw.board", self.draw_board),
+            'next': lambda: call("draw.next", self.draw_next_piece),
+            'info': lambda: call("draw.info", self.draw_game_info),
+            'hand': lambda: call("draw.hand", self.card_manager.draw_hand, self.screen, 500, 500),
+            'effects': lambda: call("draw.effects", self.draw_effects),
+        }
+
+    def draw_static_layers(self):
+        """Dibuja fondo, tablero y paneles. Devuelve el rect de cada capa"""
+        return {name: draw() for name, draw in self.static_layers().items()}
+
+    def draw_overlays(self):
+        """Lo que se mueve cada frame: piezas, destellos, partículas y textos. Devuelve los rects pintados"""
+        call = self.profiler.call
+        rects = call("draw.flash", self.draw_cleared_rows_flash)
         if self.settings.show_ghost_piece and self.board.current_piece:
-            self.draw_ghost_piece()
+            rects += call("draw.ghost", self.draw_ghost_piece)
         if self.board.current_piece:
-            self.draw_piece(self.board.current_piece)
-        self.draw_next_piece()
-        self.draw_game_info()
-        self.card_manager.draw_hand(self.screen, 500, 500)
-        self.draw_effects()
-        self.draw_particles()
-        self.draw_hard_drop_particles()
-        self.draw_line_clear_effect()
-        self.draw_confetti()
+            rects += call("draw.piece", self.draw_piece, self.board.current_piece)
+        rects += call("draw.particles", self.draw_particles)
+        rects += call("draw.hard_drop", self.draw_hard_drop_particles)
+        rects += call("draw.line_clear", self.draw_line_clear_effect)
+        rects += call("draw.confetti", self.draw_confetti)
+        return rects
     
     def draw_gradient_background(self):
-        height = self.screen.get_height()
         base_color = (15, 20, 35)
         if self.golden_mode:
             accent_color = (40, 35, 15)
@@ -392,12 +525,11 @@ class TetrisGame:
             accent_color = (15, 35, 40)
         else:
             accent_color = (25, 15, 35)
-        for y in range(height):
-            ratio = y / height
-            r = int(base_color[0] * (1 - ratio) + accent_color[0] * ratio)
-            g = int(base_color[1] * (1 - ratio) + accent_color[1] * ratio)
-            b = int(base_color[2] * (1 - ratio) + accent_color[2] * ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (self.screen.get_width(), y))
+        if self.settings.quality['gradient']:
+            gradient_cache.blit(self.screen, base_color, accent_color)
+        else:
+            self.screen.fill(base_color)
+        return self.screen.get_rect()
     
     def draw_board(self):
         board_width = self.board.width * self.cell_size
@@ -405,52 +537,87 @@ class TetrisGame:
         shadow_rect = pygame.Rect(self.board_x + 5, self.board_y + 5, board_width, board_height)
         pygame.draw.rect(self.screen, (10, 15, 25), shadow_rect, border_radius=10)
         board_rect = pygame.Rect(self.board_x, self.board_y, board_width, board_height)
-        pygame.draw.rect(self.screen, (30, 40, 60), board_rect, border_radius=10)
-        if self.settings.show_grid:
+        self.screen.blit(self.update_stack_surface(), board_rect)
+        return board_rect.union(shadow_rect)
+    
+    def update_stack_surface(self):
+        """Actualiza la superficie de la pila repintando solo las filas que cambiaron desde el último frame"""
+        key = (self.board, self.golden_mode, self.grid_visible(), self.cell_size)
+        if self.stack_surface is None or key != self.stack_key:
+            # La rejilla incluye la línea de cierre derecha e inferior: un píxel más
+            size = (self.board.width * self.cell_size + 1, self.board.height * self.cell_size + 1)
+            self.stack_surface = pygame.Surface(size, pygame.SRCALPHA)
+            self.stack_key = key
+            rows = range(self.board.height)
+        else:
+            rows = self.board.dirty_rows_since(self.stack_version)
+        self.stack_version = self.board.version
+        for y in rows:
+            if y < self.board.height:
+                self.draw_stack_row(y)
+        return self.stack_surface
+
+    def draw_stack_row(self, y):
+        """Repinta una fila de la pila: fondo, rejilla y bloques, recortado a esa fila"""
+        surface = self.stack_surface
+        cell_size = self.cell_size
+        board_width = self.board.width * cell_size
+        board_height = self.board.height * cell_size
+        row_top = y * cell_size
+        surface.set_clip(pygame.Rect(0, row_top, board_width + 1, cell_size + (y == self.board.height - 1)))
+        surface.fill((0, 0, 0, 0))
+        pygame.draw.rect(surface, (30, 40, 60), (0, 0, board_width, board_height), border_radius=10)
+        if self.grid_visible():
             grid_color = (50, 60, 80)
             for x in range(self.board.width + 1):
-                pygame.draw.line(self.screen, grid_color, (self.board_x + x * self.cell_size, self.board_y), (self.board_x + x * self.cell_size, self.board_y + board_height))
-            for y in range(self.board.height + 1):
-                pygame.draw.line(self.screen, grid_color, (self.board_x, self.board_y + y * self.cell_size), (self.board_x + board_width, self.board_y + y * self.cell_size))
-        for y in range(self.board.height):
-            for x in range(self.board.width):
-                if self.board.grid[y][x] is not None:
-                    self.draw_block(x, y, self.board.grid[y][x])
-    
+                pygame.draw.line(surface, grid_color, (x * cell_size, row_top), (x * cell_size, row_top + cell_size))
+            pygame.draw.line(surface, grid_color, (0, row_top), (board_width, row_top))
+            pygame.draw.line(surface, grid_color, (0, row_top + cell_size), (board_width, row_top + cell_size))
+        golden = self.golden_mode
+        row = self.board.grid[y]
+        surface.blits([(block_atlas.get(color, cell_size, 255, golden), (x * cell_size + 1, row_top + 1))
+                       for x, color in enumerate(row) if color is not None], False)
+        surface.set_clip(None)
+
+    def draw_cleared_rows_flash(self):
+        """Destello blanco que se desvanece sobre las filas recién eliminadas"""
+        size = (self.board.width * self.cell_size, self.cell_size)
+        return self.screen.blits([
+            (fill_cache.get(size, (255, 255, 255, int(200 * timer / 20))), (self.board_x, self.board_y + y * self.cell_size))
+            for y, timer in self.line_clear_animation
+        ])
+
     def draw_block(self, x, y, color, alpha=255):
-        cell_x = self.board_x + x * self.cell_size
-        cell_y = self.board_y + y * self.cell_size
-        block_surf = pygame.Surface((self.cell_size - 2, self.cell_size - 2), pygame.SRCALPHA)
-        block_surf.set_alpha(alpha)
-        base_color = color
-        if self.golden_mode:
-            base_color = (min(255, color[0] + 50), min(255, color[1] + 50), min(255, color[2] // 2))
-        block_surf.fill(base_color)
-        bright_color = tuple(min(255, c + 40) for c in base_color)
-        pygame.draw.rect(block_surf, bright_color, (0, 0, self.cell_size - 2, 3))
-        pygame.draw.rect(block_surf, bright_color, (0, 0, 3, self.cell_size - 2))
-        self.screen.blit(block_surf, (cell_x + 1, cell_y + 1))
+        sprite = block_atlas.get(color, self.cell_size, alpha, self.golden_mode)
+        self.screen.blit(sprite, (self.board_x + x * self.cell_size + 1, self.board_y + y * self.cell_size + 1))
+
+    def draw_blocks(self, cells, color, alpha=255):
+        """Dibuja varias celdas del mismo color con un único blits"""
+        sprite = block_atlas.get(color, self.cell_size, alpha, self.golden_mode)
+        cell_size = self.cell_size
+        return self.screen.blits([(sprite, (self.board_x + x * cell_size + 1, self.board_y + y * cell_size + 1))
+                                  for x, y in cells])
 
     def draw_next_piece(self):
-        if self.board.next_piece:
+        upcoming = self.board.upcoming(self.settings.next_preview)
+        if upcoming:
             next_x, next_y = 500, 120
-            bg_rect = pygame.Rect(next_x - 10, next_y - 40, 160, 120)
+            # La primera pieza a tamaño normal; las demás en miniatura a la derecha
+            bg_rect = pygame.Rect(next_x - 10, next_y - 40, 160 + 60 * (len(upcoming) - 1), 120)
             pygame.draw.rect(self.screen, (40, 50, 70), bg_rect, border_radius=8)
             pygame.draw.rect(self.screen, (80, 100, 130), bg_rect, 2, border_radius=8)
-            title = self.font_medium.render("SIGUIENTE", True, (255, 255, 255))
+            title = text_cache.render("SIGUIENTE", 32, (255, 255, 255))
             self.screen.blit(title, (next_x, next_y - 35))
-            # Dibuja la pieza siguiente con su color real
-            piece = self.board.next_piece
-            shape = piece.shape
-            color = piece.color
-            for row_idx, row in enumerate(shape):
-                for col_idx, cell in enumerate(row):
-                    if cell != '.' and cell != ' ':
-                        mini_surf = pygame.Surface((23, 23), pygame.SRCALPHA)
-                        mini_surf.fill(color)
-                        pygame.draw.rect(mini_surf, tuple(min(255, c + 40) for c in color), (0, 0, 23, 3))
-                        pygame.draw.rect(mini_surf, tuple(min(255, c + 40) for c in color), (0, 0, 3, 23))
-                        self.screen.blit(mini_surf, (next_x + 20 + col_idx * 25, next_y + row_idx * 25))
+            for i, piece_type in enumerate(upcoming):
+                # Dibuja cada pieza con su color real
+                cell = 25 if i == 0 else 13
+                origin_x = next_x + 20 if i == 0 else next_x + 90 + 60 * i
+                origin_y = next_y if i == 0 else next_y + 10
+                mini_surf = block_atlas.get(TetrisPiece.COLORS[piece_type], cell)
+                self.screen.blits([(mini_surf, (origin_x + col_idx * cell, origin_y + row_idx * cell))
+                                   for col_idx, row_idx in TetrisPiece.CELLS[(piece_type, 0)]], False)
+            return bg_rect
+        return None
 
     def draw_game_info(self):
         info_x, info_y = 500, 260
@@ -460,10 +627,11 @@ class TetrisGame:
         info_texts = [f"Jugador: {self.player['name']}", f"Puntuación: {self.score:,}", f"Líneas: {self.lines_cleared}", f"Nivel: {self.level}", "", "CONTROLES:", "IZQ/DER/ARR/ABA - Mover/Rotar", "ESPACIO - Caída rápida", "1,2,3 - Usar cartas"]
         for i, text in enumerate(info_texts):
             color = (255, 200, 100) if text.startswith("CONTROLES") else (150, 200, 255) if any(k in text for k in ["IZQ","ESPACIO","1,2,3"]) else (255, 255, 255)
-            self.screen.blit(self.font_small.render(text, True, color), (info_x, info_y + i * 20))
+            self.screen.blit(text_cache.render(text, 24, color), (info_x, info_y + i * 20))
+        return info_bg
     
-    def draw_effects(self):
-        effects_x, effects_y = 50, 600
+    def active_effects(self):
+        """Textos de los efectos de cartas activos, con los segundos restantes"""
         active_effects = []
         if self.score_multiplier > 1: active_effects.append(f"Multiplicador x{self.score_multiplier} ({self.multiplier_timer//60 + 1}s)")
         if self.slow_time_timer > 0: active_effects.append(f"Tiempo Lento ({self.slow_time_timer//60 + 1}s)")
@@ -471,76 +639,96 @@ class TetrisGame:
         if self.gravity_reversed: active_effects.append(f"Gravedad Invertida ({self.gravity_timer//60 + 1}s)")
         if self.time_frozen: active_effects.append(f"Tiempo Congelado ({self.freeze_timer//60 + 1}s)")
         if self.golden_mode: active_effects.append(f"Modo Dorado ({self.golden_timer//60 + 1}s)")
+        return active_effects
+
+    def draw_effects(self):
+        effects_x, effects_y = 50, 600
+        active_effects = self.active_effects()
         if active_effects:
             effects_bg = pygame.Rect(effects_x - 10, effects_y - 10, 300, len(active_effects) * 25 + 40)
             pygame.draw.rect(self.screen, (50, 30, 70), effects_bg, border_radius=8)
             pygame.draw.rect(self.screen, (150, 100, 200), effects_bg, 2, border_radius=8)
-            self.screen.blit(self.font_medium.render("EFECTOS ACTIVOS", True, (255, 200, 255)), (effects_x, effects_y))
+            self.screen.blit(text_cache.render("EFECTOS ACTIVOS", 32, (255, 200, 255)), (effects_x, effects_y))
             for i, effect in enumerate(active_effects):
-                self.screen.blit(self.font_small.render(effect, True, (255,215,0) if "Dorado" in effect else (255,255,100) if "Multiplicador" in effect else (100,255,255)), (effects_x, effects_y + 30 + i * 25))
+                self.screen.blit(text_cache.render(effect, 24, (255,215,0) if "Dorado" in effect else (255,255,100) if "Multiplicador" in effect else (100,255,255)), (effects_x, effects_y + 30 + i * 25))
+            return effects_bg
+        return None
+
+    def draw_particle_stamps(self, kind, shape, min_size, base_size=None, centered=False):
+        """Dibuja todas las partículas de un tipo con sellos cacheados en un único blits.
+
+        La lista del blits se arma desde los arrays sin llamar a nada por
+        partícula, y se devuelve un solo rect con los límites del lote en vez
+        de uno por partícula.
+        """
+        batch = self.particles.stamp_batch(kind, min_size, base_size, centered, 2 if shape == "circle" else 1)
+        if batch is None:
+            return []
+        keys, index, positions, bounds = batch
+        stamps = [particle_stamps.get(shape, size, color, alpha) for size, color, alpha in keys]
+        sequence = zip(map(stamps.__getitem__, index), positions)
+        fblits = getattr(self.screen, "fblits", None)  # pygame-ce
+        if fblits is not None:
+            fblits(sequence)
+        else:
+            self.screen.blits(sequence, False)
+        return [self.screen.get_rect().clip(bounds)]
 
     def draw_particles(self):
-        for p in self.particles:
-            alpha = int(255 * (p['life'] / p['max_life']))
-            size = max(1, int(4 * (p['life'] / p['max_life'])))
-            pygame.draw.circle(self.screen, p['color'] + (alpha,), (int(p['x']), int(p['y'])), size)
+        return (self.draw_particle_stamps(KIND_GOLDEN, "circle", 1, 4, centered=True)
+                + self.draw_particle_stamps(KIND_LINE_CLEAR, "circle", 1, 4, centered=True))
 
     def draw_hard_drop_particles(self):
-        for p in self.hard_drop_particles:
-            alpha = int(255 * (p['life'] / p['max_life']))
-            size = max(2, int(4 * (p['life'] / p['max_life'])))
-            surf = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, p['color'] + (alpha,), (size,size), size)
-            self.screen.blit(surf, (int(p['x']), int(p['y'])))
+        return self.draw_particle_stamps(KIND_HARD_DROP, "circle", 2, 4)
     
     def draw_line_clear_effect(self):
+        rects = []
         if self.line_clear_text:
             text, timer, color, scale, rainbow = self.line_clear_text
-            font_size = int(90 * scale * (0.5 + abs(0.5 - timer/90)))
-            font = pygame.font.Font(None, font_size)
-            alpha = int(255 * min(1, timer / 45))
-            surf = font.render(text, True, self.get_rainbow_color(pygame.time.get_ticks()/1000) if rainbow else color)
-            surf.set_alpha(alpha)
-            self.screen.blit(surf, surf.get_rect(center=(self.board_x + self.board.width*self.cell_size//2, self.board_y + 120)))
+            if self.settings.quality['text_effects']:
+                font_size = int(90 * scale * (0.5 + abs(0.5 - timer/90)))
+                alpha = int(255 * min(1, timer / 45))
+            else:
+                # Tamaño fijo y sin transparencia: siempre sale de la caché de textos
+                font_size, alpha = int(60 * scale), None
+            surf = text_cache.render(text, font_size, self.get_rainbow_color(self.clock.get_ticks()/1000) if rainbow else color, alpha=alpha)
+            rects.append(self.screen.blit(surf, surf.get_rect(center=(self.board_x + self.board.width*self.cell_size//2, self.board_y + 120))))
             if timer-1 <= 0: self.line_clear_text = None 
             else: self.line_clear_text = (text, timer-1, color, scale, rainbow)
+        return rects
 
     def draw_confetti(self):
-        for p in self.confetti_particles:
-            alpha = int(255 * (p['life'] / p['max_life']))
-            size = max(2, int(p.get('size', 6) * (p['life'] / p['max_life'])))
-            pygame.draw.rect(self.screen, p['color'] + (alpha,), (int(p['x']), int(p['y']), size, size))
+        rects = self.draw_particle_stamps(KIND_CONFETTI, "square", 2)
         if hasattr(self, 'combo_bonus_text') and self.combo_bonus_text:
             text, timer, color, scale, _ = self.combo_bonus_text
             if timer > 0:
-                font = pygame.font.Font(None, int(36 * scale))
-                alpha = int(255 * min(1, timer / 30))
-                surf = font.render(text, True, color)
-                surf.set_alpha(alpha)
+                alpha = int(255 * min(1, timer / 30)) if self.settings.quality['text_effects'] else None
+                surf = text_cache.render(text, int(36 * scale), color, alpha=alpha)
                 y_pos = self.board_y + 170
                 if self.line_clear_text:
                     y_pos = self.board_y + 120 + 45 + 20
-                self.screen.blit(surf, surf.get_rect(center=(self.board_x + self.board.width * self.cell_size // 2, y_pos)))
+                rects.append(self.screen.blit(surf, surf.get_rect(center=(self.board_x + self.board.width * self.cell_size // 2, y_pos))))
+        return rects
 
     def create_hard_drop_particles(self, piece):
         color = piece.color
         for x, y in piece.get_cells():
             if y + 1 >= self.board.height or self.board.grid[y + 1][x]:
-                for _ in range(10):
-                    self.hard_drop_particles.append({'x': self.board_x + x * self.cell_size + self.cell_size // 2, 'y': self.board_y + (y+1) * self.cell_size - 2, 'vx': random.uniform(-2,2), 'vy': random.uniform(0,3), 'color': color, 'life': 18, 'max_life': 18, 'gravity': 0.5})
+                count = self.particles.scaled(10)
+                self.particles.spawn(KIND_HARD_DROP, self.board_x + x * self.cell_size + self.cell_size // 2, self.board_y + (y+1) * self.cell_size - 2,
+                                     self.particles.uniform(-2, 2, count), self.particles.uniform(0, 3, count), 18, color=color, gravity=0.5)
 
     def draw_ghost_piece(self):
         """Dibuja la pieza fantasma en el tablero"""
         if self.board.current_piece:
             ghost_alpha = 80
-            for x, y in self.board.current_piece.get_cells():
-                ghost_y = y + (self.board.ghost_y - self.board.current_piece.y)
-                if ghost_y >= 0 and ghost_y != y:
-                    self.draw_block(x, ghost_y, self.board.current_piece.color, ghost_alpha)
+            offset = self.board.ghost_y - self.board.current_piece.y
+            if offset:
+                cells = [(x, y + offset) for x, y in self.board.current_piece.get_cells() if y + offset >= 0]
+                return self.draw_blocks(cells, self.board.current_piece.color, ghost_alpha)
+        return []
 
     def draw_piece(self, piece):
         """Dibuja la pieza actual en el tablero"""
         alpha = 128 if self.ghost_mode else 255
-        for x, y in piece.get_cells():
-            if y >= 0:
-                self.draw_block(x, y, piece.color, alpha)
\ No newline at end of file
+        return self.draw_blocks([(x, y) for x, y in piece.get_cells() if y >= 0], piece.color, alpha)
\ No newline at end of file
@@ -1,5 +1,7 @@
+import os
 import pygame
 import sys
+import time
 from enum import Enum
 from src.menu import MainMenu
 from src.game import TetrisGame
@@ -7,6 +9,14 @@ from src.settings import Settings
 from src.music_manager import MusicManager
 from src.player_manager import PlayerManager
 from src.tetris import TetrisBoard, TetrisPiece
+from src.replay import Replay, ReplayRecorder, ReplayPlayer, prune_replays
+from src.history import GameHistory, record_from_game, append_record
+from src.persistence import BackgroundWriter
+from src.render_cache import gradient_cache, block_atlas, text_cache, particle_stamps, fill_cache, fonts
+from src.renderer import GameRenderer
+from src.quality import QualityGovernor
+from src.profiler import FrameProfiler, NULL_PROFILER
+from src.input import InputLatency
 
 class GameState(Enum):
     MENU = 1
@@ -16,6 +26,9 @@ class GameState(Enum):
     PLAYER_SELECT = 5
 
 class GameApp:
+    PROFILER_REFRESH = 30  # Frames entre actualizaciones de la tabla del perfilador
+    PROFILER_ROWS = 16
+
     def __init__(self):
         pygame.init()
         pygame.mixer.init()
@@ -26,6 +39,8 @@ class GameApp:
         self.state = GameState.PLAYER_SELECT
         self.music_manager = MusicManager()
         self.player_manager = PlayerManager()
+        # Repeticiones e historial se escriben fuera del bucle de juego
+        self.file_writer = BackgroundWriter()
         self.menu = MainMenu(self.screen, self.settings, music_manager=self.music_manager)
         self.tetris_game = None
         self.current_player = None
@@ -35,10 +50,21 @@ class GameApp:
         self.loading = False
         self.dev_mode = False
         self.last_card_click = {}  # dict to track last click time per card index
+        self.replay_recorder = None
+        self.replay_player = None
+        self.renderer = None
+        self.quality_governor = QualityGovernor(self.settings.max_fps)
+        self.profiler = FrameProfiler(self.settings.profile_frames) if self.settings.profiling else NULL_PROFILER
+        self.profiler_overlay = False
+        self.profiler_surface = None  # Tabla del overlay; se rehace cada PROFILER_REFRESH frames
+        self.profiler_font = None
+        self.input_latency = InputLatency()
 
     def handle_events(self):
         mouse_pos = pygame.mouse.get_pos()
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        polled_at = time.perf_counter()  # Referencia para la latencia de entrada
+        for event in events:
             if event.type == pygame.QUIT:
                 if self.current_player:
                     self.player_manager.save_player_data(self.current_player)
@@ -52,6 +78,12 @@ class GameApp:
                     # Agregar temporalmente "(DEV)" al nombre del jugador
                     if self.current_player and "(DEV)" not in self.current_player["name"]:
                         self.current_player["name"] += " (DEV)"
+                # F3 muestra u oculta el menú de debug (solo en modo DEV)
+                elif event.key == pygame.K_F3 and self.dev_mode:
+                    self.debug_menu = not self.debug_menu
+                # F4 muestra u oculta el perfilador (lo activa si no lo estaba)
+                elif event.key == pygame.K_F4 and self.dev_mode:
+                    self.toggle_profiler_overlay()
             # For CARDS state, corregir ESC para volver al menú
             if self.state == GameState.CARDS:
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
@@ -74,10 +106,8 @@ class GameApp:
                                 else:
                                     # Simple click: alterna el bloqueo en modo debug
                                     if self.debug_menu and self.current_player:
-                                        if card_idx in self.current_player["unlocked_cards"]:
-                                            self.current_player["unlocked_cards"].remove(card_idx)
-                                        else:
-                                            self.current_player["unlocked_cards"].append(card_idx)
+                                        unlocked = card_idx not in self.current_player["unlocked_cards"]
+                                        self.player_manager.set_card_unlocked(self.current_player, card_idx, unlocked)
                                     self.last_card_click[card_idx] = current_time
             if self.state == GameState.PLAYER_SELECT:
                 # Solo reproducir la música de pre-menu si no está sonando
@@ -126,19 +156,17 @@ class GameApp:
                 if (self.music_manager.get_current_song() and
                     self.music_manager.get_current_song().lower().startswith("menu")):
                     self.music_manager.play_ingame_music()
-                if self.tetris_game:
-                    result = self.tetris_game.handle_event(event)
-                    if result == "menu":
-                        # Actualizar datos del jugador
-                        self.current_player['total_score'] += self.tetris_game.score
-                        self.current_player['games_played'] += 1
-                        if self.tetris_game.score > self.current_player.get('best_score', 0):
-                            self.current_player['best_score'] = self.tetris_game.score
-                        
-                        self.check_card_unlocks()
-                        self.player_manager.save_player_data(self.current_player)
-                        self.settings.load_player_data(self.current_player)
-                        self.state = GameState.MENU
+                if self.replay_player:
+                    # Durante una repetición solo se atiende ESC para salir
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                        self.end_game()
+                elif self.tetris_game:
+                    action = self.tetris_game.action_for_event(event)
+                    if action is not None:
+                        result = self.tetris_game.perform_action(action)
+                        self.input_latency.applied(self.profiler, polled_at)
+                        if result == "menu":
+                            self.end_game()
             
             elif self.state == GameState.SETTINGS:
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
@@ -164,7 +192,6 @@ class GameApp:
         """Muestra un diálogo para ingresar el nombre del jugador"""
         input_active = True
         player_name = ""
-        font = pygame.font.Font(None, 48)
         
         while input_active:
             for event in pygame.event.get():
@@ -185,7 +212,7 @@ class GameApp:
             self.screen.fill((15, 20, 35))
             
             # Título
-            title = font.render("INGRESA TU NOMBRE", True, (255, 255, 255))
+            title = text_cache.render("INGRESA TU NOMBRE", 48, (255, 255, 255))
             title_rect = title.get_rect(center=(self.screen.get_width()//2, 200))
             self.screen.blit(title, title_rect)
             
@@ -195,7 +222,7 @@ class GameApp:
             pygame.draw.rect(self.screen, (100, 150, 200), input_box, 3)
             
             # Texto ingresado
-            text_surface = font.render(player_name, True, (255, 255, 255))
+            text_surface = text_cache.render(player_name, 48, (255, 255, 255))
             self.screen.blit(text_surface, (input_box.x + 10, input_box.y + 10))
             
             # Cursor parpadeante
@@ -206,8 +233,7 @@ class GameApp:
                                (cursor_x, input_box.y + 40), 2)
             
             # Instrucciones
-            inst_font = pygame.font.Font(None, 32)
-            inst_text = inst_font.render("Presiona ENTER para continuar, ESC para cancelar", True, (150, 150, 150))
+            inst_text = text_cache.render("Presiona ENTER para continuar, ESC para cancelar", 32, (150, 150, 150))
             inst_rect = inst_text.get_rect(center=(self.screen.get_width()//2, 400))
             self.screen.blit(inst_text, inst_rect)
             
@@ -230,37 +256,123 @@ class GameApp:
             pygame.display.set_mode(self.settings.resolution, pygame.FULLSCREEN)
         else:
             pygame.display.set_mode(self.settings.resolution)
-
-    def check_card_unlocks(self):
+        # Las superficies cacheadas dependen del tamaño y formato de la pantalla
+        gradient_cache.clear()
+        block_atlas.clear()
+        particle_stamps.clear()
+        fill_cache.clear()
+        if self.renderer:
+            self.renderer.invalidate()
+
+    def apply_quality(self):
+        """Aplica el nivel elegido por el gobernador de calidad a la configuración y a la partida"""
+        self.settings.quality = self.quality_governor.current
+        if self.tetris_game:
+            self.tetris_game.settings.quality = self.settings.quality  # Las repeticiones usan una copia
+            self.tetris_game.apply_quality()
+        if self.renderer:
+            self.renderer.invalidate()
+
+    def check_card_unlocks(self, changed=None):
         """Verifica si se deben desbloquear nuevas cartas y logros"""
-        total_score = self.current_player['total_score']
-        
-        # Cartas comunes (0-5)
-        common_thresholds = [100, 300, 600, 1000, 1500, 2000]
-        # Cartas épicas (6-11)
-        epic_thresholds = [3000, 5000, 7500, 10000, 15000, 20000]
-        # Cartas legendarias (12-17)
-        legendary_thresholds = [25000, 35000, 50000, 75000, 100000, 150000]
-        
-        all_thresholds = common_thresholds + epic_thresholds + legendary_thresholds
-        
-        for i, threshold in enumerate(all_thresholds):
-            if total_score >= threshold and i not in self.current_player['unlocked_cards']:
-                self.current_player['unlocked_cards'].append(i)
-    
-        # Logros y sistema de niveles/monedas
-        unlocked = self.player_manager.check_achievements(self.current_player)
+        # Solo se evalúan las reglas de los campos que cambiaron (ver src/rules.py)
+        new_cards, unlocked = self.player_manager.check_unlocks(self.current_player, changed)
         if unlocked:
             # Puedes mostrar un popup/logro desbloqueado aquí si quieres
             pass
     
+    def end_game(self):
+        """Termina la partida actual: guarda la repetición y actualiza los datos del jugador"""
+        if self.replay_player:
+            self.replay_player = None
+            self.tetris_game = None
+            self.state = GameState.MENU if self.current_player else GameState.PLAYER_SELECT
+            return
+        self.save_replay()
+        self.save_history()
+        # Actualizar datos del jugador
+        self.current_player['total_score'] += self.tetris_game.score
+        self.current_player['games_played'] += 1
+        if self.tetris_game.score > self.current_player.get('best_score', 0):
+            self.current_player['best_score'] = self.tetris_game.score
+        changed = ['total_score', 'games_played', 'best_score']
+        if self.tetris_game.lines_cleared:
+            self.current_player['lines_cleared'] = self.current_player.get('lines_cleared', 0) + self.tetris_game.lines_cleared
+            changed.append('lines_cleared')
+        biggest_clear = max((size for size, count in enumerate(self.tetris_game.clear_counts, 1) if count), default=0)
+        if biggest_clear > self.current_player.get('max_lines', 0):
+            self.current_player['max_lines'] = biggest_clear
+            changed.append('max_lines')
+
+        self.check_card_unlocks(changed)
+        self.player_manager.save_player_data(self.current_player)
+        self.settings.load_player_data(self.current_player)
+        self.state = GameState.MENU
+
+    def save_replay(self):
+        if not self.replay_recorder:
+            return
+        replay = self.replay_recorder.finish(self.tetris_game)
+        self.replay_recorder = None
+        path = ReplayRecorder.default_path(self.settings.replays_dir, self.current_player['name'], replay.seed)
+        self.file_writer.submit(self._write_replay, replay, path, self.settings.max_replays)
+
+    @staticmethod
+    def _write_replay(replay, path, keep):
+        try:
+            replay.save(path)
+        except OSError as e:
+            print(f"Error al guardar la repetición: {e}")
+            return
+        prune_replays(os.path.dirname(path), keep)
+
+    def save_history(self):
+        """Encola la partida para el historial del jugador (la escribe el hilo de archivos)"""
+        if not self.settings.record_history:
+            return
+        path = GameHistory.default_path(self.settings.history_dir, self.current_player['name'])
+        self.file_writer.submit(self._append_history, path, len(self.tetris_game.card_manager.all_cards),
+                                record_from_game(self.tetris_game))
+
+    @staticmethod
+    def _append_history(path, card_count, record):
+        try:
+            append_record(path, card_count, record)
+        except (OSError, ValueError) as e:
+            print(f"Error al guardar el historial: {e}")
+
+    def start_replay(self, path):
+        """Reproduce una partida grabada en pantalla, frame a frame"""
+        self.replay_player = ReplayPlayer(Replay.load(path))
+        self.tetris_game = self.replay_player.create_game(self.screen, self.settings, {'name': 'REPLAY'})
+        self.tetris_game.profiler = self.profiler
+        self.state = GameState.PLAYING
+
     def update(self):
+        """Un tick de simulación de paso fijo (TetrisGame.tick_ms)"""
         if self.state == GameState.PLAYING and self.tetris_game:
-            self.tetris_game.update()
-        
-        self.music_manager.update()
+            if self.replay_player:
+                result = self.replay_player.step()
+            else:
+                result = self.tetris_game.update()
+            if result == "menu":
+                self.end_game()
     
     def draw(self):
+        if self.state == GameState.PLAYING and self.tetris_game and not self.loading and self.settings.dirty_rects:
+            # Solo se presentan las zonas que han cambiado
+            if self.renderer is None or self.renderer.game is not self.tetris_game:
+                self.renderer = GameRenderer(self.tetris_game)
+            rects = self.renderer.draw()
+            for overlay in self.debug_overlays():
+                rect = overlay()
+                self.renderer.add_overlay(rect)
+                rects.append(rect)
+            self.profiler.call("present", pygame.display.update, rects)
+            self.input_latency.presented(self.profiler)
+            return
+        # Otra pantalla sobrescribe la ventana: el renderer tendrá que repintar todo
+        self.renderer = None
         if self.loading:
             self.draw_loading_screen()
         elif self.state == GameState.PLAYER_SELECT:
@@ -273,7 +385,10 @@ class GameApp:
             self.draw_settings()
         elif self.state == GameState.CARDS:
             self.draw_cards()
-        pygame.display.flip()
+        for overlay in self.debug_overlays():
+            overlay()
+        self.profiler.call("present", pygame.display.flip)
+        self.input_latency.presented(self.profiler)
 
     def start_game_with_loading(self):
         self.loading = True
@@ -281,13 +396,15 @@ class GameApp:
         pygame.display.flip()
         pygame.time.delay(1200)  # 1.2 segundos de pantalla de carga
         self.tetris_game = TetrisGame(self.screen, self.settings, self.current_player)
+        self.tetris_game.profiler = self.profiler
+        if self.settings.record_replays:
+            self.replay_recorder = ReplayRecorder(self.tetris_game)
         self.loading = False
         self.state = GameState.PLAYING
 
     def draw_loading_screen(self):
         self.screen.fill((15, 20, 35))
-        font = pygame.font.Font(None, 72)
-        text = font.render("Cargando...", True, (100, 200, 255))
+        text = text_cache.render("Cargando...", 72, (100, 200, 255))
         rect = text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2))
         self.screen.blit(text, rect)
         # Puedes agregar animación si quieres
@@ -296,34 +413,29 @@ class GameApp:
         self.screen.fill((15, 20, 35))
         
         # Título principal con gradiente
-        font_large = pygame.font.Font(None, 96)
-        font_medium = pygame.font.Font(None, 48)
-        
-        title = font_large.render("TETRIS BALATRO", True, (255, 255, 255))
+        title = text_cache.render("TETRIS BALATRO", 96, (255, 255, 255))
         title_rect = title.get_rect(center=(self.screen.get_width()//2, 200))
         self.screen.blit(title, title_rect)
         
-        subtitle = font_medium.render("Natural Edition", True, (100, 150, 255))
+        subtitle = text_cache.render("Natural Edition", 48, (100, 150, 255))
         subtitle_rect = subtitle.get_rect(center=(self.screen.get_width()//2, 260))
         self.screen.blit(subtitle, subtitle_rect)
         
         # Instrucciones
-        inst_text = font_medium.render("Presiona ENTER para comenzar", True, (200, 200, 200))
+        inst_text = text_cache.render("Presiona ENTER para comenzar", 48, (200, 200, 200))
         inst_rect = inst_text.get_rect(center=(self.screen.get_width()//2, 400))
         self.screen.blit(inst_text, inst_rect)
     
     def draw_settings(self):
         self.screen.fill((20, 25, 40))
-        font = pygame.font.Font(None, 48)
-        medium_font = pygame.font.Font(None, 36)
         
         # Título
-        title = font.render("CONFIGURACIÓN", True, (255, 255, 255))
+        title = text_cache.render("CONFIGURACIÓN", 48, (255, 255, 255))
         title_rect = title.get_rect(center=(self.screen.get_width()//2, 80))
         self.screen.blit(title, title_rect)
         
         # Sección de música
-        music_title = medium_font.render("MÚSICA", True, (100, 200, 255))
+        music_title = text_cache.render("MÚSICA", 36, (100, 200, 255))
         self.screen.blit(music_title, (50, 200))
         
         # Botón para seleccionar carpeta de música
@@ -331,7 +443,7 @@ class GameApp:
         pygame.draw.rect(self.screen, (60, 80, 120), music_button)
         pygame.draw.rect(self.screen, (100, 150, 200), music_button, 2)
         
-        button_text = medium_font.render("Seleccionar Música", True, (255, 255, 255))
+        button_text = text_cache.render("Seleccionar Música", 36, (255, 255, 255))
         button_rect = button_text.get_rect(center=music_button.center)
         self.screen.blit(button_text, button_rect)
         
@@ -339,22 +451,19 @@ class GameApp:
         fullscreen_btn = pygame.Rect(300, 300, 250, 50)
         pygame.draw.rect(self.screen, (60, 120, 60), fullscreen_btn)
         pygame.draw.rect(self.screen, (100, 200, 100), fullscreen_btn, 2)
-        btn_text = medium_font.render(
-            "Pantalla Completa: ON" if self.fullscreen else "Pantalla Completa: OFF",
-            True, (255, 255, 255)
-        )
+        btn_text = text_cache.render("Pantalla Completa: ON" if self.fullscreen else "Pantalla Completa: OFF", 36, (255, 255, 255))
         btn_rect = btn_text.get_rect(center=fullscreen_btn.center)
         self.screen.blit(btn_text, btn_rect)
 
         # Estado actual de la música (debajo de los botones)
         current_song = self.music_manager.get_current_song()
         if current_song:
-            song_text = medium_font.render(f"Reproduciendo: {current_song}", True, (150, 255, 150))
+            song_text = text_cache.render(f"Reproduciendo: {current_song}", 36, (150, 255, 150))
             self.screen.blit(song_text, (50, 370 + 30))  # +30 para dejar margen debajo de los botones
         
         # Controles
         controls_y = 450 + 30  # +30 para dejar margen debajo del texto de música
-        controls_title = medium_font.render("CONTROLES", True, (100, 200, 255))
+        controls_title = text_cache.render("CONTROLES", 36, (100, 200, 255))
         self.screen.blit(controls_title, (50, controls_y))
         
         controls = [
@@ -365,23 +474,19 @@ class GameApp:
             "Usar Cartas: 1, 2, 3"
         ]
         
-        small_font = pygame.font.Font(None, 28)
         for i, control in enumerate(controls):
-            text = small_font.render(control, True, (200, 200, 200))
+            text = text_cache.render(control, 28, (200, 200, 200))
             self.screen.blit(text, (50, controls_y + 40 + i * 30))
         
         # Instrucciones
-        inst_text = medium_font.render("ESC - Volver al menú", True, (150, 150, 150))
+        inst_text = text_cache.render("ESC - Volver al menú", 36, (150, 150, 150))
         self.screen.blit(inst_text, (50, self.screen.get_height() - 50))
     
     def draw_cards(self):
         self.screen.fill((15, 20, 30))
-        font = pygame.font.Font(None, 48)
-        medium_font = pygame.font.Font(None, 32)
-        small_font = pygame.font.Font(None, 24)
 
         # Título de la colección
-        title = font.render("COLECCIÓN DE CARTAS", True, (255,255,255))
+        title = text_cache.render("COLECCIÓN DE CARTAS", 48, (255,255,255))
         title_rect = title.get_rect(center=(self.screen.get_width()//2, 60))
         self.screen.blit(title, title_rect)
 
@@ -395,7 +500,7 @@ class GameApp:
                 f"Partidas Jugadas: {self.current_player.get('games_played', 0)}"
             ]
             for i, stat in enumerate(stats):
-                text = small_font.render(stat, True, (200,200,200))
+                text = text_cache.render(stat, 24, (200,200,200))
                 self.screen.blit(text, (50, stats_y + i*25))
 
         # Espaciado mayor para evitar solapamiento
@@ -409,7 +514,7 @@ class GameApp:
         self.draw_card_section("LEGENDARIAS", (255,215,0), y_offset, 12, 18)
 
         # Instrucciones de vuelta
-        inst_text = medium_font.render("ESC - Volver", True, (150,150,150))
+        inst_text = text_cache.render("ESC - Volver", 32, (150,150,150))
         self.screen.blit(inst_text, (50, self.screen.get_height()-40))
         
         # Reproductor de música de menú (solo se activa en el menú)
@@ -433,17 +538,15 @@ class GameApp:
             (btn_next.x+24, btn_next.y+18),
             (btn_next.x+10, btn_next.y+28)
         ])
-        song_text = medium_font.render(self.music_manager.get_current_menu_song_name() or "Sin música", True, (255,255,255))
+        song_text = text_cache.render(self.music_manager.get_current_menu_song_name() or "Sin música", 32, (255,255,255))
         self.screen.blit(song_text, (20+110, self.screen.get_height()-80 + (54 - song_text.get_height())//2))
 
     def draw_card_section(self, title, color, y, start_idx, end_idx):
-        medium_font = pygame.font.Font(None, 32)
-        small_font = pygame.font.Font(None, 22)
         from src.cards import CardManager
         card_manager = CardManager()
 
         # Título de la sección
-        section_title = medium_font.render(title, True, color)
+        section_title = text_cache.render(title, 32, color)
         title_width = section_title.get_width()
         section_width = self.screen.get_width() - 100  # Margen de 50px a cada lado
         self.screen.blit(section_title, (50 + (section_width - title_width) // 2, y))
@@ -493,8 +596,7 @@ class GameApp:
             pygame.draw.rect(self.screen, bg_color, card_rect)
 
             # Nombre de la carta centrado
-            name_font = pygame.font.Font(None, 26)
-            name_text = name_font.render(card.name, True, text_color)
+            name_text = text_cache.render(card.name, 26, text_color)
             name_rect = name_text.get_rect(centerx=card_x + card_width//2, y=card_y + 15)
             self.screen.blit(name_text, name_rect)
 
@@ -503,28 +605,81 @@ class GameApp:
             rarity = card.rarity.upper() if hasattr(card, 'rarity') else ""
             
             # Estado a la izquierda
-            status_text = small_font.render(status, True, text_color)
+            status_text = text_cache.render(status, 22, text_color)
             status_rect = status_text.get_rect(x=card_x + 10, centery=card_y + 45)
             self.screen.blit(status_text, status_rect)
             
             # Rareza a la derecha
-            rarity_text = small_font.render(rarity, True, color)
+            rarity_text = text_cache.render(rarity, 22, color)
             rarity_rect = rarity_text.get_rect(right=card_x + card_width - 10, centery=card_y + 45)
             self.screen.blit(rarity_text, rarity_rect)
 
     def draw_debug_menu(self):
-        font = pygame.font.Font(None, 28)
+        """Dibuja el menú de debug y devuelve el rect que ocupa"""
+        text_stats = text_cache.stats()
+        quality_stats = self.quality_governor.stats()
+        particles = self.tetris_game.particles if self.tetris_game else None
         debug_lines = [
             f"DEBUG MENU",
             f"FPS: {self.clock.get_fps():.1f}",
             f"State: {self.state.name}",
             f"Player: {self.current_player['name'] if self.current_player else 'None'}",
             f"Score: {getattr(self.tetris_game, 'score', 0) if self.tetris_game else 0}",
-            f"Cards: {len(self.settings.unlocked_cards)}"
+            f"Cards: {len(self.settings.unlocked_cards)}",
+            f"Text cache: {text_stats['hits']} hits / {text_stats['misses']} misses ({text_stats['hit_rate']:.0%})",
+            f"Quality: {quality_stats['level']}{'' if self.settings.adaptive_quality else ' (fixed)'}"
+            f" - {quality_stats['changes']} changes",
+            "Time at level: " + ", ".join(f"{name} {share:.0%}" for name, share in quality_stats['time_at_level'].items()),
         ]
+        if particles is not None:
+            debug_lines.append(f"Particles: {len(particles)} / {particles.limit}")
+        saves = self.player_manager.persistence_stats()
+        if saves is not None:
+            debug_lines.append(f"Saves: queue {saves['queue_depth']} (max {saves['max_depth']}), "
+                               f"{saves['writes']} writes, {saves['coalesced']} coalesced")
+            debug_lines.append(f"Save latency: p50 {saves['latency_p50_ms']:.0f} ms / p95 {saves['latency_p95_ms']:.0f} ms")
+        area = pygame.Rect(20, 40, 0, 0)
         for i, line in enumerate(debug_lines):
-            surf = font.render(line, True, (255, 255, 0))
-            self.screen.blit(surf, (20, 40 + i * 28))
+            surf = text_cache.render(line, 28, (255, 255, 0))
+            area.union_ip(self.screen.blit(surf, (20, 40 + i * 28)))
+        return area
+
+    def debug_overlays(self):
+        """Funciones de dibujo de los overlays de debug visibles"""
+        overlays = []
+        if self.debug_menu:
+            overlays.append(self.draw_debug_menu)
+        if self.profiler_overlay:
+            overlays.append(self.draw_profiler_overlay)
+        return overlays
+
+    def toggle_profiler_overlay(self):
+        self.profiler_overlay = not self.profiler_overlay
+        if self.profiler_overlay and not self.profiler.enabled:
+            self.profiler = FrameProfiler(self.settings.profile_frames)
+            if self.tetris_game:
+                self.tetris_game.profiler = self.profiler
+        if self.profiler_font is None:
+            # match_font recorre las fuentes del sistema: solo una vez
+            self.profiler_font = fonts.get(22, pygame.font.match_font("monospace"))
+        self.profiler_surface = None
+
+    def draw_profiler_overlay(self):
+        """Tabla p50/p95/p99 (ms) de las secciones más lentas; devuelve el rect que ocupa"""
+        if self.profiler_surface is None or self.profiler.frame_count % self.PROFILER_REFRESH == 0:
+            lines = [f"{'section':<18}{'p50':>7}{'p95':>7}{'p99':>7}"]
+            for row in self.profiler.summary()[:self.PROFILER_ROWS]:
+                lines.append(f"{row['section']:<18}{row['p50']:>7.2f}{row['p95']:>7.2f}{row['p99']:>7.2f}")
+            font = self.profiler_font
+            line_height = font.get_linesize()
+            width = max(font.size(line)[0] for line in lines) + 16
+            surface = pygame.Surface((width, line_height * len(lines) + 12), pygame.SRCALPHA)
+            surface.fill((0, 0, 0, 190))
+            for i, line in enumerate(lines):
+                surface.blit(font.render(line, True, (120, 255, 120)), (8, 6 + i * line_height))
+            self.profiler_surface = surface
+        x = self.screen.get_width() - self.profiler_surface.get_width() - 10
+        return self.screen.blit(self.profiler_surface, (x, 10))
 
     def create_double_click_effect(self, position):
         """
@@ -556,18 +711,15 @@ class GameApp:
         overlay.fill((0, 0, 0, 200))  # Fondo semitransparente
 
         # Dibujar título
-        font_title = pygame.font.Font(None, 72)
-        font_desc = pygame.font.Font(None, 36)
-        
-        title = font_title.render(card.name, True, (255, 255, 255))
+        title = text_cache.render(card.name, 72, (255, 255, 255))
         title_rect = title.get_rect(center=(self.screen.get_width()//2, 200))
         
         # Dibujar descripción
-        desc = font_desc.render(card.demo_description, True, (200, 200, 200))
+        desc = text_cache.render(card.demo_description, 36, (200, 200, 200))
         desc_rect = desc.get_rect(center=(self.screen.get_width()//2, 300))
         
         # Dibujar instrucciones
-        inst = font_desc.render("Click para cerrar", True, (150, 150, 150))
+        inst = text_cache.render("Click para cerrar", 36, (150, 150, 150))
         inst_rect = inst.get_rect(center=(self.screen.get_width()//2, self.screen.get_height() - 100))
         
         # Dibujar borde decorativo según rareza
@@ -604,20 +756,44 @@ class GameApp:
         error_duration = 1500  # 1.5 segundos
         error_overlay = pygame.Surface((self.screen.get_width(), self.screen.get_height()), pygame.SRCALPHA)
         error_overlay.fill((0, 0, 0, 180))
-        font = pygame.font.Font(None, 64)
-        error_text = font.render(message, True, (255, 50, 50))
+        error_text = text_cache.render(message, 64, (255, 50, 50))
         text_rect = error_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2))
         error_overlay.blit(error_text, text_rect)
         self.screen.blit(error_overlay, (0, 0))
         pygame.display.flip()
         pygame.time.delay(error_duration)
 
+    def close(self):
+        """Espera a que terminen las escrituras en segundo plano y cierra la base de jugadores"""
+        self.file_writer.close()
+        self.player_manager.close()
+
     def run(self):
         running = True
+        accumulator = 0.0
         while running:
-            running = self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(60)
+            # Tiempo real transcurrido desde el frame anterior
+            accumulator += self.clock.tick(self.settings.max_fps)
+            self.profiler.begin_frame()
+            # get_rawtime: lo que costó el frame sin la espera del limitador
+            if self.settings.adaptive_quality and self.quality_governor.sample(self.clock.get_rawtime(), self.clock.get_time()):
+                self.apply_quality()
+            running = self.profiler.call("events", self.handle_events)
+            # La simulación avanza en ticks fijos; si el frame tardó, se recupera con un tope
+            steps = 0
+            while accumulator >= TetrisGame.tick_ms and steps < self.settings.max_catchup_steps:
+                self.profiler.call("update", self.update)
+                accumulator -= TetrisGame.tick_ms
+                steps += 1
+            if steps == self.settings.max_catchup_steps:
+                # Retraso excesivo (carga, pausa del SO): se descarta en vez de acelerar sin fin
+                accumulator = min(accumulator, TetrisGame.tick_ms)
+            self.profiler.call("music", self.music_manager.update)
+            self.profiler.call("draw", self.draw)
+            self.profiler.end_frame()
+        if self.profiler.enabled:
+            for path in self.profiler.dump(self.settings.profile_dir):
+                print(f"Perfil guardado: {path}")
+        self.close()
         pygame.quit()
         sys.exit()
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""Historial de partidas por jugador en un archivo binario por columnas.
+
+Formato (little endian):
+- cabecera: magic b"TXGH", versión, número de cartas, capacidad y número de
+  partidas guardadas
+- columnas: cada campo ocupa un bloque contiguo de `capacidad` valores
+  (fecha, puntuación, duración, piezas, líneas, nivel, una columna por
+  tamaño de limpieza y una por carta)
+
+Añadir una partida escribe un valor en cada columna y después el contador de
+la cabecera; cuando se llena, el archivo se reescribe con el doble de
+capacidad, así que el coste amortizado es O(1). Las consultas abren el
+archivo con mmap y leen solo las columnas que necesitan, sin pasar por el
+JSON del perfil. Cada columna se devuelve como array copiado del mmap (en
+orden nativo: se asume little endian, como en x86 y ARM), para que ninguna
+vista siga apuntando al mapa cuando se cierra o se reescribe al crecer.
+"""
+import mmap
+from array import array
+import os
+import struct
+import time
+
+MAGIC = b"TXGH"
+VERSION = 1
+MAX_CLEAR = 8  # Limpiezas de 8 o más líneas van a la última columna
+_HEADER = struct.Struct("<4sBBII2x")  # 16 bytes: las columnas empiezan alineadas
+_COUNT_OFFSET = 10  # Posición del contador de partidas en la cabecera
+INITIAL_CAPACITY = 64
+
+# (columna, formato de array/struct); las de 4 bytes primero para que todas queden alineadas
+BASE_COLUMNS = (
+    ("timestamp", "I"),
+    ("score", "I"),
+    ("duration_ms", "I"),
+    ("pieces", "I"),
+    ("lines", "H"),
+    ("level", "H"),
+)
+
+
+def columns_for(card_count):
+    return (BASE_COLUMNS
+            + tuple((f"clears_{size}", "H") for size in range(1, MAX_CLEAR + 1))
+            + tuple((f"card_{index}", "B") for index in range(card_count)))
+
+
+def record_from_game(game):
+    """Estadísticas de una partida terminada de TetrisGame"""
+    return {
+        'timestamp': int(time.time()),
+        'score': game.score,
+        'duration_ms': game.tick * game.tick_ms,
+        'pieces': game.board.pieces_placed,
+        'lines': game.lines_cleared,
+        'level': game.level,
+        'clears': list(game.clear_counts),
+        'cards': list(game.card_manager.used_counts),
+    }
+
+
+def append_record(path, card_count, record):
+    """Abre el historial, añade una partida y lo cierra (pensado para un hilo escritor)"""
+    history = GameHistory(path, card_count)
+    try:
+        history.append(record)
+    finally:
+        history.close()
+
+
+class GameHistory:
+    """Historial de un jugador abierto con mmap; append() añade una partida"""
+
+    def __init__(self, path, card_count=18, capacity=INITIAL_CAPACITY):
+        self.path = path
+        if not os.path.exists(path):
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._create(path, card_count, capacity, 0)
+        self.file = open(path, "r+b")
+        self.map = None
+        self._map()
+
+    @staticmethod
+    def default_path(folder, player_name):
+        safe_name = "".join(c if c.isalnum() else "_" for c in player_name)
+        return os.path.join(folder, f"{safe_name}.txh")
+
+    @staticmethod
+    def _create(path, card_count, capacity, count):
+        size = _HEADER.size + capacity * sum(struct.calcsize(fmt) for _, fmt in columns_for(card_count))
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, card_count, capacity, count))
+            file.truncate(size)
+
+    def _map(self):
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        magic, version, self.card_count, self.capacity, self.count = _HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise ValueError("No es un historial de TetrisXD")
+        if version != VERSION:
+            raise ValueError(f"Versión de historial no soportada: {version}")
+        self.columns = {}  # nombre -> (offset, formato, tamaño)
+        offset = _HEADER.size
+        for name, fmt in columns_for(self.card_count):
+            size = struct.calcsize(fmt)
+            self.columns[name] = (offset, fmt, size)
+            offset += self.capacity * size
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if self.map is not None:
+            self.map.flush()
+            self.map.close()
+            self.map = None
+            self.file.close()
+
+    def _grow(self):
+        """Reescribe el archivo con el doble de capacidad copiando cada columna"""
+        columns = {name: self._column_bytes(name) for name in self.columns}
+        card_count, capacity, count = self.card_count, self.capacity * 2, self.count
+        self.close()
+        temp = self.path + ".tmp"
+        self._create(temp, card_count, capacity, count)
+        with open(temp, "r+b") as file:
+            offset = _HEADER.size
+            for name, fmt in columns_for(card_count):
+                file.seek(offset)
+                file.write(columns[name])
+                offset += capacity * struct.calcsize(fmt)
+        os.replace(temp, self.path)
+        self.file = open(self.path, "r+b")
+        self._map()
+
+    def append(self, record):
+        """Añade una partida (dict de record_from_game)"""
+        if self.count == self.capacity:
+            self._grow()
+        index = self.count
+        values = {name: record[name] for name, _ in BASE_COLUMNS}
+        clears = record.get('clears', ())  # clears[0]: limpiezas de 1 línea
+        for size in range(1, MAX_CLEAR + 1):
+            values[f"clears_{size}"] = clears[size - 1] if size <= len(clears) else 0
+        cards = record.get('cards', ())
+        for card in range(self.card_count):
+            values[f"card_{card}"] = cards[card] if card < len(cards) else 0
+        for name, (offset, fmt, size) in self.columns.items():
+            # Se satura al máximo del tipo de la columna en vez de desbordar
+            value = min(int(values[name]), (1 << (size * 8)) - 1)
+            struct.pack_into("<" + fmt, self.map, offset + index * size, value)
+        # El contador se escribe al final: una partida a medias no llega a contarse
+        self.count += 1
+        struct.pack_into("<I", self.map, _COUNT_OFFSET, self.count)
+
+    def _column_bytes(self, name):
+        # Cortar el mmap copia los bytes: no queda ninguna exportación que impida cerrarlo
+        offset, _, size = self.columns[name]
+        return self.map[offset:offset + self.count * size]
+
+    def column(self, name):
+        """Los valores de una columna como array (copia, se puede guardar tras append o close)"""
+        return array(self.columns[name][1], self._column_bytes(name))
+
+    def score_over_time(self, last=None):
+        """[(fecha, puntuación)] de las últimas `last` partidas (todas si None)"""
+        start = 0 if last is None else max(0, self.count - last)
+        return list(zip(self.column("timestamp")[start:], self.column("score")[start:]))
+
+    def moving_average(self, name="score", window=10):
+        """Media móvil de una columna, una entrada por partida desde la `window`-ésima"""
+        values = self.column(name)
+        averages = []
+        total = 0
+        for i, value in enumerate(values):
+            total += value
+            if i >= window:
+                total -= values[i - window]
+            if i >= window - 1:
+                averages.append(total / window)
+        return averages
+
+    def clear_histogram(self):
+        """Limpiezas totales por tamaño: {1: n, 2: n, ...}"""
+        return {size: sum(self.column(f"clears_{size}")) for size in range(1, MAX_CLEAR + 1)}
+
+    def average_clear_size(self):
+        histogram = self.clear_histogram()
+        clears = sum(histogram.values())
+        return sum(size * count for size, count in histogram.items()) / clears if clears else 0.0
+
+    def card_usage(self):
+        """Veces que se usó cada carta (índice de CardManager.all_cards) en todas las partidas"""
+        return [sum(self.column(f"card_{card}")) for card in range(self.card_count)]
+
+    def card_frequency(self):
+        """Usos de cada carta por partida"""
+        return [uses / self.count if self.count else 0.0 for uses in self.card_usage()]
@@ -0,0 +1,86 @@
+"""Entrada de teclado: teclas a GameAction con diccionarios precalculados y medida de latencia.
+
+La repetición de movimiento (DAS/ARR y caída suave) no vive aquí sino en
+TetrisGame, que la avanza en milisegundos de juego en cada tick para que las
+repeticiones sigan siendo reproducibles.
+"""
+import time
+
+import pygame
+
+from src.actions import GameAction
+
+
+def build_keymap(controls):
+    """Dicts tecla -> GameAction para KEYDOWN y KEYUP.
+
+    Se rellenan en orden de prioridad: si dos controles comparten tecla gana
+    el primero, igual que en la antigua cadena de comparaciones.
+    """
+    keydown = {}
+    keyup = {}
+    for key, action in (
+        (pygame.K_ESCAPE, GameAction.QUIT),
+        (controls['left'], GameAction.LEFT_PRESS),
+        (controls['right'], GameAction.RIGHT_PRESS),
+        (controls['down'], GameAction.SOFT_DROP),
+        (controls['rotate'], GameAction.ROTATE_CW),
+        (controls.get('rotate_alt', pygame.K_r), GameAction.ROTATE_CW),
+        (pygame.K_q, GameAction.ROTATE_CCW),
+        (controls['drop'], GameAction.HARD_DROP),
+        (pygame.K_1, GameAction.CARD_1),
+        (pygame.K_2, GameAction.CARD_2),
+        (pygame.K_3, GameAction.CARD_3),
+        (controls.get('hold', pygame.K_c), GameAction.HOLD),
+    ):
+        keydown.setdefault(key, action)
+    for key, action in (
+        (controls['left'], GameAction.LEFT_RELEASE),
+        (pygame.K_a, GameAction.LEFT_RELEASE),
+        (controls['right'], GameAction.RIGHT_RELEASE),
+        (pygame.K_d, GameAction.RIGHT_RELEASE),
+        (controls['down'], GameAction.SOFT_DROP_RELEASE),
+    ):
+        keyup.setdefault(key, action)
+    return keydown, keyup
+
+
+class KeyMap:
+    """Traducción de eventos de teclado a GameAction con una sola búsqueda en un dict"""
+
+    def __init__(self, controls):
+        self.keydown, self.keyup = build_keymap(controls)
+
+    def action_for_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            return self.keydown.get(event.key)
+        if event.type == pygame.KEYUP:
+            return self.keyup.get(event.key)
+        return None
+
+
+class InputLatency:
+    """Latencia de las acciones de teclado en ms, enviada al perfilador.
+
+    pygame no da la marca de tiempo de cada evento: se usa el instante en que
+    se leyó la cola (poll). "input.apply" va del poll a la modificación del
+    tablero y "input.present" del poll a la presentación del frame que la
+    muestra. El tiempo que el evento esperó en la cola antes del poll (como
+    mucho un frame) no está incluido.
+    """
+
+    def __init__(self):
+        self.pending = []  # Instantes de poll de acciones aplicadas y aún no presentadas
+
+    def applied(self, profiler, polled_at):
+        now = time.perf_counter()
+        profiler.record("input.apply", (now - polled_at) * 1000)
+        self.pending.append(polled_at)
+
+    def presented(self, profiler):
+        if not self.pending:
+            return
+        now = time.perf_counter()
+        for polled_at in self.pending:
+            profiler.record("input.present", (now - polled_at) * 1000)
+        self.pending.clear()
@@ -0,0 +1,195 @@
+"""Índice de la tabla de líderes.
+
+Por cada campo ordenable hay una lista ordenada de claves (-valor, nombre) y
+un dict nombre -> clave. Los empates se ordenan por nombre para que el
+ranking sea estable.
+
+La lista ordenada está partida en bloques de como mucho 2 * BLOCK_SIZE
+claves (SortedKeys), con el máximo de cada bloque y un árbol de Fenwick con
+sus tamaños: insertar, quitar o buscar el puesto de una clave es bisect
+sobre los máximos, bisect dentro de un bloque de tamaño acotado y una suma
+de prefijos del árbol, O(log n). Solo al partir o vaciar un bloque se
+rehace el árbol, O(n / BLOCK_SIZE), y eso pasa una vez cada BLOCK_SIZE
+inserciones como mucho.
+"""
+from bisect import bisect_left, insort
+from itertools import islice
+
+BLOCK_SIZE = 256
+
+# Campos indexados y su valor por defecto (los mismos que las columnas de PlayerStore)
+LEADERBOARD_FIELDS = {'best_score': 0, 'total_score': 0, 'games_played': 0, 'level': 1}
+
+
+class SortedKeys:
+    """Lista ordenada por bloques con puesto y acceso por posición en O(log n)"""
+
+    def __init__(self, keys=()):
+        keys = sorted(keys)
+        self.blocks = [keys[i:i + BLOCK_SIZE] for i in range(0, len(keys), BLOCK_SIZE)]
+        self.maxes = [block[-1] for block in self.blocks]
+        self.length = len(keys)
+        self._rebuild_tree()
+
+    def __len__(self):
+        return self.length
+
+    def _rebuild_tree(self):
+        # tree[i] (desde 1) suma los tamaños de los bloques (i - i & -i, i]
+        tree = [0] + [len(block) for block in self.blocks]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def _tree_add(self, block, delta):
+        i = block + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _before(self, block):
+        """Claves en los bloques anteriores a `block`"""
+        total = 0
+        i = block
+        while i:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, position):
+        """(bloque, posición dentro del bloque) de la clave número `position`"""
+        block = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            if block + step < len(self.tree) and self.tree[block + step] <= position:
+                block += step
+                position -= self.tree[block]
+            step >>= 1
+        return block, position
+
+    def add(self, key):
+        if not self.blocks:
+            self.blocks.append([key])
+            self.maxes.append(key)
+            self.length = 1
+            self._rebuild_tree()
+            return
+        i = bisect_left(self.maxes, key)
+        if i == len(self.maxes):
+            i -= 1
+            self.blocks[i].append(key)
+            self.maxes[i] = key
+        else:
+            insort(self.blocks[i], key)
+        self.length += 1
+        block = self.blocks[i]
+        if len(block) > 2 * BLOCK_SIZE:
+            self.blocks[i:i + 1] = [block[:BLOCK_SIZE], block[BLOCK_SIZE:]]
+            self.maxes[i:i + 1] = [block[BLOCK_SIZE - 1], block[-1]]
+            self._rebuild_tree()
+        else:
+            self._tree_add(i, 1)
+
+    def remove(self, key):
+        i = bisect_left(self.maxes, key)
+        block = self.blocks[i]
+        del block[bisect_left(block, key)]
+        self.length -= 1
+        if block:
+            self.maxes[i] = block[-1]
+            self._tree_add(i, -1)
+        else:
+            del self.blocks[i]
+            del self.maxes[i]
+            self._rebuild_tree()
+
+    def index(self, key):
+        """Posición (desde 0) de la primera clave >= key"""
+        i = bisect_left(self.maxes, key)
+        if i == len(self.maxes):
+            return self.length
+        return self._before(i) + bisect_left(self.blocks[i], key)
+
+    def slice(self, start, stop):
+        """Claves de las posiciones [start, stop)"""
+        stop = min(stop, self.length)
+        if start >= stop:
+            return []
+        block, offset = self._locate(start)
+        keys = []
+        for current in islice(self.blocks, block, None):
+            keys.extend(current[offset:offset + stop - start - len(keys)])
+            offset = 0
+            if len(keys) >= stop - start:
+                break
+        return keys
+
+
+class LeaderboardIndex:
+    """Rankings por best_score, total_score, games_played y level"""
+
+    def __init__(self, fields=LEADERBOARD_FIELDS):
+        self.defaults = dict(fields)
+        self.primary = next(iter(self.defaults))  # Todos los campos tienen los mismos jugadores
+        self.keys = {field: SortedKeys() for field in self.defaults}  # campo -> claves (-valor, nombre)
+        self.entries = {field: {} for field in self.defaults}  # campo -> {nombre: clave}
+
+    def __len__(self):
+        return len(self.entries[self.primary])
+
+    def __contains__(self, name):
+        return name in self.entries[self.primary]
+
+    def values_for(self, player):
+        return {field: int(player.get(field, default)) for field, default in self.defaults.items()}
+
+    def build(self, rows):
+        """Reconstruye el índice de golpe desde (nombre, {campo: valor})"""
+        for field in self.defaults:
+            entries = {name: (-values[field], name) for name, values in rows}
+            self.entries[field] = entries
+            self.keys[field] = SortedKeys(entries.values())
+
+    def update(self, name, player):
+        """Coloca al jugador según sus valores actuales (solo mueve los campos que cambiaron)"""
+        for field, value in self.values_for(player).items():
+            key = (-value, name)
+            old = self.entries[field].get(name)
+            if old == key:
+                continue
+            keys = self.keys[field]
+            if old is not None:
+                keys.remove(old)
+            keys.add(key)
+            self.entries[field][name] = key
+
+    def remove(self, name):
+        for field in self.defaults:
+            old = self.entries[field].pop(name, None)
+            if old is not None:
+                self.keys[field].remove(old)
+
+    def top(self, limit=10, field='best_score'):
+        """Nombres de los `limit` primeros"""
+        return [name for _, name in self.keys[field].slice(0, limit)]
+
+    def page(self, page, page_size=10, field='best_score'):
+        """Nombres de la página `page` (desde 0)"""
+        start = page * page_size
+        return [name for _, name in self.keys[field].slice(start, start + page_size)]
+
+    def rank(self, name, field='best_score'):
+        """Puesto del jugador (desde 1), o None si no está"""
+        key = self.entries[field].get(name)
+        if key is None:
+            return None
+        return self.keys[field].index(key) + 1
+
+    def range(self, low, high, field='best_score'):
+        """Nombres con low <= valor <= high, de mayor a menor"""
+        keys = self.keys[field]
+        start = keys.index((-high, ""))
+        end = keys.index((-low + 1, ""))
+        return [name for _, name in keys.slice(start, end)]
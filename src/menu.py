@@ -2,6 +2,7 @@ import pygame
 import math
 import random
 from src.tetris import TetrisBoard, TetrisPiece
+from src.render_cache import gradient_cache, text_cache
 
 class MenuButton:
     def __init__(self, text, x, y, width, height, action):
@@ -9,7 +10,6 @@ class MenuButton:
         self.rect = pygame.Rect(x, y, width, height)
         self.action = action
         self.hovered = False
-        self.font = pygame.font.Font(None, 48)
         
     def handle_event(self, event, mouse_pos):
         self.hovered = self.rect.collidepoint(mouse_pos)
@@ -45,7 +45,7 @@ class MenuButton:
         pygame.draw.rect(screen, bg_color, scaled_rect, border_radius=10)
         pygame.draw.rect(screen, border_color, scaled_rect, 3, border_radius=10)
         
-        text_surface = self.font.render(self.text, True, text_color)
+        text_surface = text_cache.render(self.text, 48, text_color)
         text_rect = text_surface.get_rect(center=scaled_rect.center)
         screen.blit(text_surface, text_rect)
 
@@ -55,11 +55,6 @@ class MainMenu:
         self.settings = settings
         self.animation_time = 0
         self.music_manager = music_manager  # Nuevo: referencia al music_manager
-
-        # Fuentes modernas
-        self.font_title = pygame.font.Font(None, 96)
-        self.font_subtitle = pygame.font.Font(None, 48)
-        self.font_info = pygame.font.Font(None, 28)
         
         # Colores naturales
         self.bg_gradient_top = (25, 35, 55)
@@ -148,7 +143,7 @@ class MainMenu:
             # Interacción con piezas flotantes
             else:
                 mx, my = mouse_pos
-                for idx, block in reversed(list(enumerate(self.floating_tetrominos))):
+                for idx, block in reversed(list(enumerate(self.visible_tetrominos()))):
                     if self.tetromino_hit_test(block, mx, my):
                         self.dragging_idx = idx
                         self.drag_offset = (mx - block["x"], my - block["y"])
@@ -170,7 +165,7 @@ class MainMenu:
                 block = self.floating_tetrominos[self.dragging_idx]
                 block["x"] = mx - self.drag_offset[0]
                 block["y"] = my - self.drag_offset[1]
-                for i, other in enumerate(self.floating_tetrominos):
+                for i, other in enumerate(self.visible_tetrominos()):
                     if i != self.dragging_idx and self.tetromino_overlap(block, other):
                         block["vx"], other["vx"] = -block["vx"], -other["vx"]
                         block["vy"], other["vy"] = -block["vy"], -other["vy"]
@@ -186,6 +181,10 @@ class MainMenu:
                 return "menu"  # Asegura volver al menú principal
         return None
 
+    def visible_tetrominos(self):
+        """Las piezas flotantes que permite el nivel de calidad visual"""
+        return self.floating_tetrominos[:self.settings.quality['menu_tetrominos']]
+
     def tetromino_hit_test(self, block, mx, my):
         # Hit test para la pieza flotante (bounding box)
         size = block["size"] * 2
@@ -220,7 +219,7 @@ class MainMenu:
             self.draw_player_info(current_player)
 
         # Versión
-        version_text = self.font_info.render("Natural Edition v2.0", True, (100, 100, 100))
+        version_text = text_cache.render("Natural Edition v2.0", 28, (100, 100, 100))
         self.screen.blit(version_text, (20, self.screen.get_height() - 30))
 
         # Dibuja el reproductor de música en la esquina inferior izquierda
@@ -228,17 +227,14 @@ class MainMenu:
 
     def draw_gradient_background(self):
         """Dibuja un fondo con gradiente suave"""
-        height = self.screen.get_height()
-        for y in range(height):
-            ratio = y / height
-            r = int(self.bg_gradient_top[0] * (1 - ratio) + self.bg_gradient_bottom[0] * ratio)
-            g = int(self.bg_gradient_top[1] * (1 - ratio) + self.bg_gradient_bottom[1] * ratio)
-            b = int(self.bg_gradient_top[2] * (1 - ratio) + self.bg_gradient_bottom[2] * ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (self.screen.get_width(), y))
+        if self.settings.quality['gradient']:
+            gradient_cache.blit(self.screen, self.bg_gradient_top, self.bg_gradient_bottom)
+        else:
+            self.screen.fill(self.bg_gradient_bottom)
     
     def draw_floating_tetrominos(self):
         t = self.animation_time
-        for block in self.floating_tetrominos:
+        for block in self.visible_tetrominos():
             # Movimiento solo si no está siendo arrastrado
             if self.dragging_idx is None or self.floating_tetrominos[self.dragging_idx] is not block:
                 block["x"] += block["vx"]
@@ -282,13 +278,15 @@ class MainMenu:
         # Oscilación sincronizada al beat
         beat_phase = (self.animation_time % beat_time) / beat_time
         scale = 1 + 0.06 * (0.5 - abs(beat_phase - 0.5))  # Pulso triangular
+        if not self.settings.quality['text_effects']:
+            scale = 1  # Sin pulso: un único tamaño de título en la caché de textos
 
         # Título principal
-        title_font = pygame.font.Font(None, int(96 * scale))
-        title = title_font.render("TETRACARDS SAGA", True, self.title_color)
+        title_size = int(96 * scale)
+        title = text_cache.render("TETRACARDS SAGA", title_size, self.title_color)
 
         # Sombra del título
-        shadow = title_font.render("TETRACARDS SAGA", True, (50, 50, 50))
+        shadow = text_cache.render("TETRACARDS SAGA", title_size, (50, 50, 50))
         shadow_rect = shadow.get_rect(center=(self.screen.get_width()//2 + 3, 120 + 3))
         self.screen.blit(shadow, shadow_rect)
 
@@ -304,7 +302,7 @@ class MainMenu:
             max(50, min(255, int(self.subtitle_color[2] + hue_shift)))
         )
 
-        subtitle = self.font_subtitle.render("Natural Edition", True, subtitle_color)
+        subtitle = text_cache.render("Natural Edition", 48, subtitle_color)
         subtitle_rect = subtitle.get_rect(center=(self.screen.get_width()//2, 180))
         self.screen.blit(subtitle, subtitle_rect)
 
@@ -345,7 +343,7 @@ class MainMenu:
         ]
         
         for i, text in enumerate(info_texts):
-            rendered = self.font_info.render(text, True, (255, 255, 255))
+            rendered = text_cache.render(text, 28, (255, 255, 255))
             self.screen.blit(rendered, (info_x + 10, info_y + 10 + i * 25))
 
     def draw_music_player(self):
@@ -378,6 +376,5 @@ class MainMenu:
             current_song = self.music_manager.get_current_song() or "Sin Música"
         else:
             current_song = "No MusicManager"
-        font = pygame.font.Font(None, 28)
-        song_text = font.render(current_song, True, (255,255,255))
+        song_text = text_cache.render(current_song, 28, (255,255,255))
         self.screen.blit(song_text, (x + 110, y + (height - song_text.get_height()) // 2))
\ No newline at end of file
@@ -0,0 +1,251 @@
+"""Sistema de partículas en estructura de arrays sobre NumPy.
+
+Todas las partículas viven en arrays preasignados (x, y, vx, vy, vida,
+color, tamaño, tipo...). La integración, la gravedad y la eliminación de
+las muertas son operaciones vectorizadas. Las partículas se guardan por orden
+de creación: al llenarse la capacidad se reciclan primero las más antiguas.
+"""
+import math
+
+try:
+    import numpy
+except ImportError:  # Sin NumPy no hay partículas (ver NullParticleSystem)
+    numpy = None
+
+KIND_GOLDEN = 0
+KIND_LINE_CLEAR = 1
+KIND_CONFETTI = 2
+KIND_HARD_DROP = 3
+KIND_NAMES = ("golden", "line_clear", "confetti", "hard_drop")
+
+PARTICLES_AVAILABLE = numpy is not None
+
+
+class ParticleSystem:
+    """Partículas en arrays de NumPy con capacidad fija"""
+
+    def __init__(self, capacity=4096, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.quality = 1.0  # Fracción de partículas que se crean en cada efecto
+        self.limit = capacity  # Máximo de partículas vivas (<= capacity)
+        self.x = numpy.zeros(capacity, numpy.float32)
+        self.y = numpy.zeros(capacity, numpy.float32)
+        self.vx = numpy.zeros(capacity, numpy.float32)
+        self.vy = numpy.zeros(capacity, numpy.float32)
+        self.gravity = numpy.zeros(capacity, numpy.float32)
+        self.life = numpy.zeros(capacity, numpy.int32)
+        self.max_life = numpy.ones(capacity, numpy.int32)
+        self.size = numpy.zeros(capacity, numpy.float32)
+        self.kind = numpy.zeros(capacity, numpy.uint8)
+        self.color = numpy.zeros((capacity, 3), numpy.uint8)
+        self.arrays = (self.x, self.y, self.vx, self.vy, self.gravity, self.life,
+                       self.max_life, self.size, self.kind, self.color)
+        # Generador propio: las partículas no deben consumir la semilla de la partida
+        self.rng = numpy.random.default_rng(seed)
+
+    def __len__(self):
+        return self.count
+
+    def _reserve(self, n):
+        """Hace sitio para n partículas nuevas descartando las más antiguas si hace falta"""
+        overflow = self.count + n - self.limit
+        if overflow > 0:
+            keep = self.count - overflow
+            for array in self.arrays:
+                array[:keep] = array[overflow:self.count]
+            self.count = keep
+        start = self.count
+        self.count += n
+        return start
+
+    def spawn(self, kind, x, y, vx, vy, life, max_life=None, color=(255, 255, 255), size=4.0, gravity=0.2):
+        """Añade un lote de partículas; cada campo puede ser un escalar o un array del tamaño del lote"""
+        n = numpy.broadcast(x, y, vx, vy, life, size).size
+        if n == 0:
+            return
+        if n > self.limit:
+            # Solo caben las últimas del lote
+            skip = n - self.limit
+            x, y, vx, vy, life, size = (numpy.broadcast_to(v, (n,))[skip:] for v in (x, y, vx, vy, life, size))
+            if numpy.ndim(max_life) == 1:
+                max_life = max_life[skip:]
+            if numpy.ndim(color) == 2:
+                color = color[skip:]
+            n = self.limit
+        start = self._reserve(n)
+        end = start + n
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = vx
+        self.vy[start:end] = vy
+        self.life[start:end] = life
+        self.max_life[start:end] = life if max_life is None else max_life
+        self.color[start:end] = color
+        self.size[start:end] = size
+        self.gravity[start:end] = gravity
+        self.kind[start:end] = kind
+
+    def burst(self, kind, count, x, y, speed, life, max_life=None, color=(255, 255, 255), size=4.0,
+              gravity=0.2, vy_offset=0.0, angle=math.pi):
+        """Explosión radial: ángulo uniforme en ±angle y velocidad uniforme en el rango `speed`.
+
+        `life` y `size` pueden ser un valor o un rango (mínimo, máximo); el de
+        `life` es entero e incluye el máximo.
+        """
+        rng = self.rng
+        angles = rng.uniform(-angle, angle, count)
+        speeds = rng.uniform(speed[0], speed[1], count)
+        if isinstance(life, tuple):
+            life = rng.integers(life[0], life[1] + 1, count)
+        if isinstance(size, tuple):
+            size = rng.uniform(size[0], size[1], count)
+        self.spawn(kind, x, y, speeds * numpy.cos(angles), speeds * numpy.sin(angles) + vy_offset,
+                   life, max_life, color, size, gravity)
+
+    def update(self):
+        """Un paso: integra posición, aplica gravedad, envejece y compacta las muertas"""
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vy[:n] += self.gravity[:n]
+        self.life[:n] -= 1
+        alive = self.life[:n] > 0
+        alive_count = int(numpy.count_nonzero(alive))
+        if alive_count < n:
+            # Compactación estable: se conserva el orden de creación
+            for array in self.arrays:
+                array[:alive_count] = array[:n][alive]
+            self.count = alive_count
+
+    def clear(self):
+        self.count = 0
+
+    def scaled(self, count):
+        """Cuántas partículas crear para un efecto de `count` con la calidad actual"""
+        return max(1, int(count * self.quality)) if count > 0 else 0
+
+    def set_quality(self, quality, limit=None):
+        """Fracción de partículas por efecto y tope de vivas; si sobran se descartan las más antiguas"""
+        self.quality = quality
+        self.limit = self.capacity if limit is None else max(1, min(self.capacity, limit))
+        if self.count > self.limit:
+            self._reserve(0)
+
+    def kind_count(self, kind):
+        return int(numpy.count_nonzero(self.kind[:self.count] == kind))
+
+    def view(self, kind):
+        """Arrays (x, y, vida relativa, color, tamaño) de las partículas vivas de un tipo"""
+        n = self.count
+        mask = self.kind[:n] == kind
+        return (self.x[:n][mask], self.y[:n][mask], self.life[:n][mask] / self.max_life[:n][mask],
+                self.color[:n][mask], self.size[:n][mask])
+
+    def stamp_batch(self, kind, min_size, base_size=None, centered=False, side=1, alpha_levels=8, color_step=32):
+        """Datos para dibujar un tipo con sellos cacheados, cuantizados para reutilizarlos, o None si no hay.
+
+        Devuelve (claves, índices, posiciones, límites): las claves son los
+        (tamaño, color, alpha) distintos, índices dice qué clave usa cada
+        partícula, posiciones son sus (x, y) y límites el rect (x, y, ancho,
+        alto) que cubren todas. El tamaño se escala con la vida restante
+        (base_size o el tamaño propio de cada partícula); el sello mide
+        side * tamaño de lado y con `centered` la posición es su centro.
+        """
+        n = self.count
+        mask = self.kind[:n] == kind
+        if not mask.any():
+            return None
+        life = self.life[:n][mask] / self.max_life[:n][mask]
+        scale = self.size[:n][mask] if base_size is None else base_size
+        sizes = numpy.maximum(min_size, (scale * life).astype(numpy.int64))
+        alphas = (numpy.ceil(life * alpha_levels) * (255 / alpha_levels)).astype(numpy.int64).clip(0, 255)
+        colors = numpy.minimum(255, (self.color[:n][mask].astype(numpy.int64) + color_step // 2) // color_step * color_step)
+        xs = self.x[:n][mask].astype(numpy.int64)
+        ys = self.y[:n][mask].astype(numpy.int64)
+        if centered:
+            xs -= sizes * side // 2
+            ys -= sizes * side // 2
+        # Una clave entera por partícula: los sellos se buscan una vez por clave distinta, no por partícula
+        packed = (((sizes << 8) | alphas) << 24) | (colors[:, 0] << 16) | (colors[:, 1] << 8) | colors[:, 2]
+        unique, index = numpy.unique(packed, return_inverse=True)
+        keys = [(int(key >> 32), ((key >> 16) & 255, (key >> 8) & 255, key & 255), (key >> 24) & 255)
+                for key in unique.tolist()]
+        ends = sizes * side
+        left, top = int(xs.min()), int(ys.min())
+        bounds = (left, top, int((xs + ends).max()) - left, int((ys + ends).max()) - top)
+        return keys, index.tolist(), list(zip(xs.tolist(), ys.tolist())), bounds
+
+    def uniform(self, low, high, count):
+        return self.rng.uniform(low, high, count)
+
+    def random_colors(self, count, low, high):
+        """Colores con cada canal entero uniforme en [low, high]"""
+        return self.rng.integers(low, numpy.add(high, 1), (count, 3))
+
+    def choose_colors(self, count, options):
+        return numpy.array(options, numpy.uint8)[self.rng.integers(0, len(options), count)]
+
+    def rainbow_colors(self, count):
+        """Mismos colores que TetrisGame.get_rainbow_color con t uniforme en [0, 1)"""
+        t = self.rng.uniform(0, 1, count)[:, None]
+        phases = numpy.array([0, 2 * math.pi / 3, 4 * math.pi / 3])
+        return (255 * numpy.abs(numpy.sin(math.pi * t + phases))).astype(numpy.uint8)
+
+
+class NullParticleSystem:
+    """Sustituto sin NumPy: no guarda nada (los efectos de partículas quedan desactivados)"""
+    capacity = 0
+    limit = 0
+    count = 0
+    quality = 0.0
+
+    def __len__(self):
+        return 0
+
+    def spawn(self, *args, **kwargs):
+        pass
+
+    def burst(self, *args, **kwargs):
+        pass
+
+    def update(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def scaled(self, count):
+        return 0
+
+    def set_quality(self, quality, limit=None):
+        pass
+
+    def kind_count(self, kind):
+        return 0
+
+    def view(self, kind):
+        return (), (), (), (), ()
+
+    def stamp_batch(self, *args, **kwargs):
+        return None
+
+    def uniform(self, low, high, count):
+        return []
+
+    def random_colors(self, count, low, high):
+        return []
+
+    def choose_colors(self, count, options):
+        return []
+
+    def rainbow_colors(self, count):
+        return []
+
+
+def create_particle_system(capacity=4096, seed=None):
+    if numpy is None:
+        return NullParticleSystem()
+    return ParticleSystem(capacity, seed)
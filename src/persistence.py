@@ -0,0 +1,237 @@
+"""Escritura de jugadores en segundo plano.
+
+El bucle de juego solo encola una copia del perfil; un hilo la escribe en
+PlayerStore con su propia conexión. Varias peticiones del mismo jugador
+antes de escribirse se funden en una (gana la última), y las escrituras se
+retrasan `debounce_ms` para agrupar ráfagas en una sola transacción. La cola
+es acotada: si se llena, quien encola espera a que el hilo la vacíe.
+
+BackgroundWriter es la versión sencilla para archivos que no se funden
+(historial, repeticiones): ejecuta en orden las tareas que se le encolan.
+"""
+import atexit
+import copy
+import threading
+import time
+from collections import OrderedDict, deque
+
+from src.player_store import PlayerStore
+
+_DELETE = object()  # Marca de borrado en la cola
+
+
+class PersistenceWorker:
+    """Hilo escritor con cola de fusión por jugador, debounce y flush()"""
+
+    def __init__(self, db_file, debounce_ms=250, max_pending=256, retry_ms=2000):
+        self.db_file = db_file
+        self.debounce = debounce_ms / 1000
+        self.max_pending = max_pending
+        self.retry = retry_ms / 1000
+        self.pending = OrderedDict()  # clave -> (perfil o _DELETE, instante de la primera petición)
+        self.condition = threading.Condition()
+        self.writing = False
+        self.flush_waiters = 0  # Hilos esperando en flush(): se escribe sin debounce
+        self.urgent = False  # Cola llena: el siguiente lote sale ya
+        self.closed = False
+        # Métricas
+        self.requests = 0
+        self.coalesced = 0
+        self.writes = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.latencies = deque(maxlen=256)  # ms desde la petición hasta quedar en disco
+        self.thread = threading.Thread(target=self._run, name="player-persistence", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def save(self, name, player):
+        """Encola una copia del perfil (el llamante puede seguir modificando el suyo)"""
+        self._submit(name, copy.deepcopy(player))
+
+    def delete(self, name):
+        self._submit(name, _DELETE)
+
+    def _submit(self, name, value):
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("PersistenceWorker cerrado")
+            self.requests += 1
+            if name in self.pending:
+                # Fusión: se sustituye el contenido y se conserva la antigüedad
+                self.coalesced += 1
+                self.pending[name] = (value, self.pending[name][1])
+            else:
+                # Contrapresión: con la cola llena se espera a que el hilo escriba
+                while len(self.pending) >= self.max_pending:
+                    self.urgent = True
+                    self.condition.notify_all()
+                    self.condition.wait()
+                self.pending[name] = (value, time.perf_counter())
+                self.max_depth = max(self.max_depth, len(self.pending))
+            self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Escribe ya lo pendiente y espera a que termine; devuelve False si venció el timeout"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self.condition:
+            self.flush_waiters += 1
+            self.condition.notify_all()
+            try:
+                while self.pending or self.writing:
+                    remaining = None if deadline is None else deadline - time.perf_counter()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self.condition.wait(remaining)
+            finally:
+                self.flush_waiters -= 1
+        return True
+
+    def close(self, timeout=10):
+        """Vacía la cola y detiene el hilo (se puede llamar más de una vez)"""
+        with self.condition:
+            if self.closed:
+                return
+        if not self.flush(timeout):
+            print(f"No se pudieron guardar {len(self.pending)} jugador(es) pendiente(s)")
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
+
+    def _take_batch(self):
+        """Espera a que toque escribir y se lleva toda la cola; None al cerrar"""
+        with self.condition:
+            while True:
+                if self.pending:
+                    oldest = next(iter(self.pending.values()))[1]
+                    wait = oldest + self.debounce - time.perf_counter()
+                    if self.flush_waiters or self.urgent or self.closed or wait <= 0:
+                        batch = list(self.pending.items())
+                        self.pending.clear()
+                        self.writing = True
+                        self.urgent = False
+                        self.condition.notify_all()  # Hay sitio para quien esperaba
+                        return batch
+                    self.condition.wait(wait)
+                elif self.closed:
+                    return None
+                else:
+                    self.condition.wait()
+
+    def _run(self):
+        store = PlayerStore(self.db_file)  # Conexión propia de este hilo
+        try:
+            while True:
+                batch = self._take_batch()
+                if batch is None:
+                    return
+                try:
+                    store.put_many([(name, value) for name, (value, _) in batch if value is not _DELETE])
+                    for name, (value, _) in batch:
+                        if value is _DELETE:
+                            store.delete(name)
+                except Exception as e:
+                    print(f"Error al guardar jugadores: {e}")
+                    if self.closed:
+                        return
+                    self._requeue(batch)
+                    time.sleep(self.retry)
+                    continue
+                now = time.perf_counter()
+                with self.condition:
+                    self.writes += 1
+                    self.latencies.extend((now - queued) * 1000 for _, (_, queued) in batch)
+                    self.writing = False
+                    self.condition.notify_all()
+        finally:
+            store.close()
+
+    def _requeue(self, batch):
+        """Devuelve a la cola lo que no se pudo escribir, salvo lo que ya tiene una versión más nueva"""
+        with self.condition:
+            self.errors += 1
+            for name, item in batch:
+                if name not in self.pending:
+                    self.pending[name] = item
+            self.writing = False
+            self.condition.notify_all()
+
+    def stats(self):
+        with self.condition:
+            latencies = sorted(self.latencies)
+            return {
+                'queue_depth': len(self.pending),
+                'max_depth': self.max_depth,
+                'requests': self.requests,
+                'coalesced': self.coalesced,
+                'writes': self.writes,
+                'errors': self.errors,
+                'latency_p50_ms': latencies[len(latencies) // 2] if latencies else 0.0,
+                'latency_p95_ms': latencies[len(latencies) * 95 // 100] if latencies else 0.0,
+            }
+
+
+class BackgroundWriter:
+    """Hilo que ejecuta en orden tareas de escritura a archivo; flush() espera a que acaben"""
+
+    def __init__(self, name="file-writer", max_pending=64):
+        self.max_pending = max_pending
+        self.tasks = deque()  # (función, argumentos)
+        self.condition = threading.Condition()
+        self.running = False
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def submit(self, task, *args):
+        """Encola task(*args); con la cola llena espera a que el hilo avance"""
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("BackgroundWriter cerrado")
+            while len(self.tasks) >= self.max_pending:
+                self.condition.wait()
+            self.tasks.append((task, args))
+            self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Espera a que terminen las tareas encoladas; devuelve False si venció el timeout"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self.condition:
+            while self.tasks or self.running:
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def close(self, timeout=10):
+        """Termina lo pendiente y detiene el hilo (se puede llamar más de una vez)"""
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify_all()
+        if not self.flush(timeout):
+            print(f"No se pudieron terminar {len(self.tasks)} escritura(s) pendiente(s)")
+        self.thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.tasks and not self.closed:
+                    self.condition.wait()
+                if not self.tasks:
+                    return
+                task, args = self.tasks.popleft()
+                self.running = True
+                self.condition.notify_all()  # Hay sitio para quien esperaba
+            try:
+                task(*args)
+            except Exception as e:
+                print(f"Error en escritura en segundo plano: {e}")
+            finally:
+                with self.condition:
+                    self.running = False
+                    self.condition.notify_all()
@@ -1,39 +1,55 @@
-import json
 import os
+import sqlite3
 from datetime import datetime
+from src.player_store import PlayerStore
+from src.persistence import PersistenceWorker
+from src.leaderboard import LeaderboardIndex
+from src.rules import RuleEngine, DEFAULT_RULES_FILE
 
 class PlayerManager:
-    def __init__(self):
-        self.players_file = "players.json"
-        self.players_data = self.load_all_players()
-        self.achievements_def = [
-            # (nombre, descripción, rareza, condición lambda player)
-            ("Primeras líneas", "Haz tu primera línea", "común", lambda p: p.get("lines_cleared", 0) >= 1),
-            ("TetraMaster", "Haz 8 líneas de una vez", "legendaria", lambda p: p.get("max_lines", 0) >= 8),
-            ("Puntaje 10k", "Llega a 10,000 puntos", "épica", lambda p: p.get("best_score", 0) >= 10000),
-            ("Coleccionista", "Desbloquea todas las cartas", "épica", lambda p: len(p.get("unlocked_cards", [])) >= 18),
-            ("Jugador Persistente", "Juega 100 partidas", "rara", lambda p: p.get("games_played", 0) >= 100),
-        ]
-        self.xp_per_achievement = {"común": 50, "rara": 120, "épica": 300, "legendaria": 1000}
-        self.coins_per_achievement = {"común": 10, "rara": 30, "épica": 100, "legendaria": 500}
+    def __init__(self, db_file="players.db", legacy_file="players.json", background_saves=True,
+                 rules_file=DEFAULT_RULES_FILE):
+        self.players_file = legacy_file
+        first_run = not os.path.exists(db_file)
+        self.store = PlayerStore(db_file)
+        if first_run and os.path.exists(legacy_file):
+            # Migración única desde el players.json antiguo (se deja como copia)
+            self.store.import_json(legacy_file)
+        self.players = {}  # Perfiles ya leídos de la base: se cargan al pedirlos
+        self.deleted = set()  # Borrados que el hilo escritor quizá aún no aplicó
+        self.index = None  # LeaderboardIndex: se construye desde la base la primera vez que se consulta
+        # Con background_saves las escrituras las hace un hilo y el bucle de juego no espera al disco
+        self.worker = PersistenceWorker(db_file) if background_saves else None
+        # Logros y desbloqueos de cartas: reglas cargadas de src/rules.json
+        self.rules = RuleEngine.load(rules_file)
 
-    def load_all_players(self):
-        """Carga todos los datos de jugadores"""
+    def load_player(self, name):
+        """Perfil de un jugador (de la caché o de la base), o None"""
+        player = self.players.get(name)
+        if player is None and name not in self.deleted:
+            player = self.store.get(name)
+            if player is not None:
+                self.players[name] = player
+        return player
+
+    def save_player(self, name, player):
+        """Escribe solo la fila de este jugador (en segundo plano si hay hilo escritor)"""
+        self.players[name] = player
+        self.deleted.discard(name)
+        if self.index is not None:
+            self.index.update(name, player)
+        if self.worker:
+            self.worker.save(name, player)
+            return
         try:
-            with open(self.players_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def save_all_players(self):
-        """Guarda todos los datos de jugadores"""
-        with open(self.players_file, 'w', encoding='utf-8') as f:
-            json.dump(self.players_data, f, indent=2, ensure_ascii=False)
+            self.store.put(name, player)
+        except sqlite3.Error as e:
+            print(f"Error al guardar el jugador {name}: {e}")
     
     def get_or_create_player(self, name):
         """Obtiene un jugador existente o crea uno nuevo"""
-        if name in self.players_data:
-            player = self.players_data[name]
+        player = self.load_player(name)
+        if player is not None:
             player['last_played'] = datetime.now().isoformat()
             return player
         else:
@@ -52,56 +68,82 @@ class PlayerManager:
                     'sfx_volume': 0.8
                 }
             }
-            self.players_data[name] = new_player
-            self.save_all_players()
+            self.save_player(name, new_player)
             return new_player
     
     def save_player_data(self, player):
         """Guarda los datos de un jugador específico"""
         if player and 'name' in player:
             player['last_played'] = datetime.now().isoformat()
-            self.players_data[player['name']] = player
-            self.save_all_players()
+            self.save_player(player['name'], player)
     
-    def get_leaderboard(self, limit=10):
+    def leaderboard_index(self):
+        """El índice de rankings, construido al primer uso desde la base"""
+        if self.index is None:
+            self.index = LeaderboardIndex()
+            self.index.build(self.store.index_rows())
+            # La caché manda: tiene los guardados que aún pueden estar en la cola
+            for name, player in self.players.items():
+                self.index.update(name, player)
+            for name in self.deleted:
+                self.index.remove(name)
+        return self.index
+
+    def get_leaderboard(self, limit=10, field='best_score'):
         """Obtiene la tabla de líderes"""
-        players = list(self.players_data.values())
-        players.sort(key=lambda x: x.get('best_score', 0), reverse=True)
-        return players[:limit]
+        return [self.load_player(name) for name in self.leaderboard_index().top(limit, field)]
+
+    def get_leaderboard_page(self, page, page_size=10, field='best_score'):
+        """Una página de la tabla de líderes (page desde 0)"""
+        return [self.load_player(name) for name in self.leaderboard_index().page(page, page_size, field)]
+
+    def get_rank(self, name, field='best_score'):
+        """Puesto del jugador en la tabla (desde 1), o None si no existe"""
+        return self.leaderboard_index().rank(name, field)
     
     def delete_player(self, name):
         """Elimina un jugador"""
-        if name in self.players_data:
-            del self.players_data[name]
-            self.save_all_players()
-            return True
-        return False
+        if self.worker:
+            existed = self.load_player(name) is not None
+            self.players.pop(name, None)
+            self.deleted.add(name)
+            if self.index is not None:
+                self.index.remove(name)
+            self.worker.delete(name)
+            return existed
+        self.players.pop(name, None)
+        if self.index is not None:
+            self.index.remove(name)
+        try:
+            return self.store.delete(name)
+        except sqlite3.Error as e:
+            print(f"Error al borrar el jugador {name}: {e}")
+            return False
+
+    def flush(self, timeout=None):
+        """Espera a que los guardados en cola lleguen a disco"""
+        return self.worker.flush(timeout) if self.worker else True
+
+    def persistence_stats(self):
+        """Métricas del hilo escritor (profundidad de cola, latencia de guardado...)"""
+        return self.worker.stats() if self.worker else None
+
+    def close(self):
+        if self.worker:
+            self.worker.close()
+        self.store.close()
     
-    def check_achievements(self, player):
-        if "achievements" not in player:
-            player["achievements"] = []
-        if "xp" not in player:
-            player["xp"] = 0
-        if "coins" not in player:
-            player["coins"] = 0
-        if "level" not in player:
-            player["level"] = 1
-        unlocked = []
-        for name, desc, rarity, cond in self.achievements_def:
-            if name not in player["achievements"] and cond(player):
-                player["achievements"].append(name)
-                player["xp"] += self.xp_per_achievement[rarity]
-                player["coins"] += self.coins_per_achievement[rarity]
-                unlocked.append((name, rarity))
-        # Subida de nivel simple: cada 500xp sube 1 nivel
-        new_level = player["xp"] // 500 + 1
-        if new_level > player["level"]:
-            player["level"] = new_level
-        return unlocked
+    def check_unlocks(self, player, changed=None):
+        """Cartas y logros nuevos según los campos que cambiaron (None: todos); devuelve (cartas, logros)"""
+        return self.rules.evaluate(player, changed)
+
+    def set_card_unlocked(self, player, card, unlocked):
+        """Cambia a mano el desbloqueo de una carta y revisa las reglas que dependen de las cartas"""
+        self.rules.set_card(player, card, unlocked)
+        return self.check_unlocks(player, ['unlocked_cards'])
+
+    def check_achievements(self, player, changed=None):
+        return self.check_unlocks(player, changed)[1]
 
     def get_achievements_info(self, player):
-        info = []
-        for name, desc, rarity, _ in self.achievements_def:
-            unlocked = name in player.get("achievements", [])
-            info.append({"name": name, "desc": desc, "rarity": rarity, "unlocked": unlocked})
-        return info
\ No newline at end of file
+        return self.rules.achievements_info(player)
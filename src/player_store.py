@@ -0,0 +1,107 @@
+"""Almacén de jugadores en SQLite (stdlib).
+
+Cada jugador es una fila: el perfil completo en JSON más las columnas por
+las que se ordena o se filtra (best_score, total_score, games_played,
+level). Guardar un jugador es un UPSERT de su fila dentro de una transacción,
+así que el coste no depende de cuántos jugadores haya. Con journal WAL y
+synchronous=FULL cada commit llega al disco antes de volver y un corte a
+mitad de escritura deja la base en el estado anterior.
+"""
+import json
+import os
+import sqlite3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    best_score INTEGER NOT NULL DEFAULT 0,
+    total_score INTEGER NOT NULL DEFAULT 0,
+    games_played INTEGER NOT NULL DEFAULT 0,
+    level INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS players_best_score ON players (best_score DESC);
+"""
+
+
+class PlayerStore:
+    """Jugadores por nombre en una base SQLite; cada escritura toca solo su fila"""
+
+    def __init__(self, path="players.db"):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        # Autocommit: las transacciones se abren a mano en cada escritura
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=FULL")
+        self.connection.executescript(_SCHEMA)
+
+    @staticmethod
+    def _row(name, player):
+        return (name, int(player.get('best_score', 0)), int(player.get('total_score', 0)),
+                int(player.get('games_played', 0)), int(player.get('level', 1)),
+                json.dumps(player, ensure_ascii=False, separators=(",", ":")))
+
+    def get(self, name):
+        """El perfil guardado con esa clave, o None"""
+        row = self.connection.execute("SELECT data FROM players WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, name, player):
+        self.put_many([(name, player)])
+
+    def put_many(self, items):
+        """Guarda varios (clave, perfil) en una única transacción"""
+        rows = [self._row(name, player) for name, player in items]
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.executemany(
+                "INSERT INTO players (name, best_score, total_score, games_played, level, data) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(name) DO UPDATE SET "
+                "best_score = excluded.best_score, total_score = excluded.total_score, "
+                "games_played = excluded.games_played, level = excluded.level, data = excluded.data",
+                rows)
+
+    def delete(self, name):
+        """Borra un jugador; devuelve True si existía"""
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            cursor = self.connection.execute("DELETE FROM players WHERE name = ?", (name,))
+        return cursor.rowcount > 0
+
+    def __contains__(self, name):
+        return self.connection.execute("SELECT 1 FROM players WHERE name = ?", (name,)).fetchone() is not None
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+    def names(self):
+        return [row[0] for row in self.connection.execute("SELECT name FROM players ORDER BY name")]
+
+    def index_rows(self):
+        """(nombre, {campo: valor}) de las columnas indexadas, sin leer el JSON de cada perfil"""
+        rows = self.connection.execute(
+            "SELECT name, best_score, total_score, games_played, level FROM players")
+        return [(name, {'best_score': best, 'total_score': total, 'games_played': games, 'level': level})
+                for name, best, total, games, level in rows]
+
+    def top(self, limit=10):
+        """Los `limit` mejores por best_score (usa el índice, no lee toda la tabla)"""
+        rows = self.connection.execute(
+            "SELECT data FROM players ORDER BY best_score DESC LIMIT ?", (limit,))
+        return [json.loads(row[0]) for row in rows]
+
+    def import_json(self, path):
+        """Importa un players.json antiguo ({clave: perfil}); devuelve cuántos jugadores cargó"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                players = json.load(f)
+        except FileNotFoundError:
+            return 0
+        self.put_many(players.items())
+        return len(players)
+
+    def close(self):
+        self.connection.close()
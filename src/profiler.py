@@ -0,0 +1,138 @@
+"""Perfilador de frames integrado.
+
+Mide cuánto tarda cada fase del bucle principal (eventos, update, efectos de
+cartas, partículas, cada draw_* y la presentación) y guarda los tiempos de
+los últimos frames en buffers circulares. De ahí salen los percentiles
+p50/p95/p99 del overlay y la traza JSON/CSV que se vuelca al salir. Las
+métricas que no son por frame (la latencia de entrada) se guardan aparte
+con record(), una muestra por suceso.
+"""
+import csv
+import json
+import os
+import time
+from array import array
+from collections import deque
+from datetime import datetime
+
+
+class FrameProfiler:
+    """Tiempos por sección y por frame en buffers circulares de `frames` entradas"""
+
+    def __init__(self, frames=600):
+        self.frames = frames
+        self.enabled = True
+        self.rings = {}  # sección -> array('d') con los ms de cada frame
+        self.metrics = {}  # métrica -> deque con los ms de cada suceso
+        self.current = {}  # ms acumulados por sección en el frame en curso
+        self.frame_count = 0
+        self.frame_start = None
+
+    def begin_frame(self):
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Cierra el frame: guarda cada sección (0 si no se ejecutó) y el total"""
+        if self.frame_start is None:
+            return
+        self.current['frame'] = (time.perf_counter() - self.frame_start) * 1000
+        slot = self.frame_count % self.frames
+        for name in self.current.keys() - self.rings.keys():
+            self.rings[name] = array('d', [0.0]) * self.frames
+        for name, ring in self.rings.items():
+            ring[slot] = self.current.get(name, 0.0)
+        self.frame_count += 1
+        self.frame_start = None
+
+    def add(self, name, ms):
+        self.current[name] = self.current.get(name, 0.0) + ms
+
+    def record(self, name, ms):
+        """Añade una muestra a una métrica por suceso (no se suma al frame)"""
+        samples = self.metrics.get(name)
+        if samples is None:
+            samples = self.metrics[name] = deque(maxlen=self.frames)
+        samples.append(ms)
+
+    def call(self, name, function, *args):
+        """Ejecuta function(*args) sumando su duración a la sección `name`; devuelve su resultado"""
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def samples(self, name):
+        """Los ms de la sección en los frames guardados (o de la métrica), del más antiguo al más reciente"""
+        if name in self.metrics:
+            return list(self.metrics[name])
+        ring = self.rings[name]
+        count = min(self.frame_count, self.frames)
+        start = self.frame_count % self.frames if self.frame_count > self.frames else 0
+        return [ring[(start + i) % self.frames] for i in range(count)]
+
+    def percentiles(self, name, points=(50, 95, 99)):
+        values = sorted(self.samples(name))
+        if not values:
+            return {point: 0.0 for point in points}
+        return {point: values[min(len(values) - 1, len(values) * point // 100)] for point in points}
+
+    def summary(self):
+        """Percentiles y media de cada sección, ordenadas de mayor a menor p95"""
+        rows = []
+        for name in list(self.rings) + list(self.metrics):
+            values = self.samples(name)
+            row = {'section': name, 'mean': sum(values) / len(values) if values else 0.0}
+            row.update({f"p{point}": ms for point, ms in self.percentiles(name).items()})
+            rows.append(row)
+        rows.sort(key=lambda row: row['p95'], reverse=True)
+        return rows
+
+    def dump(self, directory, prefix="profile"):
+        """Escribe <prefix>_<fecha>.json (resumen y traza) y .csv (un frame por fila); devuelve las rutas"""
+        if not self.frame_count:
+            return []
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        names = sorted(self.rings, key=lambda name: (name != 'frame', name))
+        columns = [self.samples(name) for name in names]
+        trace = [dict(zip(names, values)) for values in zip(*columns)]
+        with open(base + ".json", "w", encoding="utf-8") as file:
+            json.dump({'frames': self.frame_count, 'summary': self.summary(), 'trace': trace}, file)
+        with open(base + ".csv", "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(names)
+            for values in zip(*columns):
+                writer.writerow([f"{ms:.4f}" for ms in values])
+        return [base + ".json", base + ".csv"]
+
+
+class NullProfiler:
+    """Sustituto sin coste cuando el perfilado está desactivado"""
+    enabled = False
+    frame_count = 0
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def add(self, name, ms):
+        pass
+
+    def record(self, name, ms):
+        pass
+
+    def call(self, name, function, *args):
+        return function(*args)
+
+    def summary(self):
+        return []
+
+    def dump(self, directory, prefix="profile"):
+        return []
+
+
+NULL_PROFILER = NullProfiler()
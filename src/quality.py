@@ -0,0 +1,90 @@
+"""Calidad visual adaptativa según el tiempo real de frame.
+
+Cada nivel limita los extras visuales (partículas, gradiente, efectos de
+texto, rejilla y piezas flotantes del menú). QualityGovernor mide lo que
+cuesta cada frame y baja o sube de nivel con histéresis: umbrales distintos
+para bajar y subir y varias ventanas seguidas antes de cambiar, para no
+oscilar entre dos niveles.
+"""
+from collections import deque
+
+# De menor a mayor calidad; el último es el nivel por defecto
+QUALITY_LEVELS = (
+    {'name': "mínima", 'particles': 0.25, 'particle_limit': 512, 'gradient': False,
+     'text_effects': False, 'grid': False, 'menu_tetrominos': 0},
+    {'name': "baja", 'particles': 0.5, 'particle_limit': 1024, 'gradient': False,
+     'text_effects': False, 'grid': True, 'menu_tetrominos': 3},
+    {'name': "media", 'particles': 0.75, 'particle_limit': 2048, 'gradient': True,
+     'text_effects': True, 'grid': True, 'menu_tetrominos': 6},
+    {'name': "alta", 'particles': 1.0, 'particle_limit': 4096, 'gradient': True,
+     'text_effects': True, 'grid': True, 'menu_tetrominos': 10},
+)
+
+
+class QualityGovernor:
+    """Elige el nivel de QUALITY_LEVELS que mantiene el frame dentro del presupuesto de target_fps"""
+
+    def __init__(self, target_fps=60, window=30, down_ratio=1.0, up_ratio=0.6,
+                 down_windows=2, up_windows=6, level=None):
+        self.budget_ms = 1000 / target_fps
+        self.window = window
+        self.down_ratio = down_ratio  # Media de la ventana por encima de budget * down_ratio: bajar
+        self.up_ratio = up_ratio  # Media por debajo de budget * up_ratio: subir
+        self.down_windows = down_windows
+        self.up_windows = up_windows
+        self.level = len(QUALITY_LEVELS) - 1 if level is None else level
+        self.samples = deque(maxlen=window)
+        self.slow_windows = 0
+        self.fast_windows = 0
+        self.changes = 0
+        self.time_at_level = [0.0] * len(QUALITY_LEVELS)
+
+    @property
+    def current(self):
+        return QUALITY_LEVELS[self.level]
+
+    def sample(self, frame_ms, elapsed_ms=None):
+        """Registra un frame; devuelve True si el nivel cambió.
+
+        `frame_ms` es lo que costó el frame (clock.get_rawtime(), sin la espera
+        del limitador) y `elapsed_ms` el tiempo real transcurrido, que se
+        acumula en el nivel actual.
+        """
+        self.time_at_level[self.level] += frame_ms if elapsed_ms is None else elapsed_ms
+        self.samples.append(frame_ms)
+        if len(self.samples) < self.window:
+            return False
+        average = sum(self.samples) / len(self.samples)
+        self.samples.clear()
+        if average > self.budget_ms * self.down_ratio:
+            self.slow_windows += 1
+            self.fast_windows = 0
+        elif average < self.budget_ms * self.up_ratio:
+            self.fast_windows += 1
+            self.slow_windows = 0
+        else:
+            self.slow_windows = self.fast_windows = 0
+
+        if self.slow_windows >= self.down_windows and self.level > 0:
+            return self.set_level(self.level - 1)
+        if self.fast_windows >= self.up_windows and self.level < len(QUALITY_LEVELS) - 1:
+            return self.set_level(self.level + 1)
+        return False
+
+    def set_level(self, level):
+        level = max(0, min(len(QUALITY_LEVELS) - 1, level))
+        self.slow_windows = self.fast_windows = 0
+        self.samples.clear()
+        if level == self.level:
+            return False
+        self.level = level
+        self.changes += 1
+        return True
+
+    def stats(self):
+        total = sum(self.time_at_level) or 1.0
+        return {
+            'level': self.current['name'],
+            'changes': self.changes,
+            'time_at_level': {QUALITY_LEVELS[i]['name']: ms / total for i, ms in enumerate(self.time_at_level)},
+        }
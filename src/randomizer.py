@@ -0,0 +1,82 @@
+class UniformRandomizer:
+    """Cada pieza es independiente (el comportamiento clásico del juego)"""
+
+    def __init__(self, rng, pieces):
+        self.rng = rng
+        self.pieces = tuple(pieces)
+
+    def next(self):
+        return self.rng.choice(self.pieces)
+
+
+class BagRandomizer:
+    """7-bag: reparte las 7 piezas barajadas antes de volver a empezar"""
+
+    def __init__(self, rng, pieces):
+        self.rng = rng
+        self.bag = list(pieces)
+        self.index = len(self.bag)
+
+    def next(self):
+        if self.index >= len(self.bag):
+            self.rng.shuffle(self.bag)
+            self.index = 0
+        piece_type = self.bag[self.index]
+        self.index += 1
+        return piece_type
+
+
+class HistoryRandomizer:
+    """Estilo TGM: repite la tirada si la pieza está entre las últimas `history_size`"""
+
+    def __init__(self, rng, pieces, history_size=4, rolls=4):
+        self.rng = rng
+        self.pieces = tuple(pieces)
+        self.history = [None] * history_size
+        self.position = 0
+        self.rolls = rolls
+
+    def next(self):
+        for _ in range(self.rolls):
+            piece_type = self.rng.choice(self.pieces)
+            if piece_type not in self.history:
+                break
+        self.history[self.position] = piece_type
+        self.position = (self.position + 1) % len(self.history)
+        return piece_type
+
+
+RANDOMIZERS = {
+    "uniform": UniformRandomizer,
+    "bag": BagRandomizer,
+    "history": HistoryRandomizer,
+}
+
+
+class PieceQueue:
+    """Cola circular preasignada con las próximas `lookahead` piezas"""
+
+    def __init__(self, randomizer, lookahead=1):
+        self.randomizer = randomizer
+        self.buffer = [randomizer.next() for _ in range(max(1, lookahead))]
+        self.head = 0
+        self.version = 0  # Cambia cada vez que la cola avanza
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def peek(self, index=0):
+        return self.buffer[(self.head + index) % len(self.buffer)]
+
+    def pop(self):
+        """Saca la siguiente pieza y rellena su hueco con una nueva del randomizer"""
+        piece_type = self.buffer[self.head]
+        self.buffer[self.head] = self.randomizer.next()
+        self.head = (self.head + 1) % len(self.buffer)
+        self.version += 1
+        return piece_type
+
+
+def create_queue(name, rng, pieces, lookahead=1):
+    """Crea la cola de piezas con el randomizer indicado ('uniform', 'bag' o 'history')"""
+    return PieceQueue(RANDOMIZERS[name](rng, pieces), lookahead)
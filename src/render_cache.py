@@ -0,0 +1,233 @@
+"""Cachés de superficies pre-renderizadas para no repetir trabajo en cada frame"""
+from collections import OrderedDict
+
+import pygame
+
+try:
+    import numpy
+except ImportError:  # NumPy es opcional: sin él el gradiente se construye fila a fila
+    numpy = None
+
+
+def draw_gradient_lines(surface, top_color, bottom_color):
+    """Gradiente vertical con una línea por fila (el método original, sin caché)"""
+    width, height = surface.get_size()
+    for y in range(height):
+        ratio = y / height
+        r = int(top_color[0] * (1 - ratio) + bottom_color[0] * ratio)
+        g = int(top_color[1] * (1 - ratio) + bottom_color[1] * ratio)
+        b = int(top_color[2] * (1 - ratio) + bottom_color[2] * ratio)
+        pygame.draw.line(surface, (r, g, b), (0, y), (width, y))
+
+
+def build_gradient_surface(size, top_color, bottom_color):
+    """Crea una superficie con el gradiente ya pintado"""
+    width, height = size
+    surface = pygame.Surface(size)
+    if numpy is not None and width > 0 and height > 0:
+        ratio = numpy.arange(height) / height
+        top = numpy.array(top_color[:3], dtype=float)
+        bottom = numpy.array(bottom_color[:3], dtype=float)
+        column = (top * (1 - ratio)[:, None] + bottom * ratio[:, None]).astype(numpy.uint8)
+        # surfarray usa ejes (x, y, canal): la misma columna repetida a lo ancho
+        pygame.surfarray.blit_array(surface, numpy.broadcast_to(column, (width, height, 3)))
+    else:
+        draw_gradient_lines(surface, top_color, bottom_color)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
+
+class GradientCache:
+    """Guarda un gradiente por (tamaño, color superior, color inferior)"""
+
+    def __init__(self):
+        self.surfaces = {}
+
+    def get(self, size, top_color, bottom_color):
+        key = (tuple(size), tuple(top_color), tuple(bottom_color))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = build_gradient_surface(key[0], top_color, bottom_color)
+            self.surfaces[key] = surface
+        return surface
+
+    def blit(self, screen, top_color, bottom_color):
+        """Dibuja el gradiente a pantalla completa con un solo blit"""
+        screen.blit(self.get(screen.get_size(), top_color, bottom_color), (0, 0))
+
+    def clear(self):
+        """Invalida todo (cambio de resolución o de modo de pantalla)"""
+        self.surfaces.clear()
+
+
+def build_block_sprite(color, cell_size, alpha=255, golden=False):
+    """Pinta un bloque con el borde superior e izquierdo más brillante"""
+    size = cell_size - 2
+    base_color = color
+    if golden:
+        base_color = (min(255, color[0] + 50), min(255, color[1] + 50), min(255, color[2] // 2))
+    bright_color = (min(255, base_color[0] + 40), min(255, base_color[1] + 40), min(255, base_color[2] + 40))
+    sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+    sprite.fill(base_color)
+    pygame.draw.rect(sprite, bright_color, (0, 0, size, 3))
+    pygame.draw.rect(sprite, bright_color, (0, 0, 3, size))
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert_alpha()
+    sprite.set_alpha(alpha)
+    return sprite
+
+
+class BlockAtlas:
+    """Bloques pre-renderizados por (color, tamaño de celda, alpha, modo dorado), con expulsión LRU"""
+
+    def __init__(self, max_sprites=256):
+        self.max_sprites = max_sprites
+        self.sprites = OrderedDict()
+
+    def get(self, color, cell_size, alpha=255, golden=False):
+        key = (color, cell_size, alpha, golden)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = build_block_sprite(color, cell_size, alpha, golden)
+            self.sprites[key] = sprite
+            if len(self.sprites) > self.max_sprites:
+                self.sprites.popitem(last=False)
+        else:
+            self.sprites.move_to_end(key)
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
+
+
+class FontRegistry:
+    """Una única instancia de pygame.font.Font por (archivo, tamaño); las menos usadas se descartan"""
+
+    def __init__(self, max_fonts=64):
+        self.max_fonts = max_fonts
+        self.fonts = OrderedDict()
+
+    def get(self, size, name=None):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+            if len(self.fonts) > self.max_fonts:
+                self.fonts.popitem(last=False)
+        else:
+            self.fonts.move_to_end(key)
+        return font
+
+
+class TextCache:
+    """Textos ya renderizados por (fuente, tamaño, texto, color, antialias), con expulsión LRU.
+
+    Las superficies devueltas se comparten: quien necesite cambiarles el
+    alpha debe pedirlo con `alpha`, que devuelve una copia.
+    """
+
+    def __init__(self, fonts, max_entries=512):
+        self.fonts = fonts
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color, antialias=True, name=None, alpha=None):
+        key = (name, size, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = self.fonts.get(size, name).render(text, antialias, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        if alpha is not None:
+            surface = surface.copy()
+            surface.set_alpha(alpha)
+        return surface
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.surfaces),
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+def build_particle_stamp(shape, size, color, alpha):
+    """Círculo de radio `size` (lado 2 * size) o cuadrado de lado `size`, con alpha real"""
+    if shape == "circle":
+        stamp = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(stamp, color + (alpha,), (size, size), size)
+    else:
+        stamp = pygame.Surface((size, size), pygame.SRCALPHA)
+        stamp.fill(color + (alpha,))
+    if pygame.display.get_surface() is not None:
+        stamp = stamp.convert_alpha()
+    return stamp
+
+
+class StampCache:
+    """Sellos de partícula pre-renderizados por (forma, tamaño, color, alpha), con expulsión LRU"""
+
+    def __init__(self, max_stamps=1024):
+        self.max_stamps = max_stamps
+        self.stamps = OrderedDict()
+
+    def get(self, shape, size, color, alpha):
+        key = (shape, size, color, alpha)
+        stamp = self.stamps.get(key)
+        if stamp is None:
+            stamp = build_particle_stamp(shape, size, color, alpha)
+            self.stamps[key] = stamp
+            if len(self.stamps) > self.max_stamps:
+                self.stamps.popitem(last=False)
+        else:
+            self.stamps.move_to_end(key)
+        return stamp
+
+    def clear(self):
+        self.stamps.clear()
+
+
+class FillCache:
+    """Rectángulos de un color RGBA (translúcidos) por (tamaño, color), con expulsión LRU"""
+
+    def __init__(self, max_surfaces=128):
+        self.max_surfaces = max_surfaces
+        self.surfaces = OrderedDict()
+
+    def get(self, size, color):
+        key = (size, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            surface.fill(color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_surfaces:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+gradient_cache = GradientCache()
+block_atlas = BlockAtlas()
+particle_stamps = StampCache()
+fill_cache = FillCache()
+fonts = FontRegistry()
+text_cache = TextCache(fonts)
@@ -0,0 +1,124 @@
+"""Renderizado retenido de la pantalla de juego con rectángulos sucios.
+
+Las capas estáticas de TetrisGame (fondo, tablero con la pila, paneles) se
+pintan en una superficie fuera de pantalla y solo se rehace la zona de las que
+cambian de estado; el fondo se guarda aparte para restaurar esa zona sin
+volver a pintar el degradado. Cada frame se restauran desde ahí las zonas que ocuparon las capas
+móviles del frame anterior, se pintan las nuevas y se presenta únicamente lo
+que ha cambiado con pygame.display.update(rects).
+"""
+import pygame
+
+
+class GameRenderer:
+    MAX_RECTS = 48  # Con más rectángulos sucios se presenta su unión
+
+    def __init__(self, game):
+        self.game = game
+        self.layer = None
+        self.background = None  # Solo la capa de fondo: de aquí se restaura lo que hay bajo un panel
+        self.layer_keys = {}
+        self.layer_rects = {}
+        self.overlay_rects = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Fuerza a repintar y presentar la pantalla completa en el próximo frame"""
+        self.full_redraw = True
+
+    def add_overlay(self, rect):
+        """Registra algo pintado encima tras draw(): se borrará en el próximo frame"""
+        if rect.width and rect.height:
+            self.overlay_rects.append(rect)
+
+    def static_keys(self):
+        """Estado del que depende cada capa estática"""
+        game = self.game
+        return {
+            'background': (game.golden_mode, game.time_frozen, game.settings.quality['gradient']),
+            'board': (game.board, game.golden_mode, game.grid_visible(), game.board.version),
+            'next': game.board.upcoming(game.settings.next_preview),
+            'info': (game.player['name'], game.score, game.lines_cleared, game.level),
+            'hand': tuple((card.name, card.rarity, card.power, card.used) for card in game.card_manager.hand),
+            'effects': tuple(game.active_effects()),
+        }
+
+    def paint(self, target, names, clip=None):
+        """Pinta las capas `names` en `target` (recortadas a `clip`); devuelve el rect de cada una"""
+        game = self.game
+        screen = game.screen
+        layers = game.static_layers()
+        game.screen = target
+        target.set_clip(clip)
+        try:
+            return {name: layers[name]() or pygame.Rect(0, 0, 0, 0) for name in names}
+        finally:
+            target.set_clip(None)
+            game.screen = screen
+
+    def repaint_all(self, keys):
+        """Fondo en su propia superficie y el resto de capas encima, en la capa estática"""
+        self.layer_rects = self.paint(self.background, ['background'])
+        self.layer.blit(self.background, (0, 0))
+        self.layer_rects.update(self.paint(self.layer, [name for name in keys if name != 'background']))
+
+    def repaint_changed(self, changed):
+        """Repinta solo la zona de las capas que cambiaron; devuelve el rect a presentar.
+
+        Cada capa cambiada se dibuja una vez sin recorte para saber hasta dónde
+        llega ahora; luego en la unión de sus rects viejos y nuevos se restaura
+        el fondo (copiándolo de su superficie, sin volver a pintar el degradado)
+        y se repintan, recortadas a esa zona, las capas que la tocan.
+        """
+        new_rects = self.paint(self.layer, changed)
+        area = None
+        for name in changed:
+            for rect in (self.layer_rects.get(name), new_rects[name]):
+                if rect and rect.width and rect.height:
+                    area = rect.copy() if area is None else area.union(rect)
+        if area is None:
+            return None
+        self.layer.blit(self.background, area, area)
+        names = [name for name, rect in self.layer_rects.items()
+                 if name != 'background' and (name in changed or rect.colliderect(area))]
+        self.paint(self.layer, names, area)
+        self.layer_rects.update(new_rects)
+        return area
+
+    def draw(self):
+        """Dibuja el frame y devuelve la lista de rectángulos a presentar"""
+        screen = self.game.screen
+        if self.layer is None or self.layer.get_size() != screen.get_size():
+            self.layer = pygame.Surface(screen.get_size()).convert()
+            self.background = pygame.Surface(screen.get_size()).convert()
+            self.full_redraw = True
+
+        dirty = []
+        keys = self.static_keys()
+        changed = [name for name, key in keys.items() if self.layer_keys.get(name) != key]
+        if self.full_redraw or 'background' in changed:
+            # El fondo ocupa toda la pantalla: todo lo demás va encima
+            self.repaint_all(keys)
+            dirty.append(screen.get_rect())
+        elif changed:
+            area = self.repaint_changed(changed)
+            if area:
+                dirty.append(area)
+        self.layer_keys = keys
+        for rect in dirty:
+            screen.blit(self.layer, rect, rect)
+
+        # Borra las capas móviles del frame anterior restaurando la capa estática
+        for rect in self.overlay_rects:
+            screen.blit(self.layer, rect, rect)
+        dirty.extend(self.overlay_rects)
+        self.overlay_rects = [rect for rect in self.game.draw_overlays() if rect.width and rect.height]
+        dirty.extend(self.overlay_rects)
+        self.full_redraw = False
+        return self.merge(dirty)
+
+    def merge(self, rects):
+        rects = [rect for rect in rects if rect.width and rect.height]
+        if len(rects) > self.MAX_RECTS:
+            return [rects[0].unionall(rects[1:])]
+        return rects
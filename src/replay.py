@@ -0,0 +1,221 @@
+"""Grabación y reproducción de partidas en un formato binario compacto.
+
+Formato (little endian):
+- cabecera: magic b"TXRP", versión, semilla, sistema de rotación, randomizer,
+  fall_speed inicial, máscara de cartas desbloqueadas y los tiempos de
+  repetición (DAS, ARR y caída suave en ms)
+- cuerpo: por cada acción, delta de tick (varint) + código de GameAction (1 byte)
+- fin: delta 0 + byte 0, seguido de tick final, puntuación y líneas para
+  detectar desincronizaciones al reproducir
+"""
+import copy
+import os
+import struct
+from datetime import datetime
+
+from src.actions import GameAction
+from src.game import TetrisGame
+from src.settings import Settings
+
+MAGIC = b"TXRP"
+VERSION = 5  # 5: arte de la L corregido (las partidas anteriores ya no se reproducen igual)
+ROTATION_SYSTEMS = ("classic", "srs")
+RANDOMIZER_NAMES = ("uniform", "bag", "history")
+END_MARKER = 0
+_HEADER = struct.Struct("<4sBQBBHIHHH")
+_FOOTER = struct.Struct("<IQI")
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    def __init__(self, seed, rotation_system="classic", randomizer="uniform", fall_speed=800, unlocked_cards=(),
+                 actions=None, final=None, das_ms=167, arr_ms=33, soft_drop_ms=80):
+        self.seed = seed
+        self.rotation_system = rotation_system
+        self.randomizer = randomizer
+        self.fall_speed = fall_speed
+        self.unlocked_cards = sorted(set(unlocked_cards))
+        self.das_ms = das_ms
+        self.arr_ms = arr_ms
+        self.soft_drop_ms = soft_drop_ms
+        self.actions = actions if actions is not None else []  # [(tick, GameAction)]
+        self.final = final  # (tick, puntuación, líneas)
+
+    def to_bytes(self):
+        cards_mask = 0
+        for index in self.unlocked_cards:
+            cards_mask |= 1 << index
+        out = bytearray(_HEADER.pack(
+            MAGIC, VERSION, self.seed, ROTATION_SYSTEMS.index(self.rotation_system),
+            RANDOMIZER_NAMES.index(self.randomizer), int(self.fall_speed), cards_mask,
+            int(self.das_ms), int(self.arr_ms), int(self.soft_drop_ms)
+        ))
+        last_tick = 0
+        for tick, action in self.actions:
+            _write_varint(out, tick - last_tick)
+            out.append(int(action))
+            last_tick = tick
+        _write_varint(out, 0)
+        out.append(END_MARKER)
+        final_tick, score, lines = self.final if self.final else (last_tick, 0, 0)
+        out += _FOOTER.pack(final_tick, score, lines)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        (magic, version, seed, rotation, randomizer, fall_speed, cards_mask,
+         das_ms, arr_ms, soft_drop_ms) = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("No es un archivo de repetición válido")
+        pos = _HEADER.size
+        actions = []
+        tick = 0
+        while True:
+            delta, pos = _read_varint(data, pos)
+            code = data[pos]
+            pos += 1
+            if code == END_MARKER:
+                break
+            tick += delta
+            actions.append((tick, GameAction(code)))
+        final = _FOOTER.unpack_from(data, pos)
+        unlocked_cards = [i for i in range(32) if cards_mask >> i & 1]
+        return cls(seed, ROTATION_SYSTEMS[rotation], RANDOMIZER_NAMES[randomizer], fall_speed, unlocked_cards,
+                   actions, final, das_ms, arr_ms, soft_drop_ms)
+
+    def save(self, path):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+def prune_replays(folder, keep):
+    """Borra las repeticiones más antiguas de la carpeta hasta dejar `keep`; devuelve cuántas borró"""
+    try:
+        paths = [os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(".txr")]
+    except OSError:
+        return 0
+    if len(paths) <= keep:
+        return 0
+    paths.sort(key=os.path.getmtime)
+    removed = 0
+    for path in paths[:len(paths) - keep]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError as e:
+            print(f"No se pudo borrar la repetición {path}: {e}")
+    return removed
+
+
+class ReplayRecorder:
+    """Se engancha a TetrisGame.recorder y guarda cada acción con su tick"""
+
+    def __init__(self, game):
+        self.replay = Replay(
+            game.seed,
+            game.settings.rotation_system,
+            game.settings.randomizer,
+            game.fall_timer_max,
+            game.settings.unlocked_cards,
+            das_ms=game.das_ms,
+            arr_ms=game.arr_ms,
+            soft_drop_ms=game.soft_drop_ms,
+        )
+        game.recorder = self
+
+    def record(self, tick, action):
+        self.replay.actions.append((tick, action))
+
+    def finish(self, game):
+        self.replay.final = (game.tick, game.score, game.lines_cleared)
+        game.recorder = None
+        return self.replay
+
+    @staticmethod
+    def default_path(folder, player_name, seed):
+        safe_name = "".join(c if c.isalnum() else "_" for c in player_name)
+        return os.path.join(folder, f"{safe_name}_{datetime.now():%Y%m%d_%H%M%S}_{seed}.txr")
+
+
+class ReplayPlayer:
+    """Vuelve a ejecutar una partida grabada, tick a tick"""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.index = 0
+        self.game = None
+
+    def create_game(self, screen, settings, player):
+        """Partida con la configuración grabada, sobre una copia de `settings` (la del llamante no cambia)"""
+        settings = copy.copy(settings)
+        settings.rotation_system = self.replay.rotation_system
+        settings.randomizer = self.replay.randomizer
+        settings.fall_speed = self.replay.fall_speed
+        settings.unlocked_cards = list(self.replay.unlocked_cards)
+        settings.das_ms = self.replay.das_ms
+        settings.arr_ms = self.replay.arr_ms
+        settings.fast_fall_speed = self.replay.soft_drop_ms
+        self.game = TetrisGame(screen, settings, player, seed=self.replay.seed)
+        self.index = 0
+        return self.game
+
+    def apply_pending(self):
+        """Aplica las acciones grabadas para el tick actual"""
+        actions = self.replay.actions
+        while self.index < len(actions) and actions[self.index][0] <= self.game.tick:
+            result = self.game.perform_action(actions[self.index][1])
+            self.index += 1
+            if result == "menu":
+                return "menu"
+        return None
+
+    def step(self):
+        """Equivalente a un frame de GameApp: acciones pendientes y después update()"""
+        if self.finished():
+            return "menu"
+        if self.apply_pending() == "menu":
+            return "menu"
+        return self.game.update()
+
+    def finished(self):
+        final_tick = self.replay.final[0] if self.replay.final else None
+        return (self.index >= len(self.replay.actions)
+                and final_tick is not None and self.game.tick >= final_tick)
+
+    def run_headless(self, settings=None, player=None):
+        """Reproduce la partida sin pantalla y devuelve True si coincide con la grabación"""
+        self.create_game(None, settings if settings is not None else Settings(headless=True), player or {'name': 'replay'})
+        while self.step() != "menu":
+            pass
+        return self.matches_recording()
+
+    def matches_recording(self):
+        if not self.replay.final:
+            return True
+        return (self.game.tick, self.game.score, self.game.lines_cleared) == tuple(self.replay.final)
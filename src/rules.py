@@ -0,0 +1,168 @@
+"""Reglas de logros y desbloqueo de cartas.
+
+Cada regla es un umbral sobre un campo del perfil ("total_score" >= 3000,
+"unlocked_cards" >= 18; en las listas cuenta su longitud) y se cargan de un
+JSON (rules.json junto a este módulo). Por cada campo los umbrales están
+ordenados y con cada prefijo se guarda la máscara de bits de las cartas y
+logros que cubre: con bisect sobre el valor actual se obtiene de una vez
+todo lo que el jugador ya cumple, y lo nuevo es esa máscara menos lo que ya
+tenía. Solo se revisan los campos que cambiaron; si un desbloqueo cambia
+otros campos (cartas, xp, nivel) se revisan también, en cascada.
+
+El perfil sigue guardando listas (unlocked_cards con índices, achievements
+con nombres) porque las usan el menú, los ajustes y las repeticiones, y
+junto a ellas los bitsets en 'unlock_masks'. Se calculan de las listas solo
+si faltan o si cambiaron los logros definidos (la posición de cada logro es
+su bit); después evaluate() y set_card() los mantienen al día.
+"""
+import json
+import os
+import zlib
+from bisect import bisect_right
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(__file__), "rules.json")
+
+# Campos que cambian al aplicar un desbloqueo
+CARD_FIELDS = ("unlocked_cards",)
+ACHIEVEMENT_FIELDS = ("achievements", "xp", "coins", "level")
+
+
+def field_value(player, field):
+    value = player.get(field, 0)
+    if isinstance(value, (list, tuple, set, dict)):
+        return len(value)
+    return value or 0
+
+
+def bits_of(mask):
+    """Índices de los bits a 1, de menor a mayor"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class FieldIndex:
+    """Umbrales de un campo ordenados, con las máscaras acumuladas de cada prefijo"""
+
+    def __init__(self, entries):
+        # entries: [(umbral, máscara de cartas, máscara de logros)]
+        entries.sort(key=lambda entry: entry[0])
+        self.thresholds = [threshold for threshold, _, _ in entries]
+        self.card_masks = [0]  # card_masks[k]: cartas de los k primeros umbrales
+        self.achievement_masks = [0]
+        for _, cards, achievements in entries:
+            self.card_masks.append(self.card_masks[-1] | cards)
+            self.achievement_masks.append(self.achievement_masks[-1] | achievements)
+
+    def reached(self, value):
+        """(máscara de cartas, máscara de logros) con umbral <= value"""
+        k = bisect_right(self.thresholds, value)
+        return self.card_masks[k], self.achievement_masks[k]
+
+
+class RuleEngine:
+    """Evalúa desbloqueos de cartas y logros solo para los campos que cambiaron"""
+
+    def __init__(self, rules):
+        self.xp_per_level = rules.get('xp_per_level', 500)
+        self.rarities = rules.get('rarities', {})
+        self.card_rules = rules.get('card_unlocks', [])
+        self.achievements = rules.get('achievements', [])
+        self.achievement_bits = {rule['name']: bit for bit, rule in enumerate(self.achievements)}
+        # Identifica el orden de los logros: máscaras guardadas con otro orden no valen
+        self.signature = zlib.crc32("\n".join(self.achievement_bits).encode('utf-8'))
+        entries = {}
+        for rule in self.card_rules:
+            entries.setdefault(rule['field'], []).append((rule['min'], 1 << rule['card'], 0))
+        for bit, rule in enumerate(self.achievements):
+            entries.setdefault(rule['field'], []).append((rule['min'], 0, 1 << bit))
+        self.index = {field: FieldIndex(field_entries) for field, field_entries in entries.items()}
+
+    @classmethod
+    def load(cls, path=DEFAULT_RULES_FILE):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error al cargar las reglas de {path}: {e}")
+            return cls({})
+
+    def card_mask(self, player):
+        mask = 0
+        for card in player.get('unlocked_cards', []):
+            mask |= 1 << card
+        return mask
+
+    def achievement_mask(self, player):
+        mask = 0
+        for name in player.get('achievements', []):
+            bit = self.achievement_bits.get(name)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def masks(self, player):
+        """(cartas, logros) como bitsets, guardados en el perfil para no recorrer las listas cada vez"""
+        masks = player.get('unlock_masks')
+        if not masks or masks.get('rules') != self.signature:
+            masks = player['unlock_masks'] = {'rules': self.signature, 'cards': self.card_mask(player),
+                                              'achievements': self.achievement_mask(player)}
+        return masks['cards'], masks['achievements']
+
+    def set_card(self, player, card, unlocked):
+        """Bloquea o desbloquea una carta a mano (modo debug) manteniendo lista y bitset al día"""
+        cards, _ = self.masks(player)
+        cards_list = player.setdefault('unlocked_cards', [])
+        if unlocked and card not in cards_list:
+            cards_list.append(card)
+        elif not unlocked and card in cards_list:
+            cards_list.remove(card)
+        player['unlock_masks']['cards'] = cards | 1 << card if unlocked else cards & ~(1 << card)
+
+    def evaluate(self, player, changed=None):
+        """Aplica al perfil lo desbloqueado; devuelve (cartas nuevas, [(logro, rareza)] nuevos).
+
+        `changed` son los campos modificados desde la última evaluación (None: todos).
+        """
+        player.setdefault('unlocked_cards', [])
+        player.setdefault('achievements', [])
+        player.setdefault('xp', 0)
+        player.setdefault('coins', 0)
+        player.setdefault('level', 1)
+        cards_owned, achievements_owned = self.masks(player)
+        pending = set(self.index if changed is None else changed) & self.index.keys()
+        new_cards = []
+        new_achievements = []
+        while pending:
+            field = pending.pop()
+            cards, achievements = self.index[field].reached(field_value(player, field))
+            cards &= ~cards_owned
+            achievements &= ~achievements_owned
+            if cards:
+                cards_owned |= cards
+                for card in bits_of(cards):
+                    player['unlocked_cards'].append(card)
+                    new_cards.append(card)
+                pending.update(self.index.keys() & set(CARD_FIELDS))
+            if achievements:
+                achievements_owned |= achievements
+                for bit in bits_of(achievements):
+                    rule = self.achievements[bit]
+                    reward = self.rarities.get(rule['rarity'], {})
+                    player['achievements'].append(rule['name'])
+                    player['xp'] += reward.get('xp', 0)
+                    player['coins'] += reward.get('coins', 0)
+                    new_achievements.append((rule['name'], rule['rarity']))
+                # Subida de nivel simple: cada xp_per_level sube 1 nivel
+                player['level'] = max(player['level'], player['xp'] // self.xp_per_level + 1)
+                pending.update(self.index.keys() & set(ACHIEVEMENT_FIELDS))
+        player['unlock_masks']['cards'] = cards_owned
+        player['unlock_masks']['achievements'] = achievements_owned
+        return new_cards, new_achievements
+
+    def achievements_info(self, player):
+        """Logros definidos con su estado para este jugador"""
+        _, owned = self.masks(player)
+        return [{"name": rule['name'], "desc": rule['desc'], "rarity": rule['rarity'],
+                 "unlocked": bool(owned >> bit & 1)} for bit, rule in enumerate(self.achievements)]
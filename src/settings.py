@@ -1,16 +1,24 @@
+import os
 import pygame
+from src.particles import PARTICLES_AVAILABLE
+from src.quality import QUALITY_LEVELS
 
 class Settings:
-    def __init__(self):
-        # Resolución adaptativa con margen extra para el piso
-        info = pygame.display.Info()
+    def __init__(self, headless=False):
         # Calcula el alto mínimo necesario para el tablero y controles
         min_width = 900  # suficiente para tablero y panel lateral
         min_height = 800  # suficiente para tablero y que no se corte el piso
-        self.resolution = (
-            max(min_width, min(1400, info.current_w - 100)),
-            max(min_height, min(950, info.current_h - 50))
-        )
+        self.headless = headless
+        if headless:
+            # Sin pantalla no se puede consultar pygame.display.Info()
+            self.resolution = (min_width, min_height)
+        else:
+            # Resolución adaptativa con margen extra para el piso
+            info = pygame.display.Info()
+            self.resolution = (
+                max(min_width, min(1400, info.current_w - 100)),
+                max(min_height, min(950, info.current_h - 50))
+            )
         
         # Controles mejorados
         self.controls = {
@@ -31,13 +39,41 @@ class Settings:
         
         # Configuración del juego
         self.fall_speed = 800  # milisegundos (más lento para mejor jugabilidad)
-        self.fast_fall_speed = 80
+        self.fast_fall_speed = 80  # ms entre filas mientras se mantiene la caída suave
+        self.das_ms = 167  # Retardo antes de que se repita el movimiento lateral mantenido
+        self.arr_ms = 33  # ms entre repeticiones; 0 = hasta la pared en el mismo tick
         self.lock_delay = 500  # Tiempo antes de que la pieza se bloquee
+        self.max_fps = 60  # Límite de frames dibujados; la simulación va a paso fijo aparte
+        self.dirty_rects = True  # Presentar solo las zonas cambiadas de la pantalla de juego
+        self.max_catchup_steps = 5  # Ticks de simulación como máximo por frame al recuperar retraso
+        self.board_engine = "bitboard"  # "grid" (lista de colores) o "bitboard"
+        self.rotation_system = "classic"  # "classic" (kicks horizontales) o "srs"
+        self.randomizer = "uniform"  # "uniform" (como siempre), "bag" (7-bag) o "history"
+        self.next_preview = 1  # Piezas visibles en el panel "SIGUIENTE" (hasta el tamaño de la cola)
+
+        # Repeticiones: cada partida se graba para poder reproducirla
+        self.record_replays = not headless
+        self.replays_dir = "replays"
+        self.max_replays = 100  # Al pasar de este número se borran las más antiguas
+        # Historial por jugador: estadísticas de cada partida en history_dir/<jugador>.txh
+        self.record_history = not headless
+        self.history_dir = "history"
+
+        # Perfilador de frames: TETRIS_PROFILE=1 lo activa desde el arranque y al salir
+        # vuelca la traza en profile_dir (en modo DEV, F4 lo activa y muestra el overlay)
+        self.profiling = os.environ.get("TETRIS_PROFILE") == "1"
+        self.profile_frames = 600  # Frames guardados en los buffers circulares
+        self.profile_dir = "profiles"
         
         # Configuración visual
         self.show_ghost_piece = True
         self.show_grid = True
-        self.particle_effects = True
+        self.particle_effects = not headless and PARTICLES_AVAILABLE  # Las partículas necesitan NumPy
+        self.particle_capacity = 4096  # Máximo de partículas vivas; al llenarse se reciclan las más antiguas
+        # Nivel de calidad visual vigente (ver src/quality.py); con adaptive_quality lo
+        # ajusta GameApp según el tiempo de frame. Limita lo de arriba, nunca lo activa
+        self.adaptive_quality = not headless
+        self.quality = QUALITY_LEVELS[-1]
         
         # Audio
         self.music_volume = 0.7
@@ -0,0 +1,105 @@
+"""Modo headless: TetrisGame sin pantalla ni mezclador, con reloj y entradas inyectados.
+
+Uso: python -m src.simulation --games 100
+"""
+import argparse
+import random
+import time
+
+import pygame
+
+from src.settings import Settings
+from src.game import TetrisGame
+from src.clock import SimulationClock
+
+
+class HeadlessSimulation:
+    """Ejecuta una partida paso a paso tan rápido como permita la CPU"""
+
+    def __init__(self, settings=None, player=None, seed=None):
+        self.settings = settings if settings is not None else Settings(headless=True)
+        self.player = player if player is not None else {'name': 'sim'}
+        self.clock = SimulationClock()
+        self.game = TetrisGame(None, self.settings, self.player, clock=self.clock, seed=seed)
+        self.finished = False
+
+    @property
+    def tick(self):
+        return self.game.tick
+
+    def step(self, events=()):
+        """Procesa los eventos de este tick y avanza la simulación un paso"""
+        if self.finished:
+            return "menu"
+        result = None
+        for event in events:
+            if self.game.handle_event(event) == "menu":
+                result = "menu"
+                break
+        if result is None:
+            result = self.game.update()
+        if result == "menu":
+            self.finished = True
+        return result
+
+    def run(self, input_stream=(), max_ticks=None):
+        """Consume un flujo ordenado de (tick, evento) hasta terminar la partida"""
+        pending = iter(input_stream)
+        next_input = next(pending, None)
+        while not self.finished and (max_ticks is None or self.tick < max_ticks):
+            events = []
+            while next_input is not None and next_input[0] <= self.tick:
+                events.append(next_input[1])
+                next_input = next(pending, None)
+            self.step(events)
+        return self.stats()
+
+    def stats(self):
+        return {
+            'ticks': self.tick,
+            'sim_ms': self.clock.get_ticks(),
+            'score': self.game.score,
+            'lines': self.game.lines_cleared,
+            'level': self.game.level,
+            'pieces_placed': self.game.board.pieces_placed,
+        }
+
+
+def random_input_stream(rng, controls, interval=4, drop_chance=0.2):
+    """Flujo infinito de pulsaciones aleatorias para pruebas de carga y balance"""
+    keys = [controls['left'], controls['right'], controls['rotate'], controls['down'],
+            pygame.K_q, pygame.K_1, pygame.K_2, pygame.K_3, controls['hold']]
+    tick = 0
+    while True:
+        key = controls['drop'] if rng.random() < drop_chance else rng.choice(keys)
+        yield tick, pygame.event.Event(pygame.KEYDOWN, key=key)
+        yield tick + 1, pygame.event.Event(pygame.KEYUP, key=key)
+        tick += interval
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    totals = {'ticks': 0, 'sim_ms': 0, 'pieces_placed': 0, 'lines': 0, 'score': 0}
+    start = time.perf_counter()
+    for _ in range(args.games):
+        settings = Settings(headless=True)
+        settings.unlocked_cards = list(range(18))
+        simulation = HeadlessSimulation(settings, seed=rng.randrange(2 ** 32))
+        stats = simulation.run(random_input_stream(rng, settings.controls), args.max_ticks)
+        for key in totals:
+            totals[key] += stats[key]
+    elapsed = time.perf_counter() - start
+    sim_seconds = totals['sim_ms'] / 1000
+    print(f"partidas: {args.games}  ticks: {totals['ticks']:,}  piezas: {totals['pieces_placed']:,}  líneas: {totals['lines']:,}")
+    print(f"tiempo real: {elapsed:.2f}s  tiempo simulado: {sim_seconds:.0f}s  ({sim_seconds / elapsed:.0f}x)")
+    print(f"piezas colocadas por hora: {totals['pieces_placed'] / elapsed * 3600:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import pygame
 import random
 from enum import Enum
+from types import MappingProxyType
+from src.randomizer import create_queue
 
 class PieceType(Enum):
     I = 1
@@ -11,6 +13,8 @@ class PieceType(Enum):
     J = 6
     L = 7
 
+PIECE_TYPES = tuple(PieceType)
+
 class TetrisPiece:
     SHAPES = {
         PieceType.I: [
@@ -51,9 +55,9 @@ class TetrisPiece:
         ],
         PieceType.L: [
             ['...', 'LLL', 'L..'],
-            ['.L.', '.L.', '.LL'],
+            ['.LL', '..L', '..L'],
             ['..L', 'LLL', '...'],
-            ['LL.', '..L', '..L']
+            ['L..', 'L..', 'LL.']
         ]
     }
     
@@ -89,56 +93,248 @@ class TetrisPiece:
         self.shape = shapes[self.rotation]
     
     def get_cells(self):
-        cells = []
-        for row_idx, row in enumerate(self.shape):
-            for col_idx, cell in enumerate(row):
-                if cell != '.' and cell != ' ':
-                    cells.append((self.x + col_idx, self.y + row_idx))
-        return cells
+        x, y = self.x, self.y
+        return [(x + dx, y + dy) for dx, dy in self.CELLS[(self.type, self.rotation)]]
     
     def get_ghost_position(self, board):
         """Calcula la posición donde caería la pieza"""
-        ghost_y = self.y
-        while board.is_valid_position_for_piece(self, 0, ghost_y + 1 - self.y):
-            ghost_y += 1
-        return ghost_y
+        return self.y + board.drop_distance(self)
+
+
+def _compile_shapes(shapes):
+    """Compila el arte de SHAPES en tablas inmutables por (PieceType, rotación).
+
+    Devuelve tres tablas:
+    - celdas: tupla de offsets (dx, dy) ocupados
+    - límites: (min_dx, min_dy, max_dx, max_dy)
+    - perfil inferior: tupla de (dx, dy más bajo) por columna ocupada
+    """
+    cells_table = {}
+    bounds_table = {}
+    bottom_table = {}
+    for piece_type, rotations in shapes.items():
+        for rotation, shape in enumerate(rotations):
+            cells = tuple(
+                (col_idx, row_idx)
+                for row_idx, row in enumerate(shape)
+                for col_idx, cell in enumerate(row)
+                if cell != '.' and cell != ' '
+            )
+            xs = [dx for dx, _ in cells]
+            ys = [dy for _, dy in cells]
+            bottom = {}
+            for dx, dy in cells:
+                bottom[dx] = max(dy, bottom.get(dx, dy))
+            key = (piece_type, rotation)
+            cells_table[key] = cells
+            bounds_table[key] = (min(xs), min(ys), max(xs), max(ys))
+            bottom_table[key] = tuple(sorted(bottom.items()))
+    return (MappingProxyType(cells_table),
+            MappingProxyType(bounds_table),
+            MappingProxyType(bottom_table))
+
+
+TetrisPiece.CELLS, TetrisPiece.BOUNDS, TetrisPiece.BOTTOM_PROFILE = _compile_shapes(TetrisPiece.SHAPES)
+
+# Tablas de wall kicks SRS (y hacia arriba, como en la guía oficial) por transición (desde, hacia)
+# Estados: 0 = inicial, 1 = R, 2 = 180°, 3 = L
+SRS_JLSTZ_KICKS = {
+    (0, 1): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (1, 0): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (1, 2): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (2, 1): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (2, 3): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (3, 2): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (3, 0): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (0, 3): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+}
+SRS_I_KICKS = {
+    (0, 1): ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),
+    (1, 0): ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),
+    (1, 2): ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1)),
+    (2, 1): ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),
+    (2, 3): ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),
+    (3, 2): ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),
+    (3, 0): ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),
+    (0, 3): ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1)),
+}
+SRS_O_KICKS = {(a, b): ((0, 0),) for a in range(4) for b in ((a + 1) % 4, (a - 1) % 4)}
+# Kicks clásicos del juego: solo desplazamientos horizontales
+CLASSIC_KICKS = {(a, b): ((0, 0), (-1, 0), (1, 0), (-2, 0), (2, 0)) for a in range(4) for b in ((a + 1) % 4, (a - 1) % 4)}
+
+# Estados de SRS (0, R, 2, L) en su caja de rotación. El arte de SHAPES no los sigue:
+# JLSTZ salen apuntando abajo (estado 2) y las rotaciones laterales están desplazadas
+SRS_SHAPES = {
+    PieceType.I: [['....', 'IIII', '....', '....'], ['..I.', '..I.', '..I.', '..I.'],
+                  ['....', '....', 'IIII', '....'], ['.I..', '.I..', '.I..', '.I..']],
+    PieceType.T: [['.T.', 'TTT', '...'], ['.T.', '.TT', '.T.'], ['...', 'TTT', '.T.'], ['.T.', 'TT.', '.T.']],
+    PieceType.S: [['.SS', 'SS.', '...'], ['.S.', '.SS', '..S'], ['...', '.SS', 'SS.'], ['S..', 'SS.', '.S.']],
+    PieceType.Z: [['ZZ.', '.ZZ', '...'], ['..Z', '.ZZ', '.Z.'], ['...', 'ZZ.', '.ZZ'], ['.Z.', 'ZZ.', 'Z..']],
+    PieceType.J: [['J..', 'JJJ', '...'], ['.JJ', '.J.', '.J.'], ['...', 'JJJ', '..J'], ['.J.', '.J.', 'JJ.']],
+    PieceType.L: [['..L', 'LLL', '...'], ['.L.', '.L.', '.LL'], ['...', 'LLL', 'L..'], ['LL.', '.L.', '.L.']],
+}
+# Estado SRS de cada rotación del juego (la O no tiene kicks)
+SRS_STATES = {piece_type: (0, 1, 2, 3) if piece_type == PieceType.I else (2, 3, 0, 1)
+              for piece_type in SRS_SHAPES}
+
+
+def _srs_offsets(piece_type):
+    """Por rotación del juego, desplazamiento (y hacia abajo) de su arte respecto al estado SRS que representa"""
+    srs_cells = _compile_shapes({piece_type: SRS_SHAPES[piece_type]})[0]
+    offsets = []
+    for rotation, state in enumerate(SRS_STATES[piece_type]):
+        game = sorted(TetrisPiece.CELLS[(piece_type, rotation)])
+        srs = sorted(srs_cells[(piece_type, state)])
+        dx, dy = game[0][0] - srs[0][0], game[0][1] - srs[0][1]
+        if [(x - dx, y - dy) for x, y in game] != srs:
+            raise ValueError(f"La rotación {rotation} de {piece_type.name} no es el estado SRS {state}")
+        offsets.append((dx, dy))
+    return offsets
+
+
+def _srs_kicks(piece_type, kicks):
+    """Kicks SRS {(desde, hacia): offsets} por rotación del juego.
+
+    Cada transición usa la de sus estados SRS, corregida por lo desplazado que
+    está el arte de cada rotación: la pieza acaba en las mismas celdas que en SRS.
+    """
+    states = SRS_STATES[piece_type]
+    offsets = _srs_offsets(piece_type)
+    transitions = {}
+    for rotation in range(4):
+        for target in ((rotation + 1) % 4, (rotation - 1) % 4):
+            shift_x = offsets[rotation][0] - offsets[target][0]
+            shift_y = offsets[target][1] - offsets[rotation][1]  # y hacia arriba, como las tablas
+            transitions[(rotation, target)] = tuple((dx + shift_x, dy + shift_y)
+                                                    for dx, dy in kicks[(states[rotation], states[target])])
+    return transitions
+
+
+def _build_kick_table(kicks_by_piece):
+    """Convierte {PieceType: {(desde, hacia): offsets}} en tuplas anidadas
+
+    tabla[PieceType][desde][0 horario / 1 antihorario] -> ((dx, dy), ...) con y hacia abajo,
+    para que rotar no tenga que crear claves ni listas.
+    """
+    table = {}
+    for piece_type, transitions in kicks_by_piece.items():
+        table[piece_type] = tuple(
+            tuple(
+                tuple((dx, -dy) for dx, dy in transitions[(rotation, (rotation + step) % 4)])
+                for step in (1, -1)
+            )
+            for rotation in range(4)
+        )
+    return MappingProxyType(table)
+
+
+KICK_TABLES = {
+    "classic": _build_kick_table({piece_type: CLASSIC_KICKS for piece_type in PieceType}),
+    "srs": _build_kick_table({
+        piece_type: SRS_O_KICKS if piece_type == PieceType.O
+        else _srs_kicks(piece_type, SRS_I_KICKS if piece_type == PieceType.I else SRS_JLSTZ_KICKS)
+        for piece_type in PieceType
+    }),
+}
 
 class TetrisBoard:
-    def __init__(self, width=10, height=20, extended_height=24):
+    def __init__(self, width=10, height=20, extended_height=24, kick_mode="classic", rng=None,
+                 randomizer="uniform", preview=1):
         self.width = width
         self.height = height
         self.extended_height = extended_height  # Techo extendido
+        self.kick_table = KICK_TABLES[kick_mode]  # "classic" o "srs"
+        self.rng = rng if rng is not None else random.Random()
+        self.queue = create_queue(randomizer, self.rng, PIECE_TYPES, preview)
+        self._upcoming_key = None  # (versión de la cola, count) de la tupla en caché
+        self._upcoming = ()
+        self._empty_row = (None,) * width
+        self.last_cleared_rows = []
+        self.pieces_placed = 0
+        self.lock_delay = 500  # ms que una pieza apoyada tarda en fijarse
         self.grid = [[None for _ in range(width)] for _ in range(extended_height)]
+        # Control de cambios de la pila para quien la cachea (render): versión global y por fila
+        self.version = 0
+        self.row_versions = [0] * extended_height
+        # Superficie superior: fila del bloque más alto de cada columna (height si está vacía)
+        self.heights = [height] * width
         self.current_piece = None
         self.next_piece = None
         self.ghost_y = 0
         self.generate_new_piece()
 
     def generate_new_piece(self):
-        if self.next_piece is None:
-            self.next_piece = TetrisPiece(random.choice(list(PieceType)), self.width // 2 - 1, 0)
-        self.current_piece = self.next_piece
-        self.next_piece = TetrisPiece(random.choice(list(PieceType)), self.width // 2 - 1, 0)
-        if self.current_piece:
-            self.ghost_y = self.current_piece.get_ghost_position(self)
+        self.spawn_piece(self.queue.pop())
+        self.next_piece = TetrisPiece(self.queue.peek(0), self.width // 2 - 1, 0)
+
+    def spawn_piece(self, piece_type):
+        """Coloca una pieza nueva del tipo indicado en la posición de salida"""
+        self.current_piece = TetrisPiece(piece_type, self.width // 2 - 1, 0)
+        self.ghost_y = self.current_piece.get_ghost_position(self)
+
+    def upcoming(self, count):
+        """Tupla con los tipos de las próximas `count` piezas (como máximo el tamaño de la cola).
+
+        Se reutiliza mientras la cola no avance: el panel y el renderer la piden cada frame.
+        """
+        key = (self.queue.version, count)
+        if self._upcoming_key != key:
+            self._upcoming_key = key
+            self._upcoming = tuple(self.queue.peek(i) for i in range(min(count, len(self.queue))))
+        return self._upcoming
 
     def is_valid_position_for_piece(self, piece, dx=0, dy=0, rotation=None):
-        if rotation is not None:
-            temp_piece = TetrisPiece(piece.type, piece.x + dx, piece.y + dy)
-            temp_piece.rotation = rotation
-            temp_piece.shape = temp_piece.SHAPES[piece.type][rotation % len(temp_piece.SHAPES[piece.type])]
-            cells = temp_piece.get_cells()
+        if rotation is None:
+            rotation = piece.rotation
         else:
-            cells = [(x + dx, y + dy) for x, y in piece.get_cells()]
+            rotation %= len(piece.SHAPES[piece.type])
+        return self.fits(piece.type, rotation, piece.x + dx, piece.y + dy)
 
-        for x, y in cells:
-            # NO PERMITIR POSICIONES FUERA DEL TABLERO
-            if x < 0 or x >= self.width or y < 0 or y >= self.height:
-                return False
-            if self.grid[y][x] is not None:
+    def fits(self, piece_type, rotation, x, y):
+        """Comprueba si la pieza cabe en (x, y) leyendo las tablas precompiladas"""
+        key = (piece_type, rotation)
+        min_dx, min_dy, max_dx, max_dy = TetrisPiece.BOUNDS[key]
+        # NO PERMITIR POSICIONES FUERA DEL TABLERO
+        if x + min_dx < 0 or x + max_dx >= self.width or y + min_dy < 0 or y + max_dy >= self.height:
+            return False
+        grid = self.grid
+        for dx, dy in TetrisPiece.CELLS[key]:
+            if grid[y + dy][x + dx] is not None:
                 return False
         return True
 
+    def drop_distance(self, piece):
+        """Filas que puede caer la pieza, usando el perfil inferior contra la superficie"""
+        x, y = piece.x, piece.y
+        heights = self.heights
+        distance = self.height
+        for dx, dy in TetrisPiece.BOTTOM_PROFILE[(piece.type, piece.rotation)]:
+            gap = heights[x + dx] - 1 - (y + dy)
+            if gap < 0:
+                # La pieza está bajo un saliente: la superficie no sirve, recorrer filas
+                return self._scan_drop_distance(piece)
+            if gap < distance:
+                distance = gap
+        return distance
+
+    def _scan_drop_distance(self, piece):
+        distance = 0
+        while self.is_valid_position_for_piece(piece, 0, distance + 1):
+            distance += 1
+        return distance
+
+    def _recompute_column_height(self, x):
+        grid = self.grid
+        for y in range(self.height):
+            if grid[y][x] is not None:
+                self.heights[x] = y
+                return
+        self.heights[x] = self.height
+
+    def _recompute_heights(self):
+        for x in range(self.width):
+            self._recompute_column_height(x)
+
     def move_piece(self, dx, dy):
         # SOLO PERMITIR MOVIMIENTO SI TODAS LAS CELDAS SON VÁLIDAS
         if self.current_piece and self.is_valid_position_for_piece(self.current_piece, dx, dy):
@@ -161,73 +357,115 @@ class TetrisBoard:
             for x, y in piece.get_cells():
                 if 0 <= x < self.width and 0 <= y < self.extended_height:
                     self.grid[y][x] = piece.color
+                    if y < self.heights[x]:
+                        self.heights[x] = y
+            self.mark_rows_dirty({y for x, y in piece.get_cells()})
+            self.pieces_placed += 1
         return True
 
     def clear_lines(self):
-        lines_cleared = 0
-        y = self.height - 1
-        
-        while y >= 0:
-            if all(cell is not None for cell in self.grid[y]):
-                # Línea completa, eliminarla
-                del self.grid[y]
-                self.grid.insert(0, [None for _ in range(self.width)])
-                lines_cleared += 1
+        self.last_cleared_rows = self.clear_rows()
+        return len(self.last_cleared_rows)
+
+    def full_rows(self):
+        """Índices de las filas completas, en una sola pasada"""
+        grid = self.grid
+        return [y for y in range(self.height) if None not in grid[y]]
+
+    def clear_rows(self, rows=None):
+        """Elimina las filas indicadas (o las completas) y compacta el resto hacia abajo.
+
+        Devuelve los índices eliminados, ordenados de arriba abajo y en
+        coordenadas previas a la compactación.
+        """
+        cleared = self.full_rows() if rows is None else sorted(set(rows))
+        if cleared:
+            self._compact_rows(cleared)
+            self._recompute_heights()
+            # Todas las filas por encima de la última eliminada han bajado
+            self.mark_rows_dirty(range(cleared[-1] + 1))
+        return cleared
+
+    def mark_rows_dirty(self, rows):
+        """Registra un cambio en las filas indicadas de la pila"""
+        self.version += 1
+        version = self.version
+        row_versions = self.row_versions
+        for y in rows:
+            row_versions[y] = version
+
+    def dirty_rows_since(self, version):
+        """Filas modificadas después de `version` (un valor anterior de self.version)"""
+        if version >= self.version:
+            return []
+        return [y for y, row_version in enumerate(self.row_versions) if row_version > version]
+
+    def _compact_rows(self, cleared):
+        """Baja las filas supervivientes en el sitio y recicla las eliminadas arriba"""
+        grid = self.grid
+        recycled = []
+        pending = len(cleared) - 1
+        write = self.height - 1
+        for read in range(self.height - 1, -1, -1):
+            if pending >= 0 and cleared[pending] == read:
+                recycled.append(grid[read])
+                pending -= 1
             else:
-                y -= 1
-        
-        return lines_cleared
-    
-    def rotate_piece_clockwise(self):
-        if self.current_piece:
-            new_rotation = (self.current_piece.rotation + 1) % len(self.current_piece.SHAPES[self.current_piece.type])
-            if self.is_valid_position_for_piece(self.current_piece, rotation=new_rotation):
-                self.current_piece.rotate_clockwise()
-                # Actualizar posición fantasma
-                self.ghost_y = self.current_piece.get_ghost_position(self)
+                grid[write] = grid[read]
+                write -= 1
+        for row in recycled:
+            row[:] = self._empty_row
+            grid[write] = row
+            write -= 1
+
+    def set_cell(self, x, y, color):
+        """Escribe una celda del tablero (None la vacía)"""
+        self.grid[y][x] = color
+        self.mark_rows_dirty((y,))
+        if color is not None:
+            if y < self.heights[x]:
+                self.heights[x] = y
+        elif y == self.heights[x]:
+            self._recompute_column_height(x)
+
+    def rotate_piece(self, direction):
+        """Rota la pieza actual (1 horario, -1 antihorario) probando los kicks de la tabla"""
+        piece = self.current_piece
+        if not piece:
+            return False
+        from_rotation = piece.rotation
+        to_rotation = (from_rotation + direction) % 4
+        x, y = piece.x, piece.y
+        for kick_x, kick_y in self.kick_table[piece.type][from_rotation][0 if direction > 0 else 1]:
+            if self.fits(piece.type, to_rotation, x + kick_x, y + kick_y):
+                piece.x = x + kick_x
+                piece.y = y + kick_y
+                if direction > 0:
+                    piece.rotate_clockwise()
+                else:
+                    piece.rotate_counterclockwise()
+                self.ghost_y = piece.get_ghost_position(self)
                 return True
-            else:
-                # Intentar wall kick (empujar la pieza si está cerca de la pared)
-                for dx in [-1, 1, -2, 2]:
-                    if self.is_valid_position_for_piece(self.current_piece, dx, 0, new_rotation):
-                        self.current_piece.x += dx
-                        self.current_piece.rotate_clockwise()
-                        self.ghost_y = self.current_piece.get_ghost_position(self)
-                        return True
         return False
-    
+
+    def rotate_piece_clockwise(self):
+        return self.rotate_piece(1)
+
     def rotate_piece_counterclockwise(self):
-        if self.current_piece:
-            new_rotation = (self.current_piece.rotation - 1) % len(self.current_piece.SHAPES[self.current_piece.type])
-            if self.is_valid_position_for_piece(self.current_piece, rotation=new_rotation):
-                self.current_piece.rotate_counterclockwise()
-                self.ghost_y = self.current_piece.get_ghost_position(self)
-                return True
-            else:
-                # Intentar wall kick para rotación antihoraria
-                for dx in [-1, 1, -2, 2]:
-                    if self.is_valid_position_for_piece(self.current_piece, dx, 0, new_rotation):
-                        self.current_piece.x += dx
-                        self.current_piece.rotate_counterclockwise()
-                        self.ghost_y = self.current_piece.get_ghost_position(self)
-                        return True
-        return False
-    
+        return self.rotate_piece(-1)
+
     def drop_piece(self):
         """Baja la pieza actual hasta el fondo (hard drop)"""
-        if self.current_piece:
-            while self.move_piece(0, 1):
-                pass
+        self.hard_drop_piece()
     
     def hard_drop_piece(self):
         """Implementación de hard drop que devuelve las líneas caídas"""
         if not self.current_piece:
             return 0
-            
-        lines_dropped = 0
-        while self.move_piece(0, 1):
-            lines_dropped += 1
-            
+
+        lines_dropped = self.drop_distance(self.current_piece)
+        self.current_piece.y += lines_dropped
+        self.ghost_y = self.current_piece.y
         return lines_dropped
     
     def get_ghost_piece(self):
@@ -252,12 +490,12 @@ class TetrisBoard:
                     return True
         return False
     
-    def update(self):
+    def update(self, elapsed_ms=16):
         """Actualiza el estado del tablero, devuelve True si se colocó una pieza"""
         if self.current_piece:
             if not self.move_piece(0, 1):
-                self.current_piece.lock_timer += 16
-                if self.current_piece.lock_timer >= 500:  # 500ms de delay
+                self.current_piece.lock_timer += elapsed_ms
+                if self.current_piece.lock_timer >= self.lock_delay:
                     # Intentar colocar la pieza
                     if not self.place_piece(self.current_piece):
                         return "game_over"  # La pieza supera el techo extendido, termina el juego